@@ -0,0 +1,95 @@
+"""
+Import-time budget: the simulation core must load with NumPy alone.
+
+Usage::
+
+    python -m benchmarks.imports
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+# Modules a compute worker imports; none of them may load HEAVY_MODULES
+CORE_MODULES = (
+    'coastal_resilience',
+    'coastal_resilience.models',
+    'coastal_resilience.simulation',
+    'coastal_resilience.monte_carlo',
+    'coastal_resilience.streaming',
+    'coastal_resilience.sensitivity',
+    'coastal_resilience.cache',
+    'coastal_resilience.results_io',
+    'coastal_resilience.catalog',
+    'coastal_resilience.grid',
+    'coastal_resilience.precision',
+    'coastal_resilience.instrumentation',
+    'coastal_resilience.cli',
+    'coastal_resilience.calibration',
+    'run_simulation'
+)
+
+# Plotting and analysis libraries that are loaded on first use only
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'pandas', 'scipy', 'sklearn')
+
+# Seconds the core modules may take to import on top of NumPy
+IMPORT_BUDGET_SECONDS = 0.25
+
+# Runs in a fresh interpreter, so nothing is imported already
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import numpy
+numpy_seconds = time.perf_counter() - start
+start = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+print(json.dumps({{
+    'numpy_seconds': numpy_seconds,
+    'seconds': time.perf_counter() - start,
+    'loaded': [module for module in {heavy!r} if module in sys.modules]
+}}))
+"""
+
+def measure_imports(modules: Sequence[str] = CORE_MODULES) -> Dict:
+    """Import ``modules`` in a new interpreter.
+
+    Returns the seconds NumPy and then the modules took to import, and
+    which of the ``HEAVY_MODULES`` they loaded.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(modules=tuple(modules), heavy=HEAVY_MODULES)],
+        cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+def check_import_budget(
+    measured: Optional[Dict] = None,
+    budget: float = IMPORT_BUDGET_SECONDS
+) -> List[str]:
+    """Violations of the import budget of the core modules (empty if none)."""
+    measured = measured or measure_imports()
+    problems = []
+    if measured['loaded']:
+        problems.append(f"core modules import {', '.join(measured['loaded'])}")
+    if measured['seconds'] > budget:
+        problems.append(
+            f"core modules take {measured['seconds']:.3f}s to import "
+            f"(budget {budget:.3f}s on top of NumPy)"
+        )
+    return problems
+
+def main() -> int:
+    """Check the budget; returns 1 if it is exceeded, else 0."""
+    measured = measure_imports()
+    print(f"numpy {measured['numpy_seconds']:.3f}s, core modules {measured['seconds']:.3f}s")
+    problems = check_import_budget(measured)
+    for problem in problems:
+        print(f"IMPORT BUDGET {problem}")
+    return 1 if problems else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
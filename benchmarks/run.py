@@ -0,0 +1,214 @@
+"""
+Run the benchmark suite, keep a history of results and flag regressions.
+
+Usage::
+
+    python -m benchmarks.run                 # full suite
+    python -m benchmarks.run --quick         # reduced suite
+    python -m benchmarks.run ensemble io     # cases whose names contain a pattern
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from statistics import median
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.imports import check_import_budget
+from benchmarks.suite import Benchmark, build_suite
+
+HISTORY = 'output/benchmarks/history.jsonl'
+
+# Shortest timed duration of one repetition; faster cases are looped
+MIN_REPETITION_SECONDS = 0.1
+
+def _machine() -> Dict[str, str]:
+    """What results are comparable across: host, interpreter and numpy."""
+    return {
+        'node': platform.node(),
+        'processor': platform.machine(),
+        'cpus': str(os.cpu_count()),
+        'python': platform.python_version(),
+        'numpy': np.__version__
+    }
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _call(benchmark: Benchmark):
+    """Set up one repetition and return the zero-argument callable to measure."""
+    if benchmark.setup is None:
+        return None, benchmark.run
+    state = benchmark.setup()
+    return state, lambda: benchmark.run(state)
+
+def _teardown(state):
+    if hasattr(state, 'close'):
+        state.close()
+
+def _time(benchmark: Benchmark, number: int) -> float:
+    """Mean seconds of ``number`` calls, each after its own untimed setup."""
+    total = 0.0
+    for _ in range(number):
+        state, call = _call(benchmark)
+        try:
+            start = time.perf_counter()
+            call()
+            total += time.perf_counter() - start
+        finally:
+            _teardown(state)
+    return total / number
+
+def measure(benchmark: Benchmark) -> Dict[str, float]:
+    """Time a case and record the peak memory it allocates.
+
+    As with ``timeit``, each repetition calls the case often enough to take
+    at least ``MIN_REPETITION_SECONDS`` (the calibration doubles as a
+    warm-up). Returns the fastest of ``benchmark.repeat`` repetitions per
+    call, their mean, and the peak traced allocation (Python objects and
+    numpy arrays) of one more call run under ``tracemalloc``, which is kept
+    out of the timings because tracing slows allocation down.
+    """
+    number = 1
+    while _time(benchmark, number) * number < MIN_REPETITION_SECONDS and number < 10 ** 6:
+        number *= 10
+
+    seconds = []
+    for _ in range(benchmark.repeat):
+        gc.collect()
+        seconds.append(_time(benchmark, number))
+
+    state, call = _call(benchmark)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        _teardown(state)
+
+    return {
+        'seconds': min(seconds),
+        'mean_seconds': sum(seconds) / len(seconds),
+        'repeat': benchmark.repeat,
+        'number': number,
+        'peak_bytes': peak
+    }
+
+def read_history(path: str) -> List[Dict]:
+    """Earlier runs, oldest first."""
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+def append_history(path: str, entry: Dict):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry, sort_keys=True) + '\n')
+
+def find_regressions(
+    results: Dict[str, Dict],
+    history: List[Dict],
+    threshold: float = 0.25,
+    window: int = 5
+) -> Dict[str, str]:
+    """Cases slower, or with a higher peak memory, than their recent baseline.
+
+    The baseline of a case is the median over its last ``window`` results
+    on the same machine; a regression is a value more than ``threshold``
+    (a fraction) above it.
+    """
+    machine = _machine()
+    regressions = {}
+    for name, result in results.items():
+        previous = [
+            entry['results'][name] for entry in history
+            if entry.get('machine') == machine and name in entry['results']
+        ][-window:]
+        if not previous:
+            continue
+        messages = []
+        for metric, unit in (('seconds', 's'), ('peak_bytes', 'B')):
+            baseline = median(run[metric] for run in previous)
+            if baseline > 0 and result[metric] > baseline * (1 + threshold):
+                messages.append(
+                    f"{metric} {result[metric]:.4g}{unit} vs baseline "
+                    f"{baseline:.4g}{unit} (+{result[metric] / baseline - 1:.0%})"
+                )
+        if messages:
+            regressions[name] = '; '.join(messages)
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the selected cases; returns 1 if any regressed or the import budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('patterns', nargs='*',
+                        help='only run cases whose names contain one of these')
+    parser.add_argument('--quick', action='store_true',
+                        help='skip the slow cases (large ensembles, plots)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='relative slowdown or memory growth flagged as a regression')
+    parser.add_argument('--window', type=int, default=5,
+                        help='number of earlier runs the baseline is the median of')
+    parser.add_argument('--history', default=HISTORY,
+                        help='JSON-lines file the results are compared with and appended to')
+    parser.add_argument('--no-save', action='store_true',
+                        help='compare without appending this run to the history')
+    args = parser.parse_args(argv)
+
+    suite = [
+        benchmark for benchmark in build_suite()
+        if (not args.quick or benchmark.quick) and
+        (not args.patterns or any(pattern in benchmark.name for pattern in args.patterns))
+    ]
+    results = {}
+    for benchmark in suite:
+        results[benchmark.name] = result = measure(benchmark)
+        print(f"{benchmark.name:<32} {result['seconds'] * 1e3:>12.3f} ms "
+              f"{result['peak_bytes'] / 2 ** 20:>10.3f} MiB")
+
+    history = read_history(args.history)
+    regressions = find_regressions(results, history, args.threshold, args.window)
+    if regressions:
+        # Measure flagged cases again, so one noisy measurement is not reported
+        for benchmark in suite:
+            if benchmark.name in regressions:
+                again = measure(benchmark)
+                result = results[benchmark.name]
+                result['seconds'] = min(result['seconds'], again['seconds'])
+        regressions = find_regressions(results, history, args.threshold, args.window)
+    if not args.no_save:
+        append_history(args.history, {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': _commit(),
+            'machine': _machine(),
+            'results': results
+        })
+
+    for name, message in regressions.items():
+        print(f"REGRESSION {name}: {message}")
+    budget_problems = check_import_budget() if 'import.core' in results else []
+    for problem in budget_problems:
+        print(f"IMPORT BUDGET {problem}")
+    return 1 if regressions or budget_problems else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Benchmark cases: submodel steps, full runs, ensembles, result I/O and plotting.
+"""
+
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import matplotlib
+matplotlib.use('Agg')  # Render headless
+
+from coastal_resilience.advanced_visualization import AdvancedVisualizer
+from coastal_resilience.cache import parameter_dict, parameter_hash
+from coastal_resilience.models.blue_economy import BlueEconomyModel
+from coastal_resilience.models.climate import ClimateModel
+from coastal_resilience.models.environment import EnvironmentalModel
+from coastal_resilience.models.policy import PolicyModel
+from coastal_resilience.models.socioeconomic import SocioeconomicModel
+from coastal_resilience.monte_carlo import MonteCarloRunner
+from coastal_resilience.results_io import load_results, save_results
+from coastal_resilience.simulation import SUBMODELS, IntegratedSimulation, add_aggregate_indicators
+from coastal_resilience.visualization import SimulationVisualizer
+
+from benchmarks.imports import measure_imports
+
+# End year of the long-horizon runs
+LONG_END_YEAR = 2100
+
+# Parameter distributions of the ensemble benchmarks
+ENSEMBLE_DISTRIBUTIONS = {
+    'climate': {'sea_level_rise_rate': ('uniform', 0.3, 1.0)},
+    'socioeconomic': {'gdp_growth_rate': ('uniform', 0.03, 0.08)}
+}
+
+@dataclass
+class Benchmark:
+    """One timed case.
+
+    ``setup`` builds the state a call starts from and is not timed;
+    ``run`` receives it and is timed. ``repeat`` is the number of timed
+    repetitions (the fastest counts); ``quick`` cases make up the reduced
+    suite run with ``--quick``.
+    """
+    name: str
+    run: Callable
+    setup: Optional[Callable] = None
+    repeat: int = 5
+    quick: bool = True
+
+def _long_horizon() -> IntegratedSimulation:
+    return IntegratedSimulation(**{
+        keyword: parameter_class(end_year=LONG_END_YEAR)
+        for keyword, parameter_class, _ in SUBMODELS.values()
+    })
+
+def _step_until_end(model):
+    """Advance a submodel one ``simulate_step`` at a time over its default horizon."""
+    while model.current_year < model.parameters.end_year:
+        model.simulate_step()
+
+def _report_results():
+    """Results of the default scenario, prepared as ``run_simulation`` does."""
+    return add_aggregate_indicators(IntegratedSimulation().simulate_all())
+
+class _Scratch:
+    """Temporary output directory that is removed after the repetition."""
+
+    def __init__(self, payload=None):
+        self.payload = payload
+        self.path = tempfile.mkdtemp(prefix='coastal-bench-')
+
+    def close(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+def _save_like_run_simulation(scratch: _Scratch):
+    simulation, results = scratch.payload
+    save_results(
+        results,
+        f'{scratch.path}/results',
+        metadata={
+            'created': 'benchmark',
+            'parameter_hash': parameter_hash(simulation),
+            'parameters': parameter_dict(simulation)
+        }
+    )
+
+def _save_setup() -> _Scratch:
+    simulation = IntegratedSimulation()
+    return _Scratch((simulation, add_aggregate_indicators(simulation.simulate_all())))
+
+def _load_setup() -> _Scratch:
+    scratch = _save_setup()
+    _save_like_run_simulation(scratch)
+    return scratch
+
+def _ensemble(n_members: int) -> Callable:
+    def run():
+        runner = MonteCarloRunner(
+            ENSEMBLE_DISTRIBUTIONS, n_workers=1, chunk_size=10000, seed=0
+        )
+        runner.run(n_members)
+    return run
+
+def _plots(visualizer_class) -> Callable:
+    def run(scratch: _Scratch):
+        visualizer_class(scratch.payload).save_all_plots(scratch.path, skip_unchanged=False)
+    return run
+
+def _plot_setup() -> _Scratch:
+    return _Scratch(_report_results())
+
+def build_suite() -> List[Benchmark]:
+    """All benchmark cases, in reporting order."""
+    suite = [
+        Benchmark(
+            f'step.{model_class.__name__}',
+            _step_until_end,
+            setup=model_class,
+            repeat=5
+        )
+        for model_class in (
+            ClimateModel, EnvironmentalModel, SocioeconomicModel, BlueEconomyModel, PolicyModel
+        )
+    ]
+    suite += [
+        # A fresh interpreter importing the compute modules, as a worker does
+        Benchmark('import.core', measure_imports, repeat=3),
+        Benchmark('simulate_all.short', lambda: IntegratedSimulation().simulate_all(), repeat=5),
+        Benchmark('simulate_all.long', lambda simulation: simulation.simulate_all(),
+                  setup=_long_horizon, repeat=5),
+        Benchmark('simulate_all.long_stepwise',
+                  lambda simulation: simulation.simulate_all(stepwise=True),
+                  setup=_long_horizon, repeat=5)
+    ]
+    suite += [
+        Benchmark(f'ensemble.{n_members}', _ensemble(n_members),
+                  repeat=3 if n_members <= 10000 else 1, quick=n_members <= 1000)
+        for n_members in (100, 1000, 10000, 100000)
+    ]
+    suite += [
+        Benchmark('io.save_results', _save_like_run_simulation, setup=_save_setup, repeat=5),
+        Benchmark('io.load_results',
+                  lambda scratch: load_results(f'{scratch.path}/results').to_dict(),
+                  setup=_load_setup, repeat=5),
+        Benchmark('plots.basic', _plots(SimulationVisualizer), setup=_plot_setup,
+                  repeat=2, quick=False),
+        Benchmark('plots.advanced', _plots(AdvancedVisualizer), setup=_plot_setup,
+                  repeat=1, quick=False)
+    ]
+    return suite
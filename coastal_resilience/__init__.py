@@ -4,4 +4,43 @@ A comprehensive simulation system for modeling and analyzing coastal resilience
 and blue economy development in Bangladesh.
 """
 
-__version__ = "0.1.0" 
\ No newline at end of file
+import importlib
+
+__version__ = "0.1.0"
+
+# Public names and the modules defining them. Modules are imported on first
+# attribute access, so importing the package (or the simulation core) needs
+# only NumPy; plotting pulls in matplotlib/seaborn/pandas when first used.
+_EXPORTS = {
+    'IntegratedSimulation': 'simulation',
+    'MonteCarloRunner': 'monte_carlo',
+    'EnsembleAccumulator': 'streaming',
+    'TrajectoryDensity': 'streaming',
+    'StreamingCovariance': 'streaming',
+    'StreamingPCA': 'streaming',
+    'ResultCache': 'cache',
+    'save_results': 'results_io',
+    'load_results': 'results_io',
+    'RunCatalog': 'catalog',
+    'simulate_grid': 'grid',
+    'PrecisionPolicy': 'precision',
+    'Profiler': 'instrumentation',
+    'sobol_analysis': 'sensitivity',
+    'morris_analysis': 'sensitivity',
+    'Calibration': 'calibration',
+    'calibrate': 'calibration',
+    'SimulationVisualizer': 'visualization',
+    'AdvancedVisualizer': 'advanced_visualization'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,9 @@
+"""
+Entry point of ``python -m coastal_resilience``; see ``cli``.
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
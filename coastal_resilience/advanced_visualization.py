@@ -7,38 +7,118 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
-from scipy import stats
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+from matplotlib.colors import LogNorm
+
+from .rendering import render_plots
+from .sensitivity import SobolResult
+from .streaming import StreamingPCA, TrajectoryDensity, trajectory_density
 
 class AdvancedVisualizer:
     """Advanced visualization tools for in-depth analysis of simulation results."""
     
-    def __init__(self, simulation_results: Dict[str, np.ndarray]):
-        """Initialize advanced visualizer with simulation results."""
+    # Result variables the multi-indicator plots are drawn from
+    INDICATORS = (
+        'resilience_index',
+        'sustainability_index',
+        'development_index',
+        'climate_data.overall_impact',
+        'environment_data.overall_health',
+        'socioeconomic_data.overall_development'
+    )
+    
+    # Largest number of PCA points labelled with their year
+    ANNOTATE_LIMIT = 50
+    
+    def __init__(self, simulation_results: Dict[str, np.ndarray],
+                 sensitivity: Optional[SobolResult] = None,
+                 density: Optional[TrajectoryDensity] = None,
+                 pca: Optional[StreamingPCA] = None):
+        """Initialize advanced visualizer with simulation results.
+
+        ``sensitivity`` optionally supplies a precomputed Sobol analysis for
+        ``plot_sensitivity_analysis``; ``density`` a ``TrajectoryDensity`` of
+        an ensemble for ``plot_trajectory_density``; ``pca`` a
+        ``StreamingPCA`` of ensemble states for ``perform_pca_analysis``.
+        """
         self.results = simulation_results
         self.years = simulation_results['years']
+        self.sensitivity = sensitivity
+        self.density = density
+        self.pca = pca
         
         # Set style
+        self.set_style()
+    
+    @staticmethod
+    def set_style():
+        """Apply the plot style; rendering workers call it before drawing."""
         plt.style.use('seaborn-v0_8')  # Using a specific seaborn style version
         sns.set_theme()  # Set seaborn theme
     
+    def _variable(self, key: str) -> np.ndarray:
+        """Result array of a ``'section.variable'`` key."""
+        if '.' in key:
+            section, name = key.split('.', 1)
+            return self.results[section][name]
+        return self.results[key]
+    
+    def plot_inputs(self, method: str, args: tuple) -> Dict:
+        """The data a plot is drawn from, for ``save_all_plots`` change detection."""
+        if method == 'plot_trend_analysis':
+            keys = args[:1]
+        elif method == 'plot_sensitivity_analysis':
+            return {'sensitivity': self.sensitivity}
+        elif method == 'perform_pca_analysis' and self.pca is not None:
+            return {
+                'count': self.pca.count,
+                'moments': (self.pca._mean, self.pca._comoment),
+                'sample': (self.pca.sample, self.pca.sample_years)
+            }
+        elif method == 'plot_trajectory_density':
+            # The histogram, or the raw members it would be binned from
+            if self.density is not None and args[0] in self.density.ranges:
+                v = self.density.variables.index(args[0])
+                return {
+                    'range': self.density.ranges[args[0]],
+                    'columns': self.density.columns,
+                    'counts': (self.density.counts[v], self.density.outside[v])
+                }
+            keys = args[:1]
+        else:
+            keys = self.INDICATORS
+        inputs = {key: self._variable(key) for key in keys}
+        inputs['years'] = self.years
+        return inputs
+    
+    def _density(self, indicator: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Year x value histogram of an indicator over the ensemble members."""
+        if self.density is not None and indicator in self.density.ranges:
+            return self.density.density(indicator)
+        return trajectory_density(self.results, [indicator]).density(indicator)
+    
+    def _has_members(self) -> bool:
+        """Whether the results hold an ensemble (a leading member axis)."""
+        return np.ndim(self.results['resilience_index']) > 1
+    
+    def _series(self, key: str, quantile: float = 0.5) -> np.ndarray:
+        """Yearly series of a variable: itself, or a quantile over the members."""
+        values = np.asarray(self._variable(key))
+        if values.ndim == 1:
+            return values
+        return np.quantile(values.reshape(-1, values.shape[-1]), quantile, axis=0)
+    
     def plot_radar_chart(self, year: int, figsize: Tuple[int, int] = (10, 10)):
-        """Create a radar chart of key indicators for a specific year."""
+        """Create a radar chart of key indicators for a specific year.
+
+        Ensemble results are drawn from the member median.
+        """
         # Get data for the specified year
         year_idx = np.where(self.years == year)[0][0]
         
         # Prepare data
         categories = ['Resilience', 'Sustainability', 'Development', 
                      'Climate', 'Environment', 'Socioeconomic']
-        values = [
-            self.results['resilience_index'][year_idx],
-            self.results['sustainability_index'][year_idx],
-            self.results['development_index'][year_idx],
-            self.results['climate_data']['overall_impact'][year_idx],
-            self.results['environment_data']['overall_health'][year_idx],
-            self.results['socioeconomic_data']['overall_development'][year_idx]
-        ]
+        values = [self._series(key)[year_idx] for key in self.INDICATORS]
         
         # Number of variables
         N = len(categories)
@@ -58,113 +138,189 @@ class AdvancedVisualizer:
         ax.fill(angles, values, alpha=0.4)
         
         # Set category labels
-        plt.xticks(angles[:-1], categories)
+        ax.set_xticks(angles[:-1])
+        ax.set_xticklabels(categories)
         
         # Set title
-        plt.title(f'Key Indicators - Year {year}')
+        suffix = ' (ensemble median)' if self._has_members() else ''
+        ax.set_title(f'Key Indicators - Year {year}{suffix}')
         
         return fig
     
     def plot_trend_analysis(self, indicator: str, window: int = 5, 
                            figsize: Tuple[int, int] = (12, 6)):
-        """Plot trend analysis with moving average for a specific indicator."""
-        plt.figure(figsize=figsize)
+        """Plot trend analysis with moving average for a specific indicator.
+
+        Ensemble results are drawn as the member median within its 5-95%
+        band.
+        """
+        fig, ax = plt.subplots(figsize=figsize)
         
         # Get data
-        data = self.results[indicator]
+        data = self._series(indicator)
         
         # Calculate moving average
         moving_avg = pd.Series(data).rolling(window=window).mean()
         
         # Plot
-        plt.plot(self.years, data, label='Actual', alpha=0.5)
-        plt.plot(self.years, moving_avg, label=f'{window}-Year Moving Average', 
+        if self._has_members():
+            ax.fill_between(self.years, self._series(indicator, 0.05),
+                            self._series(indicator, 0.95), alpha=0.2,
+                            label='5-95% of members')
+            ax.plot(self.years, data, label='Median', alpha=0.5)
+        else:
+            ax.plot(self.years, data, label='Actual', alpha=0.5)
+        ax.plot(self.years, moving_avg, label=f'{window}-Year Moving Average', 
                 linewidth=2)
         
-        plt.title(f'Trend Analysis - {indicator}')
-        plt.xlabel('Year')
-        plt.ylabel('Value')
-        plt.legend()
-        plt.grid(True)
+        ax.set_title(f'Trend Analysis - {indicator}')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Value')
+        ax.legend()
+        ax.grid(True)
         
-        return plt.gcf()
+        return fig
     
     def perform_pca_analysis(self, n_components: int = 2, 
                            figsize: Tuple[int, int] = (10, 8)):
-        """Perform Principal Component Analysis on the data."""
-        # Prepare data
-        data = pd.DataFrame({
-            'Resilience': self.results['resilience_index'],
-            'Sustainability': self.results['sustainability_index'],
-            'Development': self.results['development_index'],
-            'Climate': self.results['climate_data']['overall_impact'],
-            'Environment': self.results['environment_data']['overall_health'],
-            'Socioeconomic': self.results['socioeconomic_data']['overall_development']
-        })
-        
-        # Standardize data
-        scaler = StandardScaler()
-        scaled_data = scaler.fit_transform(data)
-        
-        # Perform PCA
-        pca = PCA(n_components=n_components)
-        pca_result = pca.fit_transform(scaled_data)
+        """Perform Principal Component Analysis on the data.
+
+        The components are those of the standardized ``INDICATORS`` over
+        every (member, year) state: from the ``StreamingPCA`` passed to the
+        constructor, otherwise fitted to the results. Only the fit's
+        fixed-size row sample is drawn, as a rasterized scatter; points are
+        labelled with their year when there are few of them.
+        """
+        # Fit the standardized indicators
+        pca = self.pca
+        if pca is None:
+            pca = StreamingPCA(self.INDICATORS, seed=0)
+            pca.update(self.results)
+        explained_variance_ratio, _ = pca.fit()
+        pca_result = pca.transform(pca.sample, n_components)
         
         # Create plot
-        plt.figure(figsize=figsize)
-        plt.scatter(pca_result[:, 0], pca_result[:, 1], c=self.years, cmap='viridis')
-        plt.colorbar(label='Year')
+        fig, ax = plt.subplots(figsize=figsize)
+        few = len(pca_result) <= self.ANNOTATE_LIMIT
+        points = ax.scatter(pca_result[:, 0], pca_result[:, 1], c=pca.sample_years,
+                            cmap='viridis', s=None if few else 4,
+                            alpha=1 if few else 0.5, rasterized=not few)
+        fig.colorbar(points, ax=ax, label='Year')
         
         # Add labels for each point
-        for i, year in enumerate(self.years):
-            plt.annotate(str(year), (pca_result[i, 0], pca_result[i, 1]))
+        if few:
+            for i, year in enumerate(pca.sample_years):
+                ax.annotate(f'{year:g}', (pca_result[i, 0], pca_result[i, 1]))
         
-        plt.title('PCA Analysis of Key Indicators')
-        plt.xlabel(f'PC1 ({pca.explained_variance_ratio_[0]:.1%} variance)')
-        plt.ylabel(f'PC2 ({pca.explained_variance_ratio_[1]:.1%} variance)')
+        ax.set_title('PCA Analysis of Key Indicators')
+        ax.set_xlabel(f'PC1 ({explained_variance_ratio[0]:.1%} variance)')
+        ax.set_ylabel(f'PC2 ({explained_variance_ratio[1]:.1%} variance)')
         
-        return plt.gcf()
+        return fig
     
-    def plot_sensitivity_analysis(self, base_value: float, 
-                                variations: List[float] = [-0.2, -0.1, 0.1, 0.2],
+    def plot_sensitivity_analysis(self, index: str = 'resilience_index',
+                                sensitivity: Optional[SobolResult] = None,
+                                top_n: int = 15,
                                 figsize: Tuple[int, int] = (12, 8)):
-        """Plot sensitivity analysis for key parameters."""
-        plt.figure(figsize=figsize)
-        
-        # Parameters to analyze
-        parameters = ['climate_impact', 'environment_health', 'socioeconomic_development']
-        
-        for param in parameters:
-            values = []
-            for var in variations:
-                modified_value = base_value * (1 + var)
-                values.append(modified_value)
-            
-            plt.plot(variations, values, marker='o', label=param)
-        
-        plt.title('Sensitivity Analysis of Key Parameters')
-        plt.xlabel('Variation from Base Value')
-        plt.ylabel('Modified Value')
-        plt.legend()
-        plt.grid(True)
-        
-        return plt.gcf()
-    
-    def save_all_plots(self, output_dir: str):
-        """Save all advanced analysis plots to the specified directory."""
-        import os
-        os.makedirs(output_dir, exist_ok=True)
+        """Plot first-order and total Sobol indices for one integrated index.
+
+        Uses ``sensitivity`` if given, otherwise the result passed to the
+        constructor; the visualizer cannot tell which parameters its results
+        were simulated with, so it never runs an analysis itself. Bars show
+        the ``top_n`` factors by total effect with bootstrap confidence
+        intervals.
+        """
+        sensitivity = sensitivity or self.sensitivity
+        if sensitivity is None:
+            raise ValueError(
+                "No Sobol analysis to plot; pass a SobolResult from sobol_analysis"
+            )
+        
+        first = sensitivity.first_order[index]
+        total = sensitivity.total_order[index]
+        order = np.argsort(-np.nan_to_num(total))[:top_n]
+        labels = [sensitivity.factors[i] for i in order]
+        positions = np.arange(len(order))
         
-        # Save radar chart for the last year
-        self.plot_radar_chart(self.years[-1]).savefig(f'{output_dir}/radar_chart.png')
+        first_err = np.abs(sensitivity.first_order_conf[index][:, order] - first[order])
+        total_err = np.abs(sensitivity.total_order_conf[index][:, order] - total[order])
         
-        # Save trend analysis for key indicators
-        self.plot_trend_analysis('resilience_index').savefig(f'{output_dir}/resilience_trend.png')
-        self.plot_trend_analysis('sustainability_index').savefig(f'{output_dir}/sustainability_trend.png')
-        self.plot_trend_analysis('development_index').savefig(f'{output_dir}/development_trend.png')
+        fig, ax = plt.subplots(figsize=figsize)
+        ax.barh(positions - 0.2, first[order], height=0.4, xerr=first_err,
+                label='First-order (S1)', capsize=3)
+        ax.barh(positions + 0.2, total[order], height=0.4, xerr=total_err,
+                label='Total effect (ST)', capsize=3)
+        ax.set_yticks(positions)
+        ax.set_yticklabels(labels)
+        ax.invert_yaxis()
         
-        # Save PCA analysis
-        self.perform_pca_analysis().savefig(f'{output_dir}/pca_analysis.png')
+        ax.set_title(f'Sobol Sensitivity Indices - {index}')
+        ax.set_xlabel('Sobol Index')
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+        
+        return fig
+    
+    def plot_trajectory_density(self, indicator: str = 'resilience_index',
+                                figsize: Tuple[int, int] = (12, 6)):
+        """Plot every ensemble trajectory of an indicator as a density image.
+
+        Trajectories are binned into a year x value grid (see
+        ``TrajectoryDensity``) and the share of members in each cell is drawn
+        as one image on a log color scale, so the cost depends on the grid
+        and not on the number of members. Uses the density passed to the
+        constructor when it covers ``indicator``, otherwise bins the member
+        axis of the results.
+        """
+        columns, edges, shares = self._density(indicator)
         
-        # Save sensitivity analysis
-        self.plot_sensitivity_analysis(1.0).savefig(f'{output_dir}/sensitivity_analysis.png') 
\ No newline at end of file
+        fig, ax = plt.subplots(figsize=figsize)
+        image = ax.imshow(
+            np.ma.masked_equal(shares, 0), origin='lower', aspect='auto',
+            extent=(columns[0], columns[-1], edges[0], edges[-1]),
+            cmap='viridis', norm=LogNorm(), interpolation='nearest'
+        )
+        fig.colorbar(image, ax=ax, label='Share of members')
+        
+        ax.set_title(f'Trajectory Density - {indicator}')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Value')
+        ax.grid(False)
+        
+        return fig
+    
+    def save_all_plots(self, output_dir: str, n_workers: Optional[int] = 1,
+                       skip_unchanged: bool = True) -> Dict[str, float]:
+        """Save all advanced analysis plots to the specified directory.
+
+        Figures are closed after saving; ``n_workers`` renders them across a
+        process pool. Plots whose input data are unchanged since they were
+        last saved there are skipped unless ``skip_unchanged`` is False.
+        Returns the rendering time of each plot drawn, in seconds.
+        """
+        jobs = [
+            # Radar chart for the last year
+            ('radar_chart.png', 'plot_radar_chart', (self.years[-1],)),
+            # Trend analysis for key indicators
+            ('resilience_trend.png', 'plot_trend_analysis', ('resilience_index',)),
+            ('sustainability_trend.png', 'plot_trend_analysis', ('sustainability_index',)),
+            ('development_trend.png', 'plot_trend_analysis', ('development_index',)),
+            # PCA analysis
+            ('pca_analysis.png', 'perform_pca_analysis', ())
+        ]
+        # Sensitivity analysis, when one was supplied for these results
+        if self.sensitivity is not None:
+            jobs.append(('sensitivity_analysis.png', 'plot_sensitivity_analysis', ()))
+        # Trajectory densities, when there is an ensemble to draw
+        if self.density is not None:
+            indicators = self.density.variables
+        elif self._has_members():
+            indicators = ['resilience_index', 'sustainability_index', 'development_index']
+        else:
+            indicators = []
+        jobs += [
+            (f"{indicator.replace('.', '_')}_density.png", 'plot_trajectory_density', (indicator,))
+            for indicator in indicators
+        ]
+        return render_plots(self, jobs, output_dir, n_workers, skip_unchanged)
@@ -0,0 +1,173 @@
+"""
+Content-addressed on-disk cache of simulation results.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from .simulation import SUBMODELS, flatten_results
+
+@lru_cache(maxsize=None)
+def model_code_version() -> str:
+    """Hash of the model and integration source code.
+
+    Part of every cache key, so editing an update rule invalidates the
+    results computed with the old code.
+    """
+    package_dir = Path(__file__).parent
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.glob('models/*.py')) + [package_dir / 'simulation.py']:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+def _canonical(value):
+    """Convert parameter values to JSON-stable Python types."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def parameter_dict(simulation) -> Dict[str, Dict]:
+    """Canonical parameter values of every submodel of a simulation."""
+    return {
+        submodel: {
+            name: _canonical(value)
+            for name, value in asdict(model.parameters).items()
+        }
+        for submodel, model in zip(SUBMODELS, simulation._models())
+    }
+
+def parameter_hash(simulation) -> str:
+    """Stable hash of a simulation's parameters, state dtype and the model code version.
+
+    The dtype is part of the key, so runs under different precision
+    policies never share cached results.
+    """
+    payload = json.dumps(
+        {
+            'code': model_code_version(),
+            'dtype': np.dtype(simulation.dtype).str,
+            'parameters': parameter_dict(simulation)
+        },
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ResultCache:
+    """Size-capped, least-recently-used cache of ``simulate_all`` results.
+
+    Entries are uncompressed ``.npz`` files named by ``parameter_hash``.
+    Writes go to a temporary file that is atomically renamed into place,
+    reads bump the file's modification time, and eviction removes the
+    least recently used entries once ``max_bytes`` is exceeded. Several
+    processes can share one directory: a vanished or partially evicted
+    entry is simply a miss.
+    """
+
+    suffix = '.npz'
+
+    def __init__(self, directory: str = 'output/cache', max_bytes: int = 1 << 30):
+        """Initialize the cache in ``directory``."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, simulation) -> str:
+        """Cache key of a simulation's parameters and state dtype."""
+        return parameter_hash(simulation)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}{self.suffix}'
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Return the flattened results stored under ``key``, or None."""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                results = {name: data[name] for name in data.files}
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        try:
+            # Mark the entry recently used for eviction; the results are valid regardless
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return results
+
+    def put(self, key: str, results: Dict):
+        """Store results (nested or flattened) under ``key``."""
+        flat = flatten_results(results)
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                np.savez(f, **flat)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._evict()
+
+    def _entries(self):
+        """(mtime, size, path) of every entry still on disk."""
+        entries = []
+        for path in self.directory.glob(f'*{self.suffix}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """Remove least recently used entries until the size cap holds."""
+        with open(self.directory / '.lock', 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters of this instance and the current cache size."""
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries)
+        }
+
+    def clear(self):
+        """Remove every cached entry."""
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
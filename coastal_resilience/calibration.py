@@ -0,0 +1,364 @@
+"""
+Calibration of model parameters against observed yearly series.
+"""
+
+import csv
+import numpy as np
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .precision import PrecisionPolicy
+from .sensitivity import default_factors
+from .simulation import SUBMODELS, IntegratedSimulation, flatten_results
+
+# Observed series: variable -> (years, values)
+Observations = Dict[str, Tuple[np.ndarray, np.ndarray]]
+
+# Imaginary step of the complex-step derivatives; it introduces no truncation
+# or cancellation error, so it can be far below the parameter values
+COMPLEX_STEP = 1e-20
+
+_COMPLEX = PrecisionPolicy(compute='complex128')
+
+@dataclass
+class CalibrationResult:
+    """Best parameter values found and how the search went."""
+    factors: List[str]
+    values: Dict[str, float]
+    objective: float
+    parameters: Dict[str, Any]  # IntegratedSimulation keyword -> parameter dataclass
+    history: np.ndarray  # best objective after each generation
+    n_generations: int
+    n_evaluations: int
+    converged: bool
+    polished: bool = False
+    gradient: Optional[np.ndarray] = field(default=None, repr=False)
+
+def read_observations(path: str) -> Observations:
+    """Read observed series from a CSV file.
+
+    The file has a ``year`` column and one column per observed variable,
+    named by its result key (``'climate_data.sea_level'``,
+    ``'resilience_index'``) or, when unambiguous, by the bare variable name
+    (``'sea_level'``). Empty cells are missing observations.
+    """
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        raise ValueError(f"{path} is empty")
+    header = [name.strip() for name in rows[0]]
+    if 'year' not in header:
+        raise ValueError(f"{path} needs a 'year' column")
+
+    table = np.array(
+        [[float(cell) if cell.strip() else np.nan for cell in row] for row in rows[1:] if row],
+        dtype=float
+    ).reshape(-1, len(header))
+    years = table[:, header.index('year')]
+    observations = {}
+    for column, name in enumerate(header):
+        if name == 'year':
+            continue
+        observed = ~np.isnan(table[:, column])
+        observations[name] = (years[observed], table[observed, column])
+    return observations
+
+def _result_key(name: str, keys: Sequence[str]) -> str:
+    """Result key of an observed variable given by key or bare name."""
+    if name in keys:
+        return name
+    matches = [key for key in keys if key.rsplit('.', 1)[-1] == name]
+    if len(matches) != 1:
+        raise ValueError(
+            f"Observed variable {name!r} " +
+            ("matches " + ', '.join(matches) if matches else "is not a simulation result")
+        )
+    return matches[0]
+
+class Calibration:
+    """Misfit of the simulation to observed series, for whole populations.
+
+    ``factors`` are the calibrated parameters, named ``'<submodel>.<field>'``
+    as in ``sensitivity``: a mapping to (low, high) bounds, or a list of
+    names bounded +/- ``relative_range`` around their defaults. Every other
+    parameter is taken from ``base`` (submodel -> parameter dataclass;
+    default: the defaults), with the horizon extended to the last observed
+    year. Observations must not precede ``start_year``, where the initial
+    conditions apply, and must lie on the stored time axis.
+
+    The objective is the sum over observed variables of the mean squared
+    residual in units of ``scales`` (default: the root mean square of each
+    series), so every series weighs the same whatever its units.
+    ``objective``, ``residuals``, ``jacobian`` and ``gradient`` take a
+    population of parameter vectors, shaped (members, factors), and
+    evaluate it in one batched simulation, so population-based optimizers
+    (``differential_evolution`` below, or CMA-ES via ``ask``/``tell``) pay
+    one model call per generation.
+    """
+
+    def __init__(
+        self,
+        observations: Union[str, Observations],
+        factors: Union[Sequence[str], Dict[str, Tuple[float, float]]],
+        base: Optional[Dict[str, Any]] = None,
+        scales: Optional[Dict[str, float]] = None,
+        relative_range: float = 0.5
+    ):
+        """Set up the calibration problem; ``observations`` may be a CSV path."""
+        if isinstance(observations, str):
+            observations = read_observations(observations)
+        if not observations:
+            raise ValueError("At least one observed series is required")
+        if not isinstance(factors, dict):
+            defaults = default_factors(relative_range)
+            unknown = [name for name in factors if name not in defaults]
+            if unknown:
+                raise ValueError(f"Unknown factors: {', '.join(unknown)}")
+            factors = {name: defaults[name] for name in factors}
+        self.factors = list(factors)
+        self.bounds = np.array([factors[name] for name in self.factors], dtype=float)
+        if np.any(self.bounds[:, 0] > self.bounds[:, 1]):
+            raise ValueError("Factor bounds must be (low, high)")
+
+        self.base = {submodel: parameter_class() for submodel, (_, parameter_class, _) in SUBMODELS.items()}
+        self.base.update(base or {})
+        for name in self.factors:
+            submodel, field_name = name.split('.', 1)
+            if submodel not in SUBMODELS or not hasattr(self.base[submodel], field_name):
+                raise ValueError(f"Unknown factor {name!r}")
+
+        first_year = min(np.min(years) for years, _ in observations.values())
+        start_year = max(parameters.start_year for parameters in self.base.values())
+        if first_year < start_year:
+            # The initial conditions belong to start_year; moving it would shift them
+            raise ValueError(
+                f"Observations from {first_year:g} precede the simulation start in "
+                f"{start_year}; pass base parameters with an earlier start_year"
+            )
+        end_year = int(np.ceil(max(np.max(years) for years, _ in observations.values())))
+        self.base = {
+            submodel: replace(parameters, end_year=max(parameters.end_year, end_year))
+            for submodel, parameters in self.base.items()
+        }
+
+        # Positions of the observed years on the simulated time axis
+        reference = self._simulation(np.empty((1, 0)))
+        keys = list(flatten_results(reference.simulate_all()))
+        self.observed = {}
+        for name, (years, values) in observations.items():
+            key = _result_key(name, keys)
+            values = np.asarray(values, dtype=float)
+            if scales and name in scales:
+                scale = scales[name]
+            else:
+                scale = float(np.sqrt(np.mean(values ** 2))) or 1.0
+            try:
+                idx = np.array([reference.climate_model._index_of(year) for year in years])
+            except ValueError as error:
+                raise ValueError(f"Observed series {name!r}: {error}") from None
+            self.observed[key] = (
+                idx,
+                values,
+                scale * np.sqrt(len(values))
+            )
+        self.n_evaluations = 0
+
+    def _simulation(self, values: np.ndarray, precision=None) -> IntegratedSimulation:
+        """Batched simulation with one member per row of factor values."""
+        overrides: Dict[str, Dict[str, np.ndarray]] = {}
+        for name, column in zip(self.factors, values.T):
+            submodel, field_name = name.split('.', 1)
+            overrides.setdefault(submodel, {})[field_name] = column
+        return IntegratedSimulation(
+            **{
+                argument: replace(self.base[submodel], **overrides.get(submodel, {}))
+                for submodel, (argument, _, _) in SUBMODELS.items()
+            },
+            precision=precision
+        )
+
+    def _residuals(self, values: np.ndarray, precision=None) -> np.ndarray:
+        flat = flatten_results(self._simulation(values, precision).simulate_all())
+        return np.concatenate([
+            (np.broadcast_to(flat[key][..., idx], (len(values), len(idx))) - observed) / scale
+            for key, (idx, observed, scale) in self.observed.items()
+        ], axis=1)
+
+    def residuals(self, values: np.ndarray) -> np.ndarray:
+        """Scaled residuals of every member at every observation, (members, points)."""
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        self.n_evaluations += len(values)
+        return self._residuals(values)
+
+    def objective(self, values: np.ndarray) -> np.ndarray:
+        """Sum of squared scaled residuals of every member."""
+        return np.sum(self.residuals(values) ** 2, axis=1)
+
+    def jacobian(self, values: np.ndarray) -> np.ndarray:
+        """Derivatives of the residuals by the factors, (members, points, factors).
+
+        The closed-form solutions, update rules and indices are analytic in
+        the parameters (the renewable energy cap piecewise so), so they are
+        differentiated by the complex-step method: every member is run once
+        per factor with that factor shifted by an imaginary ``COMPLEX_STEP``,
+        all in one batched complex simulation. The imaginary parts are the
+        exact derivatives up to rounding, with no step size to tune.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        n_members, n_factors = values.shape
+        shifted = values[:, None, :] + 1j * COMPLEX_STEP * np.eye(n_factors)
+        self.n_evaluations += n_members * n_factors
+        residuals = self._residuals(shifted.reshape(-1, n_factors), _COMPLEX)
+        return (residuals.imag / COMPLEX_STEP).reshape(n_members, n_factors, -1).transpose(0, 2, 1)
+
+    def gradient(self, values: np.ndarray) -> np.ndarray:
+        """Gradient of the objective of every member, (members, factors)."""
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        residuals = self.residuals(values)
+        return 2 * np.einsum('mp,mpf->mf', residuals, self.jacobian(values))
+
+    def parameters(self, values: np.ndarray) -> Dict[str, Any]:
+        """``IntegratedSimulation`` keyword arguments of one factor vector."""
+        values = np.asarray(values, dtype=float)
+        overrides: Dict[str, Dict[str, float]] = {}
+        for name, value in zip(self.factors, values):
+            submodel, field_name = name.split('.', 1)
+            overrides.setdefault(submodel, {})[field_name] = float(value)
+        return {
+            argument: replace(self.base[submodel], **overrides.get(submodel, {}))
+            for submodel, (argument, _, _) in SUBMODELS.items()
+        }
+
+    def polish(self, values: np.ndarray, max_evaluations: int = 200) -> Tuple[np.ndarray, bool]:
+        """Refine one factor vector by bounded least squares on the exact Jacobian.
+
+        Returns the refined values and whether the solver converged.
+        """
+        from scipy.optimize import least_squares
+
+        solution = least_squares(
+            lambda x: self.residuals(x)[0],
+            values,
+            jac=lambda x: self.jacobian(x)[0],
+            bounds=(self.bounds[:, 0], self.bounds[:, 1]),
+            max_nfev=max_evaluations
+        )
+        return solution.x, solution.success
+
+def differential_evolution(
+    objective: Callable[[np.ndarray], np.ndarray],
+    bounds: np.ndarray,
+    population_size: Optional[int] = None,
+    max_generations: int = 1000,
+    mutation: Tuple[float, float] = (0.5, 1.0),
+    crossover: float = 0.9,
+    tol: float = 1e-8,
+    seed: Optional[int] = None,
+    initial: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, float, np.ndarray, bool]:
+    """Minimize a batched objective with DE/rand/1/bin.
+
+    ``objective`` maps a population (members, factors) to one value per
+    member; each generation calls it once with all trial vectors. The
+    mutation factor is dithered per generation within ``mutation``, and
+    trial values leaving the bounds are bounced back between the parent
+    and the bound. Stops when the spread of the population's objective
+    falls below ``tol`` times its mean (plus ``tol``). Returns the best
+    vector, its objective, the best objective per generation and whether
+    the tolerance was reached.
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    low, span = bounds[:, 0], bounds[:, 1] - bounds[:, 0]
+    d = len(bounds)
+    size = population_size or max(15 * d, 20)
+    rng = np.random.default_rng(seed)
+
+    # Latin hypercube start in the unit cube
+    unit = (np.argsort(rng.random((d, size)), axis=1).T + rng.random((size, d))) / size
+    if initial is not None:
+        unit[0] = np.clip((np.asarray(initial, dtype=float) - low) / np.where(span > 0, span, 1), 0, 1)
+    scores = objective(low + unit * span)
+
+    history = []
+    converged = False
+    rows = np.arange(size)
+    for _ in range(max_generations):
+        # Three distinct partners per member, none of them the member itself
+        order = rng.random((size, size))
+        order[rows, rows] = np.inf
+        r1, r2, r3 = np.argsort(order, axis=1)[:, :3].T
+        factor = rng.uniform(*mutation)
+        mutant = unit[r1] + factor * (unit[r2] - unit[r3])
+
+        crossed = rng.random((size, d)) < crossover
+        crossed[rows, rng.integers(d, size=size)] = True
+        trial = np.where(crossed, mutant, unit)
+        trial = np.where(trial < 0, rng.random((size, d)) * unit, trial)
+        trial = np.where(trial > 1, unit + rng.random((size, d)) * (1 - unit), trial)
+
+        trial_scores = objective(low + trial * span)
+        better = trial_scores <= scores
+        unit[better] = trial[better]
+        scores[better] = trial_scores[better]
+
+        history.append(scores.min())
+        if np.std(scores) <= tol * (1 + np.abs(np.mean(scores))):
+            converged = True
+            break
+
+    best = int(np.argmin(scores))
+    return low + unit[best] * span, float(scores[best]), np.array(history), converged
+
+def calibrate(
+    observations: Union[str, Observations],
+    factors: Union[Sequence[str], Dict[str, Tuple[float, float]]],
+    base: Optional[Dict[str, Any]] = None,
+    scales: Optional[Dict[str, float]] = None,
+    relative_range: float = 0.5,
+    population_size: Optional[int] = None,
+    max_generations: int = 1000,
+    tol: float = 1e-8,
+    polish: bool = True,
+    seed: Optional[int] = None
+) -> CalibrationResult:
+    """Fit ``factors`` to observed series (a CSV path or a mapping).
+
+    A global differential evolution search, evaluating each generation in
+    one batched simulation, is followed (with ``polish``) by a bounded
+    least-squares refinement using the complex-step Jacobian. The other
+    arguments are those of ``Calibration`` and ``differential_evolution``.
+    """
+    problem = Calibration(observations, factors, base, scales, relative_range)
+    defaults = np.array([
+        getattr(problem.base[name.split('.', 1)[0]], name.split('.', 1)[1])
+        for name in problem.factors
+    ], dtype=float)
+    values, score, history, converged = differential_evolution(
+        problem.objective,
+        problem.bounds,
+        population_size=population_size,
+        max_generations=max_generations,
+        tol=tol,
+        seed=seed,
+        initial=defaults
+    )
+
+    polished = False
+    if polish:
+        refined, polished = problem.polish(values)
+        refined_score = float(problem.objective(refined)[0])
+        if refined_score <= score:
+            values, score = refined, refined_score
+
+    return CalibrationResult(
+        factors=problem.factors,
+        values=dict(zip(problem.factors, map(float, values))),
+        objective=score,
+        parameters=problem.parameters(values),
+        history=history,
+        n_generations=len(history),
+        n_evaluations=problem.n_evaluations,
+        converged=converged,
+        polished=polished,
+        gradient=problem.gradient(values)[0]
+    )
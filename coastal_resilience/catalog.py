@@ -0,0 +1,240 @@
+"""
+SQLite catalog of simulation runs for querying by parameters and headline metrics.
+"""
+
+import json
+import sqlite3
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cache import parameter_dict, parameter_hash
+from .results_io import MANIFEST, load_results
+
+INDICES = ('resilience_index', 'sustainability_index', 'development_index')
+
+OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    parameter_hash TEXT NOT NULL,
+    created TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    parameters TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_values (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS run_values_by_name ON run_values (name, value);
+CREATE INDEX IF NOT EXISTS runs_by_hash ON runs (parameter_hash);
+"""
+
+def headline_metrics(results) -> Dict[str, float]:
+    """Final, minimum and mean value of each integrated index.
+
+    Ensemble results are averaged over members first.
+    """
+    metrics = {}
+    for index in INDICES:
+        trajectory = np.asarray(results[index], dtype=float)
+        trajectory = trajectory.reshape(-1, trajectory.shape[-1]).mean(axis=0)
+        metrics[f'final_{index}'] = float(trajectory[-1])
+        metrics[f'min_{index}'] = float(trajectory.min())
+        metrics[f'mean_{index}'] = float(trajectory.mean())
+    return metrics
+
+def _scalar_parameters(parameters: Dict[str, Dict]) -> Dict[str, float]:
+    """``'submodel.field'`` values of all scalar parameters."""
+    return {
+        f'{submodel}.{name}': float(value)
+        for submodel, values in parameters.items()
+        for name, value in values.items()
+        if isinstance(value, (int, float))
+    }
+
+def _iso_timestamp(created) -> Optional[str]:
+    """``created`` as an ISO 8601 string, or None if it is not a timestamp.
+
+    Older manifests hold the ``YYYYmmdd_HHMMSS`` stamp of the run
+    directory; both sort correctly only once they are in one format.
+    """
+    for parse in (lambda value: datetime.strptime(value, '%Y%m%d_%H%M%S'), datetime.fromisoformat):
+        try:
+            return parse(created).isoformat(timespec='seconds')
+        except (TypeError, ValueError):
+            pass
+    return None
+
+class RunCatalog:
+    """Index of saved runs: parameter hash and values, location and metrics.
+
+    Every scalar parameter (``'climate.sea_level_rise_rate'``) and headline
+    metric (``'final_resilience_index'``) is a row of an indexed
+    name/value table, so filters on any combination of them are answered
+    from the index without opening a single trajectory file.
+    """
+
+    def __init__(self, path: str = 'output/catalog.sqlite'):
+        """Open (or create) the catalog database at ``path``."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> 'RunCatalog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(
+        self,
+        path: str,
+        parameters: Dict[str, Dict],
+        metrics: Dict[str, float],
+        key: str,
+        created: Optional[str] = None
+    ) -> int:
+        """Add (or replace) the entry of the run stored at ``path``.
+
+        ``created`` defaults to now and is stored in ISO 8601, so runs sort
+        by it chronologically.
+        """
+        if created is None:
+            created = datetime.now().isoformat(timespec='seconds')
+        elif _iso_timestamp(created) is None:
+            raise ValueError(f"Not a timestamp: {created!r}")
+        else:
+            created = _iso_timestamp(created)
+        values = {**_scalar_parameters(parameters), **metrics}
+        with self.connection:
+            self.connection.execute('DELETE FROM runs WHERE path = ?', (str(path),))
+            cursor = self.connection.execute(
+                'INSERT INTO runs (parameter_hash, created, path, parameters) '
+                'VALUES (?, ?, ?, ?)',
+                (key, created, str(path), json.dumps(parameters, sort_keys=True))
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO run_values (run_id, name, value) VALUES (?, ?, ?)',
+                [(run_id, name, value) for name, value in values.items()]
+            )
+        return run_id
+
+    def record_simulation(self, simulation, results, path: str, created: Optional[str] = None) -> int:
+        """Record a finished simulation whose results were saved at ``path``."""
+        return self.record(
+            path,
+            parameter_dict(simulation),
+            headline_metrics(results),
+            parameter_hash(simulation),
+            created
+        )
+
+    def scan(self, output_dir: str = 'output') -> int:
+        """Index saved runs under ``output_dir`` that are not yet cataloged.
+
+        Runs are found at any depth, e.g. batch runs under
+        ``output/<batch>/<scenario>/results``. Only the manifest and the
+        three index arrays of each run are read. A run without a valid
+        ``created`` timestamp is dated by its manifest's modification time.
+        Returns the number of runs added.
+        """
+        known = {row[0] for row in self.connection.execute('SELECT path FROM runs')}
+        added = 0
+        for manifest in sorted(Path(output_dir).rglob(MANIFEST)):
+            results_dir = manifest.parent
+            if str(results_dir) in known:
+                continue
+            results = load_results(results_dir)
+            metadata = results.metadata
+            if 'parameters' not in metadata:
+                continue
+            self.record(
+                results_dir,
+                metadata['parameters'],
+                headline_metrics(results),
+                metadata.get('parameter_hash', ''),
+                _iso_timestamp(metadata.get('created')) or datetime.fromtimestamp(
+                    manifest.stat().st_mtime
+                ).isoformat(timespec='seconds')
+            )
+            added += 1
+        return added
+
+    def query(
+        self,
+        conditions: Optional[Dict[str, Tuple[str, float]]] = None,
+        parameter_hash: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Runs matching every condition, newest first.
+
+        ``conditions`` maps a parameter or metric name to an
+        ``(operator, value)`` pair, e.g.
+        ``{'climate.sea_level_rise_rate': ('>', 0.8),
+        'final_resilience_index': ('<', 50)}``.
+        """
+        clauses, arguments = [], []
+        for name, (operator, value) in (conditions or {}).items():
+            if operator not in OPERATORS:
+                raise ValueError(f"Unknown operator: {operator}")
+            clauses.append(
+                'run_id IN (SELECT run_id FROM run_values '
+                f'WHERE name = ? AND value {operator} ?)'
+            )
+            arguments.extend([name, value])
+        if parameter_hash is not None:
+            clauses.append('parameter_hash = ?')
+            arguments.append(parameter_hash)
+
+        sql = 'SELECT run_id, parameter_hash, created, path FROM runs'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY created DESC, run_id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            arguments.append(limit)
+
+        runs = [
+            {'run_id': run_id, 'parameter_hash': key, 'created': created, 'path': path}
+            for run_id, key, created, path in self.connection.execute(sql, arguments)
+        ]
+        for run in runs:
+            run['values'] = dict(self.connection.execute(
+                'SELECT name, value FROM run_values WHERE run_id = ?', (run['run_id'],)
+            ))
+        return runs
+
+    def parameters(self, run_id: int) -> Dict[str, Dict]:
+        """Full parameter values of one run, including batched ones."""
+        row = self.connection.execute(
+            'SELECT parameters FROM runs WHERE run_id = ?', (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(run_id)
+        return json.loads(row[0])
+
+    def names(self) -> List[str]:
+        """All parameter and metric names that can be queried."""
+        return [row[0] for row in self.connection.execute(
+            'SELECT DISTINCT name FROM run_values ORDER BY name'
+        )]
+
+    def remove(self, paths: Sequence[str]):
+        """Drop the entries of runs whose results were deleted."""
+        with self.connection:
+            self.connection.executemany(
+                'DELETE FROM runs WHERE path = ?', [(str(path),) for path in paths]
+            )
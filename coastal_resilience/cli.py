@@ -0,0 +1,369 @@
+"""
+Command-line batch runner for simulation scenarios.
+
+Usage::
+
+    python -m coastal_resilience scenarios/ --workers 4 --format npz --compress
+    python -m coastal_resilience high_slr.toml --no-plots
+    python -m coastal_resilience scenarios/ --resume
+
+A scenario file (JSON, TOML or YAML) holds one section per submodel with
+fields of its parameter dataclass; lists run as a batched ensemble. The
+time fields (``start_year``, ``end_year``, ``time_step``, ``output_step``)
+are shared by every submodel and may be given at the top level::
+
+    name = "high_slr"
+    end_year = 2050
+
+    [climate]
+    sea_level_rise_rate = 0.9
+
+    [socioeconomic]
+    gdp_growth_rate = [0.04, 0.05, 0.06]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .models.base import TIME_FIELDS
+from .simulation import (
+    SUBMODELS, IntegratedSimulation, add_aggregate_indicators, flatten_results
+)
+
+SCENARIO_SUFFIXES = ('.json', '.toml', '.yaml', '.yml')
+
+FORMATS = ('npy', 'npz', 'csv')
+
+# Written last into each scenario's directory; its presence marks a finished run
+DONE_FILE = 'scenario.json'
+
+def _precision(name: str):
+    """``PrecisionPolicy`` preset of a ``--precision`` choice."""
+    from . import precision
+    return {'full': precision.FULL, 'compact': precision.COMPACT, 'archive': precision.ARCHIVE}[name]
+
+def read_scenario(path: str) -> Dict:
+    """Parse one scenario file; the scenario name defaults to the file name."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.json':
+        with open(path) as f:
+            scenario = json.load(f)
+    elif suffix == '.toml':
+        import tomllib
+        with open(path, 'rb') as f:
+            scenario = tomllib.load(f)
+    elif suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"Reading {path} requires PyYAML (pip install pyyaml)") from None
+        with open(path) as f:
+            scenario = yaml.safe_load(f) or {}
+    else:
+        raise ValueError(f"Unsupported scenario file type: {path}")
+
+    if not isinstance(scenario, dict):
+        raise ValueError(f"{path} must contain a mapping of submodel sections")
+    scenario = dict(scenario)
+    scenario.setdefault('name', path.stem)
+    name = scenario['name']
+    # The name becomes a directory under --output-dir, so it must stay one
+    if (
+        not isinstance(name, str) or name in ('', '.', '..') or
+        Path(name).name != name or '\\' in name
+    ):
+        raise ValueError(f"{path}: scenario name {name!r} must be a plain file name")
+    scenario['source'] = str(path)
+    for section in scenario:
+        if section not in SUBMODELS and section not in ('name', 'source') + TIME_FIELDS:
+            raise ValueError(f"{path}: unknown section {section!r}")
+    return scenario
+
+def _time_fields(scenario: Dict) -> Dict:
+    """Time fields of a scenario, which every submodel shares.
+
+    They may be set at the top level or in any submodel section; a field
+    set to different values in two places is an error.
+    """
+    time_fields = {name: scenario[name] for name in TIME_FIELDS if name in scenario}
+    for submodel in SUBMODELS:
+        for name, value in (scenario.get(submodel) or {}).items():
+            if name not in TIME_FIELDS:
+                continue
+            if time_fields.setdefault(name, value) != value:
+                raise ValueError(
+                    f"Scenario {scenario['name']!r}: conflicting values of {name} "
+                    f"({time_fields[name]!r} and {value!r}); the submodels share one time axis"
+                )
+    return time_fields
+
+def collect_scenarios(paths: Sequence[str]) -> List[Dict]:
+    """Scenarios of the given files and of the scenario files in given directories.
+
+    Without paths, a single scenario with the default parameters is run.
+    """
+    if not paths:
+        return [{'name': 'default', 'source': None}]
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(
+                child for child in path.iterdir() if child.suffix.lower() in SCENARIO_SUFFIXES
+            ))
+        elif path.exists():
+            files.append(path)
+        else:
+            raise ValueError(f"No such scenario file or directory: {path}")
+
+    scenarios = [read_scenario(path) for path in files]
+    names = [scenario['name'] for scenario in scenarios]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate scenario names: {', '.join(duplicates)}")
+    return scenarios
+
+def build_simulation(scenario: Dict, precision=None) -> IntegratedSimulation:
+    """``IntegratedSimulation`` with the parameters a scenario sets.
+
+    The scenario's time fields are applied to every submodel.
+    """
+    time_fields = _time_fields(scenario)
+    arguments = {}
+    for submodel, (keyword, parameter_class, _) in SUBMODELS.items():
+        values = {**(scenario.get(submodel) or {}), **time_fields}
+        valid = {field.name for field in fields(parameter_class)}
+        unknown = sorted(set(values) - valid)
+        if unknown:
+            raise ValueError(
+                f"Scenario {scenario['name']!r}: unknown {submodel} parameters: {', '.join(unknown)}"
+            )
+        arguments[keyword] = parameter_class(**{
+            name: np.asarray(value) if isinstance(value, list) else value
+            for name, value in values.items()
+        })
+    return IntegratedSimulation(**arguments, precision=precision)
+
+def write_results(results: Dict, directory: Path, output_format: str,
+                  compress: bool = False, precision=None, metadata: Optional[Dict] = None) -> Path:
+    """Store results in ``directory`` in the chosen format; returns their path.
+
+    ``npy`` is the memory-mappable ``save_results`` layout, ``npz`` a single
+    (optionally compressed) archive of the flattened variables and ``csv`` a
+    table with one row per (member, year), gzipped with ``compress``.
+    """
+    if output_format == 'npy':
+        from .results_io import save_results
+        return save_results(results, directory / 'results', metadata, precision)
+
+    flat = precision.archive_results(results) if precision is not None else flatten_results(results)
+    if output_format == 'npz':
+        path = directory / 'results.npz'
+        (np.savez_compressed if compress else np.savez)(path, **flat)
+        return path
+
+    years = np.asarray(flat.pop('years'))
+    batch_shape = np.broadcast_shapes(*(np.shape(values) for values in flat.values()))[:-1]
+    n_members = int(np.prod(batch_shape, dtype=int))
+    columns = {
+        'member': np.repeat(np.arange(n_members), len(years)),
+        'year': np.tile(years, n_members)
+    }
+    columns.update({
+        name: np.broadcast_to(values, batch_shape + (len(years),)).reshape(-1)
+        for name, values in flat.items()
+    })
+    path = directory / ('results.csv.gz' if compress else 'results.csv')
+    header = ','.join(columns)
+    table = np.column_stack([np.asarray(values, dtype=float) for values in columns.values()])
+    np.savetxt(path, table, delimiter=',', header=header, comments='', fmt='%.10g')
+    return path
+
+def render_scenario_plots(results: Dict, directory: Path):
+    """Draw the basic and advanced report plots of a scenario's results."""
+    import matplotlib
+    matplotlib.use('Agg')  # Render reports headless
+    from .advanced_visualization import AdvancedVisualizer
+    from .visualization import SimulationVisualizer
+
+    if np.ndim(results['resilience_index']) > 1:
+        basic_visualizer = SimulationVisualizer.from_ensemble(results)
+    else:
+        basic_visualizer = SimulationVisualizer(results)
+    advanced_visualizer = AdvancedVisualizer(add_aggregate_indicators(results))
+    basic_visualizer.save_all_plots(str(directory / 'visualization' / 'basic'))
+    advanced_visualizer.save_all_plots(str(directory / 'visualization' / 'advanced'))
+
+def _write_done(directory: Path, record: Dict):
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(handle, 'w') as f:
+        json.dump(record, f, indent=2)
+    os.replace(temp_path, directory / DONE_FILE)
+
+def is_complete(scenario: Dict, directory: Path, options: Dict) -> bool:
+    """Whether ``directory`` holds a finished run of this scenario with these options.
+
+    A run that drew plots also satisfies options that do not ask for them.
+    """
+    from .cache import parameter_hash
+
+    try:
+        with open(directory / DONE_FILE) as f:
+            record = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    stored = record.get('options', {})
+    if any(stored.get(name) != options[name] for name in ('format', 'compress', 'precision')):
+        return False
+    if options['plots'] and not stored.get('plots'):
+        return False
+    simulation = build_simulation(scenario, _precision(options['precision']))
+    return record.get('parameter_hash') == parameter_hash(simulation)
+
+def run_scenario(scenario: Dict, output_dir: str, options: Dict) -> Dict:
+    """Simulate one scenario and write its results (and plots) to its directory.
+
+    Returns what the batch records about the run: name, result path,
+    parameter values and hash, headline metrics and seconds taken.
+    """
+    from .cache import parameter_dict, parameter_hash
+    from .catalog import headline_metrics
+
+    start = time.perf_counter()
+    directory = Path(output_dir) / scenario['name']
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / DONE_FILE).unlink(missing_ok=True)
+
+    precision = _precision(options['precision'])
+    simulation = build_simulation(scenario, precision)
+    results = simulation.simulate_all()
+    record = {
+        'name': scenario['name'],
+        'source': scenario.get('source'),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'parameter_hash': parameter_hash(simulation),
+        'parameters': parameter_dict(simulation),
+        'options': options
+    }
+    path = write_results(
+        results, directory, options['format'], options['compress'], precision,
+        {key: record[key] for key in ('created', 'parameter_hash', 'parameters')}
+    )
+    if options['plots']:
+        render_scenario_plots(results, directory)
+
+    record.update({
+        'path': str(path),
+        'metrics': headline_metrics(results),
+        'seconds': time.perf_counter() - start
+    })
+    _write_done(directory, record)
+    return record
+
+def run_batch(scenarios: Sequence[Dict], output_dir: str, options: Dict,
+              workers: Optional[int] = 1, resume: bool = False,
+              catalog: Optional[str] = None) -> List[Dict]:
+    """Run scenarios across ``workers`` processes (None: every core).
+
+    With ``resume``, scenarios whose directory already holds a finished run
+    with the same parameters and options are skipped. Finished runs are
+    recorded in the ``RunCatalog`` at ``catalog``. Returns the records of
+    the runs made, in completion order.
+    """
+    pending = [
+        scenario for scenario in scenarios
+        if not (resume and is_complete(scenario, Path(output_dir) / scenario['name'], options))
+    ]
+    skipped = len(scenarios) - len(pending)
+    if skipped:
+        print(f"Skipping {skipped} finished scenario(s)")
+
+    records = []
+    def finished(record: Dict):
+        records.append(record)
+        print(f"{record['name']}: {record['seconds']:.2f}s -> {record['path']}")
+        if catalog is not None:
+            from .catalog import RunCatalog
+            with RunCatalog(catalog) as run_catalog:
+                run_catalog.record(
+                    record['path'], record['parameters'], record['metrics'],
+                    record['parameter_hash'], record['created']
+                )
+
+    if workers == 1 or len(pending) <= 1:
+        for scenario in pending:
+            finished(run_scenario(scenario, output_dir, options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_scenario, scenario, output_dir, options)
+                for scenario in pending
+            ]
+            for future in as_completed(futures):
+                finished(future.result())
+    return records
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m coastal_resilience',
+        description='Run simulation scenarios from JSON, TOML or YAML files.'
+    )
+    parser.add_argument('scenarios', nargs='*',
+                        help='scenario files or directories of them (default: one default-parameter run)')
+    parser.add_argument('-o', '--output-dir', default='output/batch',
+                        help='directory receiving one subdirectory per scenario')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='scenarios run in parallel (0: one per core)')
+    parser.add_argument('--format', choices=FORMATS, default='npy',
+                        help='npy: memory-mappable arrays; npz: one archive; csv: one table')
+    parser.add_argument('--compress', action='store_true',
+                        help='compress npz archives or gzip csv tables')
+    parser.add_argument('--precision', choices=('full', 'compact', 'archive'), default='full',
+                        help='float64 throughout, float32 state, or float32 state with float16 archives')
+    parser.add_argument('--no-plots', action='store_true', help='skip the report plots')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip scenarios already finished in the output directory')
+    parser.add_argument('--catalog', default='output/catalog.sqlite',
+                        help="run catalog to record finished runs in ('' to disable)")
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.compress and args.format == 'npy':
+        parser.error('--compress needs --format npz or csv')
+    if args.workers < 0:
+        parser.error('--workers must be 0 or positive')
+
+    try:
+        scenarios = collect_scenarios(args.scenarios)
+    except ValueError as error:
+        parser.error(str(error))
+    options = {
+        'format': args.format,
+        'compress': args.compress,
+        'precision': args.precision,
+        'plots': not args.no_plots
+    }
+    start = time.perf_counter()
+    records = run_batch(
+        scenarios, args.output_dir, options,
+        workers=args.workers or None,
+        resume=args.resume,
+        catalog=args.catalog or None
+    )
+    print(f"Ran {len(records)} of {len(scenarios)} scenario(s) in {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
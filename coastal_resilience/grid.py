@@ -0,0 +1,93 @@
+"""
+Spatially explicit (gridded) runs of the climate and environmental models.
+"""
+
+import numpy as np
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Type
+
+from .models.base import TIME_FIELDS, BaseModel, stack_parameters, time_axis
+from .results_io import write_manifest
+from .simulation import SUBMODELS
+
+def _section(model_class: Type[BaseModel]) -> str:
+    """Results section (``'climate_data'``, ...) of a submodel class."""
+    for _, parameter_class, section in SUBMODELS.values():
+        if parameter_class is model_class.parameter_class:
+            return section
+    raise ValueError(f"{model_class.__name__} is not a submodel of the simulation")
+
+def _chunk_parameters(parameters, grid_shape: Tuple[int, ...], cells: np.ndarray):
+    """Parameters of a block of cells, given by their flat indices."""
+    coordinates = np.unravel_index(cells, grid_shape)
+    values = {}
+    for field in fields(parameters):
+        value = getattr(parameters, field.name)
+        if field.name in TIME_FIELDS or np.ndim(value) == 0:
+            continue
+        # Indexing the broadcast view only materializes the chunk's cells
+        values[field.name] = np.broadcast_to(value, grid_shape)[coordinates]
+    return replace(parameters, **values)
+
+def simulate_grid(
+    model_class: Type[BaseModel],
+    parameters,
+    chunk_cells: int = 1 << 18,
+    dtype: np.dtype = np.float32,
+    directory: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """Run a submodel on a raster whose parameters vary per cell.
+
+    ``parameters`` is one parameter dataclass whose fields are scalars or
+    arrays broadcastable to the grid shape (e.g. ``(rows, cols)``). The grid
+    is simulated ``chunk_cells`` cells at a time with the vectorized model,
+    so peak working memory is bounded by the chunk, and every state variable
+    is stored as a ``grid_shape + (years,)`` array of ``dtype``.
+
+    With ``directory`` the outputs are memory-mapped ``.npy`` files in the
+    ``results_io`` layout (open them with ``load_results``), so grids larger
+    than memory can be produced; otherwise they are in-memory arrays.
+    Returns the state arrays keyed like the model's ``simulate_all``.
+    """
+    parameters, grid_shape = stack_parameters(parameters, model_class.parameter_class)
+    if not grid_shape:
+        raise ValueError("Grid parameters must include at least one per-cell array")
+    n_cells = int(np.prod(grid_shape, dtype=int))
+    section = _section(model_class)
+    years = time_axis(parameters)[0]
+    shape = grid_shape + (len(years),)
+
+    if directory is not None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        outputs = {
+            name: np.lib.format.open_memmap(
+                directory / f'{section}.{name}.npy', mode='w+', dtype=dtype, shape=shape
+            )
+            for name in model_class.state_variables
+        }
+    else:
+        outputs = {
+            name: np.empty(shape, dtype=dtype) for name in model_class.state_variables
+        }
+
+    for start in range(0, n_cells, chunk_cells):
+        cells = np.arange(start, min(start + chunk_cells, n_cells))
+        model = model_class(_chunk_parameters(parameters, grid_shape, cells))
+        model.simulate_all()
+        for name, output in outputs.items():
+            values = np.broadcast_to(getattr(model, name), (len(cells), len(years)))
+            output.reshape(n_cells, len(years))[cells[0]:cells[-1] + 1] = values
+
+    if directory is not None:
+        for output in outputs.values():
+            output.flush()
+        np.save(directory / 'years.npy', years)
+        write_manifest(
+            directory,
+            {'years': years, **{f'{section}.{name}': output for name, output in outputs.items()}},
+            {'grid_shape': list(grid_shape)}
+        )
+
+    return {'years': years, **outputs}
@@ -0,0 +1,95 @@
+"""
+Timing observers for the phases of an integrated simulation.
+"""
+
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+# An observer is called with (phase, start, duration); times are
+# ``time.perf_counter()`` seconds
+Observer = Callable[[str, float, float], None]
+
+class Profiler:
+    """Observer that aggregates phase timings and keeps a trace of them.
+
+    Attach it with ``IntegratedSimulation.observe(profiler)`` (or
+    ``add_observer``). Phases are the whole ``simulate_step`` and
+    ``simulate_all`` calls and, nested in them, each submodel's step or
+    closed-form fill (``'climate.simulate_step'``), the index computation
+    and the time-axis lookup. Per phase it counts calls and sums wall time;
+    up to ``max_events`` individual calls are kept for the Chrome trace.
+    """
+
+    def __init__(self, max_events: Optional[int] = 1_000_000):
+        """Initialize an empty profile."""
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        self.stats: Dict[str, List[float]] = {}
+        self.events: List[tuple] = []
+        self.dropped = 0
+
+    def __call__(self, phase: str, start: float, duration: float):
+        stats = self.stats.get(phase)
+        if stats is None:
+            self.stats[phase] = [1, duration, duration, duration]
+        else:
+            stats[0] += 1
+            stats[1] += duration
+            if duration < stats[2]:
+                stats[2] = duration
+            if duration > stats[3]:
+                stats[3] = duration
+        if self.max_events is None or len(self.events) < self.max_events:
+            self.events.append((phase, start, duration, threading.get_ident()))
+        else:
+            self.dropped += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Calls and wall time per phase, slowest total first."""
+        return {
+            phase: {
+                'calls': int(count),
+                'total_seconds': total,
+                'mean_seconds': total / count,
+                'min_seconds': shortest,
+                'max_seconds': longest
+            }
+            for phase, (count, total, shortest, longest) in sorted(
+                self.stats.items(), key=lambda item: -item[1][1]
+            )
+        }
+
+    def write_json(self, path: str):
+        """Write the ``summary`` as JSON."""
+        with open(path, 'w') as f:
+            json.dump({'phases': self.summary(), 'dropped_events': self.dropped}, f, indent=2)
+
+    def chrome_trace(self) -> Dict:
+        """The recorded calls as Chrome trace events (complete ``'X'`` events)."""
+        origin = min((start for _, start, _, _ in self.events), default=0.0)
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': phase,
+                    'cat': phase.split('.', 1)[0] if '.' in phase else 'simulation',
+                    'ph': 'X',
+                    'ts': (start - origin) * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': pid,
+                    'tid': thread
+                }
+                for phase, start, duration, thread in self.events
+            ],
+            'displayTimeUnit': 'ms'
+        }
+
+    def write_chrome_trace(self, path: str):
+        """Write a trace that ``chrome://tracing`` or Perfetto can open."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,429 @@
+"""
+Shared machinery for the coastal resilience submodels.
+"""
+
+import copy
+import numpy as np
+from dataclasses import fields
+from typing import Any, Dict, Optional, Sequence, Tuple, Type, Union
+
+# Fields that define the time axis and must agree across ensemble members
+TIME_FIELDS = ('start_year', 'end_year', 'time_step', 'output_step')
+
+# Named step lengths, in years
+TIME_STEPS = {'annual': 1, 'monthly': 1 / 12, 'daily': 1 / 365}
+
+# Decimal places kept when converting step counts back to decimal years
+TIME_DECIMALS = 9
+
+
+def as_float(value) -> np.ndarray:
+    """Parameter value as a float array; complex values stay complex.
+
+    Complex parameters let calibration differentiate the update rules by
+    the complex-step method, so the rules must not drop imaginary parts.
+    """
+    return np.asarray(value, dtype=np.result_type(value, float))
+
+
+def resolve_time_step(value: Union[int, float, str]) -> Union[int, float]:
+    """Length of a step in years, given as a number or ``'monthly'``/``'daily'``."""
+    if isinstance(value, str):
+        if value not in TIME_STEPS:
+            raise ValueError(
+                f"Unknown time step {value!r}; use a number of years or one of "
+                f"{', '.join(TIME_STEPS)}"
+            )
+        return TIME_STEPS[value]
+    if value <= 0:
+        raise ValueError("The time step must be positive")
+    return value
+
+
+def time_axis(parameters) -> Tuple[np.ndarray, np.ndarray, float, int]:
+    """Resolve the time fields of a parameter set.
+
+    Returns the stored time axis (``years``), the step number of every
+    stored sample, the step length in years and the total number of steps.
+    ``output_step`` (default: every step) thins the stored samples, so
+    daily runs need not keep every day; ``end_year`` is always stored, even
+    when ``output_step`` does not divide the span. Integer steps keep an
+    integer axis; sub-annual ones use decimal years.
+    """
+    dt = resolve_time_step(parameters.time_step)
+    output = dt if parameters.output_step is None else resolve_time_step(parameters.output_step)
+    if output < dt:
+        raise ValueError("output_step cannot be shorter than time_step")
+
+    span = parameters.end_year - parameters.start_year
+    n_steps = int(round(span / dt))
+    if abs(n_steps * dt - span) > 1e-6:
+        raise ValueError("end_year - start_year must be a whole number of time steps")
+    n_samples = int(np.floor(span / output + 1e-9)) + 1
+    sample_steps = np.round(np.arange(n_samples) * (output / dt)).astype(int)
+    if sample_steps[-1] != n_steps:
+        sample_steps = np.append(sample_steps, n_steps)
+
+    if float(dt).is_integer() and float(output).is_integer():
+        years = parameters.start_year + sample_steps * int(dt)
+    else:
+        years = np.round(parameters.start_year + sample_steps * dt, TIME_DECIMALS)
+    return years, sample_steps, dt, n_steps
+
+
+def stack_parameters(
+    parameters: Union[Any, Sequence[Any], None],
+    parameter_class: Type
+) -> Tuple[Any, Tuple[int, ...]]:
+    """Resolve model parameters into a single (possibly batched) dataclass.
+
+    A single dataclass instance (or None) is returned unchanged. Its batch
+    shape is the broadcast shape of its fields, so an instance whose rate
+    fields already hold arrays describes a whole batch. A sequence of
+    dataclasses is stacked into one instance of ``parameter_class`` whose
+    non-time fields are NumPy arrays of shape ``(n_members,)``, so the model
+    update rules broadcast over the ensemble without modification.
+    """
+    if parameters is None:
+        return parameter_class(), ()
+    if isinstance(parameters, parameter_class):
+        batch_shape = np.broadcast_shapes(*(
+            np.shape(getattr(parameters, field.name))
+            for field in fields(parameter_class)
+            if field.name not in TIME_FIELDS
+        ))
+        return parameters, batch_shape
+
+    members = list(parameters)
+    if not members:
+        raise ValueError("At least one parameter set is required for a batch")
+    for member in members:
+        if not isinstance(member, parameter_class):
+            raise TypeError(
+                f"Expected {parameter_class.__name__}, got {type(member).__name__}"
+            )
+
+    stacked = {}
+    for field in fields(parameter_class):
+        values = [getattr(member, field.name) for member in members]
+        if field.name in TIME_FIELDS:
+            if any(value != values[0] for value in values):
+                raise ValueError(
+                    f"All ensemble members must share the same {field.name}"
+                )
+            stacked[field.name] = values[0]
+        else:
+            stacked[field.name] = np.asarray(values, dtype=float)
+
+    return parameter_class(**stacked), (len(members),)
+
+
+class BaseModel:
+    """Common base class for the submodels.
+
+    State arrays have shape ``batch_shape + (len(years),)``: a plain run has
+    an empty batch shape and one-dimensional trajectories, an ensemble run
+    has one row per member and a gridded run one raster per year, e.g.
+    ``(rows, cols, years)``.
+    """
+
+    parameter_class: Type = None
+    # Names of the state arrays, in the order they are reported
+    state_variables: Tuple[str, ...] = ()
+    # Set on forks whose state arrays still belong to the parent
+    _shared = False
+    # (step, state) a fork branched at and the parent's arrays then; None = no fork
+    _fork_point = None
+    _history = None
+    # Storage dtype of the state arrays
+    dtype = np.dtype(np.float64)
+
+    def _set_parameters(self, parameters):
+        """Store (and, for ensembles, stack) the model parameters."""
+        self.parameters, self.batch_shape = stack_parameters(
+            parameters, self.parameter_class
+        )
+
+    def parameter_fingerprint(self) -> Tuple:
+        """Hashable snapshot of the parameter values, for change detection."""
+        snapshot = []
+        for field in fields(self.parameters):
+            value = getattr(self.parameters, field.name)
+            if isinstance(value, np.ndarray):
+                value = (value.shape, value.dtype.str, value.tobytes())
+            snapshot.append((field.name, value))
+        return tuple(snapshot)
+
+    @property
+    def n_members(self) -> int:
+        """Number of ensemble members advanced together (1 for a plain run)."""
+        return int(np.prod(self.batch_shape, dtype=int))
+
+    def _zeros(self) -> np.ndarray:
+        """Allocate a state array covering the batch and the time axis."""
+        return np.zeros(self.batch_shape + (len(self.years),), dtype=self.dtype)
+
+    def _initialize_time_axis(self):
+        """Set up the time axis and rewind to ``start_year``.
+
+        Called first by each model's ``_initialize_state``. Annual steps
+        that store every year advance with the model's own update rules;
+        any other axis (sub-annual or thinned output) is advanced from the
+        closed-form solution, so only the stored samples are ever written.
+        """
+        self.years, self._sample_steps, self._dt, self._n_steps = time_axis(self.parameters)
+        self._annual_steps = self._dt == 1 and len(self.years) == self._n_steps + 1
+        self.current_year = self.parameters.start_year
+        # (step, state) the closed form is evaluated from; None = initial state
+        self._anchor = None
+        # Current state when it is not a stored sample; None = read the arrays
+        self._state = None
+        # A reset run no longer continues from a fork
+        self._fork_point = self._history = None
+
+    def fork(self, parameters=None) -> 'BaseModel':
+        """Branch the model at ``current_year``, optionally with new parameters.
+
+        The branch shares the parent's state arrays until it first writes,
+        then copies only the history up to the fork year (copy-on-write), so
+        forking is O(1) and many branches can share one simulated prefix.
+        New parameters apply from the fork year onwards; they may be a batch,
+        in which case the shared history is broadcast to every member.
+        """
+        branch = copy.copy(self)
+        # Where the branch's own parameters take effect, and the history before it
+        branch._fork_point = (
+            self._step_of(self.current_year),
+            {name: np.array(values) for name, values in self._current_state().items()}
+        )
+        branch._history = {name: getattr(self, name) for name in self.state_variables}
+        if parameters is None:
+            branch.parameters = copy.deepcopy(self.parameters)
+        else:
+            branch._set_parameters(parameters)
+            for name in TIME_FIELDS:
+                if getattr(branch.parameters, name) != getattr(self.parameters, name):
+                    raise ValueError(f"A fork cannot change {name}")
+            # The new parameters' closed form starts at the fork
+            branch._anchor = branch._fork_point
+        branch._shared = True
+        # The parent writes copy-on-write too, so it cannot rewrite the branch's history
+        self._shared = True
+        return branch
+
+    def rewind(self):
+        """Go back to where the current parameters take effect.
+
+        For a fork that is the fork year: the history before it belongs to
+        the parent's parameters and is restored from the parent's arrays,
+        which copy-on-write keeps unchanged, and the closed form starts from
+        the state there. Any other model is reset to its initial state.
+        """
+        if self._fork_point is None:
+            self.reset()
+            return
+        self._set_parameters(self.parameters)
+        step, state = self._anchor = self._fork_point
+        last = int(np.searchsorted(self._sample_steps, step, side='right')) - 1
+        for name in self.state_variables:
+            own = self._zeros()
+            own[..., :last + 1] = self._history[name][..., :last + 1]
+            setattr(self, name, own)
+        self._shared = False
+        self.current_year = self._time_of(step)
+        self._state = None if self._sample_steps[last] == step else dict(state)
+
+    def _materialize(self):
+        """Give a fork its own state arrays before it writes to them."""
+        if not self._shared:
+            return
+        idx = self._last_index()
+        for name in self.state_variables:
+            own = self._zeros()
+            own[..., :idx + 1] = getattr(self, name)[..., :idx + 1]
+            setattr(self, name, own)
+        self._shared = False
+
+    def _time_of(self, step: int):
+        """Decimal year of a step number."""
+        return round(self.parameters.start_year + step * self._dt, TIME_DECIMALS)
+
+    def _step_of(self, year) -> int:
+        """Return the step number of ``year`` in O(1)."""
+        step = int(round((year - self.parameters.start_year) / self._dt))
+        if (
+            abs(self.parameters.start_year + step * self._dt - year) > 1e-6 or
+            not 0 <= step <= self._n_steps
+        ):
+            raise ValueError(f"Year {year} is not on the simulation time axis")
+        return step
+
+    def _index_of(self, year) -> int:
+        """Return the position of ``year`` on the stored time axis.
+
+        The axis is a regular grid of steps, so the position follows from
+        the start year and step length without scanning ``years``; when
+        every step is stored, it is the step number itself.
+        """
+        step = self._step_of(year)
+        if self._annual_steps:
+            return step
+        idx = int(np.searchsorted(self._sample_steps, step))
+        if idx == len(self._sample_steps) or self._sample_steps[idx] != step:
+            raise ValueError(f"Year {year} is not a stored sample of the time axis")
+        return idx
+
+    def _current_index(self) -> int:
+        """Return the position of ``current_year`` on the stored time axis."""
+        return self._index_of(self.current_year)
+
+    def _position(self, idx: int):
+        """Index of stored sample ``idx`` in a state array.
+
+        Plain runs use the bare position, so reads give NumPy scalars rather
+        than 0-d arrays, which are several times slower to compute with;
+        batches index the last axis.
+        """
+        return (Ellipsis, idx) if self.batch_shape else idx
+
+    def _step_positions(self) -> Tuple:
+        """Indices of the current and the next stored sample, for ``simulate_step``."""
+        idx = self._current_index()
+        return self._position(idx), self._position(idx + 1)
+
+    def _last_index(self) -> int:
+        """Position of the last stored sample at or before ``current_year``."""
+        step = self._step_of(self.current_year)
+        if self._annual_steps:
+            return step
+        return int(np.searchsorted(self._sample_steps, step, side='right')) - 1
+
+    def _at_sample(self) -> bool:
+        """Whether ``current_year`` is a stored sample."""
+        return self._sample_steps[self._last_index()] == self._step_of(self.current_year)
+
+    def _current_state(self) -> Dict[str, np.ndarray]:
+        """State variables at ``current_year``."""
+        if self._state is not None:
+            return dict(self._state)
+        idx = self._position(self._current_index())
+        return {name: getattr(self, name)[idx] for name in self.state_variables}
+
+    def _anchor_point(self) -> Tuple[int, Dict[str, np.ndarray]]:
+        """Step and state the closed-form solution currently starts from."""
+        if self._anchor is not None:
+            return self._anchor
+        return 0, {name: getattr(self, name)[..., 0] for name in self.state_variables}
+
+    def state_at(self, year) -> Dict[str, float]:
+        """Get the model state in ``year`` without advancing the model.
+
+        Stored samples that have already been simulated are read from the
+        state arrays; any other year is evaluated from the closed-form
+        solution (or, for models without one, by stepping a copy of the
+        model).
+        """
+        step = self._step_of(year)
+        current_step = self._step_of(self.current_year)
+        if step == current_step:
+            return {'year': year, **self._current_state()}
+        if step < current_step:
+            try:
+                idx = self._index_of(year)
+            except ValueError:
+                idx = None
+            if idx is not None:
+                return {
+                    'year': year,
+                    **{name: getattr(self, name)[..., idx] for name in self.state_variables}
+                }
+
+        anchor_step, anchor_state = self._anchor_point()
+        if self._closed_form_available() and step >= anchor_step:
+            projected = self._project(
+                anchor_state, np.array([(step - anchor_step) * self._dt])
+            )
+            return {'year': year, **{name: values[..., 0] for name, values in projected.items()}}
+        if step < current_step:
+            raise ValueError(f"Year {year} was not stored and cannot be recomputed")
+
+        model = copy.deepcopy(self)
+        while model.current_year < year:
+            model.simulate_step()
+        return model.get_current_state()
+
+    @staticmethod
+    def _growth(factor, elapsed: np.ndarray) -> np.ndarray:
+        """Raise a (possibly batched) annual factor to each elapsed time.
+
+        A negative factor alternates in sign from year to year, which has no
+        value between years, so it needs whole-year elapsed times.
+        """
+        factor = as_float(factor)
+        if np.any(np.real(factor) < 0) and np.any(elapsed % 1):
+            raise ValueError(
+                "A rate giving a negative annual factor needs annual time steps "
+                "(fractional years of it are undefined)"
+            )
+        return factor[..., None] ** elapsed
+
+    def _closed_form_available(self) -> bool:
+        """Whether ``simulate_all`` may use the closed-form solution.
+
+        The closed form is only exact for the update rules it was derived
+        from, so a subclass overriding ``simulate_step`` without providing a
+        matching ``_project`` falls back to stepping.
+        """
+        for cls in type(self).__mro__:
+            if 'simulate_step' in vars(cls):
+                return '_project' in vars(cls)
+        return False
+
+    def _project(self, state: Dict[str, np.ndarray], elapsed: np.ndarray) -> Dict[str, np.ndarray]:
+        """Evaluate the state ``elapsed`` years after ``state``.
+
+        The update rules are annual, so whole years reproduce them exactly
+        and fractions of a year interpolate them geometrically. Returns one
+        array per state variable with shape ``batch_shape + (len(elapsed),)``.
+        """
+        raise NotImplementedError
+
+    def _advance(self) -> Dict[str, np.ndarray]:
+        """Advance one step on a sub-annual or thinned time axis.
+
+        The new state is evaluated from the closed-form solution at the
+        anchor, so stepping accumulates no discretisation error, and it is
+        written to the state arrays only if it is a stored sample.
+        """
+        if not self._closed_form_available():
+            raise ValueError(
+                f"{type(self).__name__} needs annual steps without output_step"
+            )
+        self._materialize()
+        step = self._step_of(self.current_year) + 1
+        anchor_step, anchor_state = self._anchor_point()
+        projected = self._project(anchor_state, np.array([(step - anchor_step) * self._dt]))
+        self._state = {name: values[..., 0] for name, values in projected.items()}
+        self.current_year = self._time_of(step)
+
+        idx = int(np.searchsorted(self._sample_steps, step))
+        if idx < len(self._sample_steps) and self._sample_steps[idx] == step:
+            for name, values in self._state.items():
+                getattr(self, name)[..., idx] = values
+        return {'year': self.current_year, **self._state}
+
+    def _fill_closed_form(self):
+        """Fill the remaining stored samples in one vectorized evaluation."""
+        if self._step_of(self.current_year) >= self._n_steps:
+            return
+
+        self._materialize()
+        anchor_step, anchor_state = self._anchor_point()
+        first = self._last_index() + 1
+        targets = np.append(self._sample_steps[first:], self._n_steps)
+        projected = self._project(anchor_state, (targets - anchor_step) * self._dt)
+        for name, values in projected.items():
+            getattr(self, name)[..., first:] = values[..., :-1]
+
+        self._state = {name: values[..., -1] for name, values in projected.items()}
+        self.current_year = self._time_of(self._n_steps)
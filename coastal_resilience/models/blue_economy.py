@@ -4,15 +4,18 @@ Blue economy model for simulating marine economic activities in coastal Banglade
 
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+from .base import BaseModel, as_float
+
 @dataclass
 class BlueEconomyParameters:
     """Parameters for blue economy model simulation."""
     start_year: int = 2024
     end_year: int = 2039
-    time_step: int = 1  # years
+    time_step: Union[int, float, str] = 1  # years, or 'monthly' / 'daily'
+    output_step: Optional[Union[int, float, str]] = None  # years between stored samples
     
     # Fisheries parameters
     initial_fisheries_value: float = 1.0  # billion USD
@@ -39,51 +42,68 @@ class BlueEconomyParameters:
     biotech_growth_rate: float = 0.12  # %/year
     research_investment_rate: float = 0.1  # % of biotech value
 
-class BlueEconomyModel:
+class BlueEconomyModel(BaseModel):
     """Blue economy model for simulating marine economic activities."""
     
-    def __init__(self, parameters: Optional[BlueEconomyParameters] = None):
-        """Initialize the blue economy model with parameters."""
-        self.parameters = parameters or BlueEconomyParameters()
+    parameter_class = BlueEconomyParameters
+    state_variables = (
+        'fisheries_value',
+        'aquaculture_value',
+        'tourism_value',
+        'renewable_energy',
+        'biotech_value',
+        'total_value'
+    )
+
+    def __init__(
+        self,
+        parameters: Optional[Union[BlueEconomyParameters, Sequence[BlueEconomyParameters]]] = None,
+        dtype: np.dtype = np.float64
+    ):
+        """Initialize the blue economy model with parameters.
+
+        A sequence of parameter sets runs an ensemble: every state array then
+        has shape (members, years) and all members advance together.
+        ``dtype`` sets the storage precision of the state arrays.
+        """
+        self.dtype = np.dtype(dtype)
+        self._set_parameters(parameters)
         self._initialize_state()
     
     def _initialize_state(self):
         """Initialize the model state variables."""
-        self.years = np.arange(
-            self.parameters.start_year,
-            self.parameters.end_year + 1,
-            self.parameters.time_step
-        )
-        self.current_year = self.parameters.start_year
+        self._initialize_time_axis()
         
         # Initialize state variables
-        self.fisheries_value = np.zeros(len(self.years))
-        self.aquaculture_value = np.zeros(len(self.years))
-        self.tourism_value = np.zeros(len(self.years))
-        self.renewable_energy = np.zeros(len(self.years))
-        self.biotech_value = np.zeros(len(self.years))
-        self.total_value = np.zeros(len(self.years))
+        self.fisheries_value = self._zeros()
+        self.aquaculture_value = self._zeros()
+        self.tourism_value = self._zeros()
+        self.renewable_energy = self._zeros()
+        self.biotech_value = self._zeros()
+        self.total_value = self._zeros()
         
         # Set initial conditions
-        self.fisheries_value[0] = self.parameters.initial_fisheries_value
-        self.aquaculture_value[0] = self.parameters.initial_aquaculture_value
-        self.tourism_value[0] = self.parameters.initial_tourism_value
-        self.renewable_energy[0] = self.parameters.initial_renewable_energy
-        self.biotech_value[0] = self.parameters.initial_biotech_value
-        self.total_value[0] = (
-            self.fisheries_value[0] +
-            self.aquaculture_value[0] +
-            self.tourism_value[0] +
-            self.biotech_value[0]
+        self.fisheries_value[..., 0] = self.parameters.initial_fisheries_value
+        self.aquaculture_value[..., 0] = self.parameters.initial_aquaculture_value
+        self.tourism_value[..., 0] = self.parameters.initial_tourism_value
+        self.renewable_energy[..., 0] = self.parameters.initial_renewable_energy
+        self.biotech_value[..., 0] = self.parameters.initial_biotech_value
+        self.total_value[..., 0] = (
+            self.fisheries_value[..., 0] +
+            self.aquaculture_value[..., 0] +
+            self.tourism_value[..., 0] +
+            self.biotech_value[..., 0]
         )
     
     def simulate_step(self) -> Dict[str, float]:
         """Simulate one time step of blue economy change."""
         if self.current_year >= self.parameters.end_year:
             raise ValueError("Simulation has reached end year")
+        if not self._annual_steps:
+            return self._advance()
         
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        next_idx = current_idx + 1
+        self._materialize()
+        current_idx, next_idx = self._step_positions()
         
         # Update fisheries value
         self.fisheries_value[next_idx] = (
@@ -106,7 +126,7 @@ class BlueEconomyModel:
         )
         
         # Update renewable energy
-        self.renewable_energy[next_idx] = min(
+        self.renewable_energy[next_idx] = np.minimum(
             self.renewable_energy[current_idx] * 
             (1 + self.parameters.renewable_energy_growth_rate),
             self.parameters.maximum_potential
@@ -128,7 +148,7 @@ class BlueEconomyModel:
         )
         
         # Update current year
-        self.current_year += self.parameters.time_step
+        self.current_year += self._dt
         
         return {
             'year': self.current_year,
@@ -140,8 +160,55 @@ class BlueEconomyModel:
             'total_value': self.total_value[next_idx]
         }
     
-    def simulate_all(self) -> Dict[str, np.ndarray]:
-        """Simulate the entire time period."""
+    def _closed_form_available(self) -> bool:
+        """The capped renewable energy closed form needs a non-negative factor."""
+        growth = 1 + np.asarray(self.parameters.renewable_energy_growth_rate)
+        return super()._closed_form_available() and bool(np.all(growth >= 0))
+    
+    def _project(self, state: Dict[str, np.ndarray], elapsed: np.ndarray) -> Dict[str, np.ndarray]:
+        """Closed-form blue economy state ``elapsed`` years after ``state``."""
+        p = self.parameters
+        fisheries = state['fisheries_value'][..., None] * self._growth(
+            (1 + p.fisheries_growth_rate) * p.sustainable_harvest_rate, elapsed
+        )
+        aquaculture = state['aquaculture_value'][..., None] * self._growth(
+            (1 + p.aquaculture_growth_rate) * p.sustainable_aquaculture_rate,
+            elapsed
+        )
+        tourism = state['tourism_value'][..., None] * self._growth(
+            1 + p.tourism_growth_rate, elapsed
+        )
+        biotech = state['biotech_value'][..., None] * self._growth(
+            (1 + p.biotech_growth_rate) * (1 + p.research_investment_rate), elapsed
+        )
+        
+        # Iterating min(x * g, cap) gives min(x * g**n, cap * min(1, g)**(n - 1))
+        growth = 1 + as_float(p.renewable_energy_growth_rate)
+        renewable = np.minimum(
+            state['renewable_energy'][..., None] * self._growth(growth, elapsed),
+            np.asarray(p.maximum_potential)[..., None] *
+            self._growth(np.minimum(growth, 1), elapsed - 1)
+        )
+        
+        return {
+            'fisheries_value': fisheries,
+            'aquaculture_value': aquaculture,
+            'tourism_value': tourism,
+            'renewable_energy': renewable,
+            'biotech_value': biotech,
+            'total_value': fisheries + aquaculture + tourism + biotech
+        }
+    
+    def simulate_all(self, stepwise: bool = False) -> Dict[str, np.ndarray]:
+        """Simulate the entire time period.
+
+        The remaining years are filled from the closed-form solution of the
+        update rules; ``stepwise=True`` advances year by year instead and is
+        kept as the reference implementation.
+        """
+        if not stepwise and self._closed_form_available():
+            self._fill_closed_form()
+        
         while self.current_year < self.parameters.end_year:
             self.simulate_step()
         
@@ -157,16 +224,7 @@ class BlueEconomyModel:
     
     def get_current_state(self) -> Dict[str, float]:
         """Get the current state of the blue economy model."""
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        return {
-            'year': self.current_year,
-            'fisheries_value': self.fisheries_value[current_idx],
-            'aquaculture_value': self.aquaculture_value[current_idx],
-            'tourism_value': self.tourism_value[current_idx],
-            'renewable_energy': self.renewable_energy[current_idx],
-            'biotech_value': self.biotech_value[current_idx],
-            'total_value': self.total_value[current_idx]
-        }
+        return {'year': self.current_year, **self._current_state()}
     
     def reset(self):
         """Reset the model to initial conditions."""
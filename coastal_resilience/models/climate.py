@@ -4,59 +4,79 @@ Climate model for simulating climate change impacts on coastal Bangladesh.
 
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+from .base import BaseModel
+
 @dataclass
 class ClimateParameters:
     """Parameters for climate model simulation."""
     start_year: int = 2024
     end_year: int = 2039
-    time_step: int = 1  # years
+    time_step: Union[int, float, str] = 1  # years, or 'monthly' / 'daily'
+    output_step: Optional[Union[int, float, str]] = None  # years between stored samples
     sea_level_rise_rate: float = 0.5  # cm/year
     temperature_increase_rate: float = 0.03  # °C/year
     rainfall_change_rate: float = 0.02  # %/year
     cyclone_frequency_change: float = 0.05  # %/year
     storm_surge_intensity_change: float = 0.03  # %/year
 
-class ClimateModel:
+class ClimateModel(BaseModel):
     """Climate model for simulating climate change impacts."""
     
-    def __init__(self, parameters: Optional[ClimateParameters] = None):
-        """Initialize the climate model with parameters."""
-        self.parameters = parameters or ClimateParameters()
+    parameter_class = ClimateParameters
+    state_variables = (
+        'sea_level',
+        'temperature',
+        'rainfall',
+        'cyclone_frequency',
+        'storm_surge_intensity'
+    )
+
+    def __init__(
+        self,
+        parameters: Optional[Union[ClimateParameters, Sequence[ClimateParameters]]] = None,
+        dtype: np.dtype = np.float64
+    ):
+        """Initialize the climate model with parameters.
+
+        A sequence of parameter sets runs an ensemble: every state array then
+        has shape (members, years) and all members advance together.
+        Parameters holding 2-D arrays run the model on a grid, one cell per
+        element; ``dtype=np.float32`` halves the memory of large grids.
+        """
+        self.dtype = np.dtype(dtype)
+        self._set_parameters(parameters)
         self._initialize_state()
     
     def _initialize_state(self):
         """Initialize the model state variables."""
-        self.years = np.arange(
-            self.parameters.start_year,
-            self.parameters.end_year + 1,
-            self.parameters.time_step
-        )
-        self.current_year = self.parameters.start_year
+        self._initialize_time_axis()
         
         # Initialize state variables
-        self.sea_level = np.zeros(len(self.years))
-        self.temperature = np.zeros(len(self.years))
-        self.rainfall = np.zeros(len(self.years))
-        self.cyclone_frequency = np.zeros(len(self.years))
-        self.storm_surge_intensity = np.zeros(len(self.years))
+        self.sea_level = self._zeros()
+        self.temperature = self._zeros()
+        self.rainfall = self._zeros()
+        self.cyclone_frequency = self._zeros()
+        self.storm_surge_intensity = self._zeros()
         
         # Set initial conditions
-        self.sea_level[0] = 0.0  # cm relative to 2024
-        self.temperature[0] = 0.0  # °C relative to 2024
-        self.rainfall[0] = 100.0  # % relative to 2024
-        self.cyclone_frequency[0] = 100.0  # % relative to 2024
-        self.storm_surge_intensity[0] = 100.0  # % relative to 2024
+        self.sea_level[..., 0] = 0.0  # cm relative to 2024
+        self.temperature[..., 0] = 0.0  # °C relative to 2024
+        self.rainfall[..., 0] = 100.0  # % relative to 2024
+        self.cyclone_frequency[..., 0] = 100.0  # % relative to 2024
+        self.storm_surge_intensity[..., 0] = 100.0  # % relative to 2024
     
     def simulate_step(self) -> Dict[str, float]:
         """Simulate one time step of climate change."""
         if self.current_year >= self.parameters.end_year:
             raise ValueError("Simulation has reached end year")
+        if not self._annual_steps:
+            return self._advance()
         
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        next_idx = current_idx + 1
+        self._materialize()
+        current_idx, next_idx = self._step_positions()
         
         # Update state variables
         self.sea_level[next_idx] = (
@@ -85,7 +105,7 @@ class ClimateModel:
         )
         
         # Update current year
-        self.current_year += self.parameters.time_step
+        self.current_year += self._dt
         
         return {
             'year': self.current_year,
@@ -96,8 +116,42 @@ class ClimateModel:
             'storm_surge_intensity': self.storm_surge_intensity[next_idx]
         }
     
-    def simulate_all(self) -> Dict[str, np.ndarray]:
-        """Simulate the entire time period."""
+    def _project(self, state: Dict[str, np.ndarray], elapsed: np.ndarray) -> Dict[str, np.ndarray]:
+        """Closed-form climate state ``elapsed`` years after ``state``."""
+        p = self.parameters
+        return {
+            'sea_level': (
+                state['sea_level'][..., None] +
+                np.asarray(p.sea_level_rise_rate)[..., None] * elapsed
+            ),
+            'temperature': (
+                state['temperature'][..., None] +
+                np.asarray(p.temperature_increase_rate)[..., None] * elapsed
+            ),
+            'rainfall': (
+                state['rainfall'][..., None] *
+                self._growth(1 + p.rainfall_change_rate, elapsed)
+            ),
+            'cyclone_frequency': (
+                state['cyclone_frequency'][..., None] *
+                self._growth(1 + p.cyclone_frequency_change, elapsed)
+            ),
+            'storm_surge_intensity': (
+                state['storm_surge_intensity'][..., None] *
+                self._growth(1 + p.storm_surge_intensity_change, elapsed)
+            )
+        }
+    
+    def simulate_all(self, stepwise: bool = False) -> Dict[str, np.ndarray]:
+        """Simulate the entire time period.
+
+        The remaining years are filled from the closed-form solution of the
+        update rules; ``stepwise=True`` advances year by year instead and is
+        kept as the reference implementation.
+        """
+        if not stepwise and self._closed_form_available():
+            self._fill_closed_form()
+        
         while self.current_year < self.parameters.end_year:
             self.simulate_step()
         
@@ -112,15 +166,7 @@ class ClimateModel:
     
     def get_current_state(self) -> Dict[str, float]:
         """Get the current state of the climate model."""
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        return {
-            'year': self.current_year,
-            'sea_level': self.sea_level[current_idx],
-            'temperature': self.temperature[current_idx],
-            'rainfall': self.rainfall[current_idx],
-            'cyclone_frequency': self.cyclone_frequency[current_idx],
-            'storm_surge_intensity': self.storm_surge_intensity[current_idx]
-        }
+        return {'year': self.current_year, **self._current_state()}
     
     def reset(self):
         """Reset the model to initial conditions."""
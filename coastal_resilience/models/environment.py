@@ -4,15 +4,18 @@ Environmental model for simulating ecosystem dynamics in coastal Bangladesh.
 
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+from .base import BaseModel, as_float
+
 @dataclass
 class EnvironmentalParameters:
     """Parameters for environmental model simulation."""
     start_year: int = 2024
     end_year: int = 2039
-    time_step: int = 1  # years
+    time_step: Union[int, float, str] = 1  # years, or 'monthly' / 'daily'
+    output_step: Optional[Union[int, float, str]] = None  # years between stored samples
     
     # Mangrove parameters
     mangrove_degradation_rate: float = 0.013  # %/year
@@ -31,44 +34,61 @@ class EnvironmentalParameters:
     water_pollution_increase: float = 0.02  # %/year
     nutrient_loading_increase: float = 0.025  # %/year
 
-class EnvironmentalModel:
+class EnvironmentalModel(BaseModel):
     """Environmental model for simulating ecosystem dynamics."""
     
-    def __init__(self, parameters: Optional[EnvironmentalParameters] = None):
-        """Initialize the environmental model with parameters."""
-        self.parameters = parameters or EnvironmentalParameters()
+    parameter_class = EnvironmentalParameters
+    state_variables = (
+        'mangrove_coverage',
+        'salinity_levels',
+        'biodiversity_index',
+        'water_quality_index',
+        'carbon_sequestration'
+    )
+
+    def __init__(
+        self,
+        parameters: Optional[Union[EnvironmentalParameters, Sequence[EnvironmentalParameters]]] = None,
+        dtype: np.dtype = np.float64
+    ):
+        """Initialize the environmental model with parameters.
+
+        A sequence of parameter sets runs an ensemble: every state array then
+        has shape (members, years) and all members advance together.
+        Parameters holding 2-D arrays run the model on a grid, one cell per
+        element; ``dtype=np.float32`` halves the memory of large grids.
+        """
+        self.dtype = np.dtype(dtype)
+        self._set_parameters(parameters)
         self._initialize_state()
     
     def _initialize_state(self):
         """Initialize the model state variables."""
-        self.years = np.arange(
-            self.parameters.start_year,
-            self.parameters.end_year + 1,
-            self.parameters.time_step
-        )
-        self.current_year = self.parameters.start_year
+        self._initialize_time_axis()
         
         # Initialize state variables
-        self.mangrove_coverage = np.zeros(len(self.years))
-        self.salinity_levels = np.zeros(len(self.years))
-        self.biodiversity_index = np.zeros(len(self.years))
-        self.water_quality_index = np.zeros(len(self.years))
-        self.carbon_sequestration = np.zeros(len(self.years))
+        self.mangrove_coverage = self._zeros()
+        self.salinity_levels = self._zeros()
+        self.biodiversity_index = self._zeros()
+        self.water_quality_index = self._zeros()
+        self.carbon_sequestration = self._zeros()
         
         # Set initial conditions
-        self.mangrove_coverage[0] = 100.0  # % relative to 2024
-        self.salinity_levels[0] = 100.0  # % relative to 2024
-        self.biodiversity_index[0] = 100.0  # % relative to 2024
-        self.water_quality_index[0] = 100.0  # % relative to 2024
-        self.carbon_sequestration[0] = 0.0  # tons CO2
+        self.mangrove_coverage[..., 0] = 100.0  # % relative to 2024
+        self.salinity_levels[..., 0] = 100.0  # % relative to 2024
+        self.biodiversity_index[..., 0] = 100.0  # % relative to 2024
+        self.water_quality_index[..., 0] = 100.0  # % relative to 2024
+        self.carbon_sequestration[..., 0] = 0.0  # tons CO2
     
     def simulate_step(self) -> Dict[str, float]:
         """Simulate one time step of environmental change."""
         if self.current_year >= self.parameters.end_year:
             raise ValueError("Simulation has reached end year")
+        if not self._annual_steps:
+            return self._advance()
         
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        next_idx = current_idx + 1
+        self._materialize()
+        current_idx, next_idx = self._step_positions()
         
         # Update mangrove coverage
         self.mangrove_coverage[next_idx] = (
@@ -105,7 +125,7 @@ class EnvironmentalModel:
         )
         
         # Update current year
-        self.current_year += self.parameters.time_step
+        self.current_year += self._dt
         
         return {
             'year': self.current_year,
@@ -116,8 +136,63 @@ class EnvironmentalModel:
             'carbon_sequestration': self.carbon_sequestration[next_idx]
         }
     
-    def simulate_all(self) -> Dict[str, np.ndarray]:
-        """Simulate the entire time period."""
+    def _project(self, state: Dict[str, np.ndarray], elapsed: np.ndarray) -> Dict[str, np.ndarray]:
+        """Closed-form environmental state ``elapsed`` years after ``state``."""
+        p = self.parameters
+        
+        # Mangrove coverage follows m[t+1] = a * m[t] + b
+        a = as_float(1 - p.mangrove_degradation_rate)[..., None]
+        b = as_float(p.mangrove_restoration_rate)[..., None]
+        a_pow = self._growth(1 - p.mangrove_degradation_rate, elapsed)
+        mangrove = state['mangrove_coverage'][..., None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # sum of a**i for i in 0..n-1 and for i in 1..n
+            partial_sum = np.where(a == 1, elapsed, (1 - a_pow) / (1 - a))
+            shifted_sum = np.where(a == 1, elapsed, a * partial_sum)
+            # sum over the projected years of (1 - a**i) / (1 - a)
+            restoration_sum = np.where(
+                a == 1,
+                elapsed * (elapsed + 1) / 2,
+                (elapsed - shifted_sum) / (1 - a)
+            )
+        
+        return {
+            'mangrove_coverage': a_pow * mangrove + b * partial_sum,
+            'salinity_levels': (
+                state['salinity_levels'][..., None] *
+                self._growth(1 + p.salinity_intrusion_rate, elapsed)
+            ),
+            'biodiversity_index': (
+                state['biodiversity_index'][..., None] *
+                self._growth(
+                    1 - p.species_loss_rate - p.habitat_fragmentation_rate,
+                    elapsed
+                )
+            ),
+            'water_quality_index': (
+                state['water_quality_index'][..., None] *
+                self._growth(
+                    1 - p.water_pollution_increase - p.nutrient_loading_increase,
+                    elapsed
+                )
+            ),
+            'carbon_sequestration': (
+                state['carbon_sequestration'][..., None] +
+                np.asarray(p.mangrove_carbon_sequestration)[..., None] *
+                (mangrove * shifted_sum + b * restoration_sum)
+            )
+        }
+    
+    def simulate_all(self, stepwise: bool = False) -> Dict[str, np.ndarray]:
+        """Simulate the entire time period.
+
+        The remaining years are filled from the closed-form solution of the
+        update rules; ``stepwise=True`` advances year by year instead and is
+        kept as the reference implementation.
+        """
+        if not stepwise and self._closed_form_available():
+            self._fill_closed_form()
+        
         while self.current_year < self.parameters.end_year:
             self.simulate_step()
         
@@ -132,15 +207,7 @@ class EnvironmentalModel:
     
     def get_current_state(self) -> Dict[str, float]:
         """Get the current state of the environmental model."""
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        return {
-            'year': self.current_year,
-            'mangrove_coverage': self.mangrove_coverage[current_idx],
-            'salinity_levels': self.salinity_levels[current_idx],
-            'biodiversity_index': self.biodiversity_index[current_idx],
-            'water_quality_index': self.water_quality_index[current_idx],
-            'carbon_sequestration': self.carbon_sequestration[current_idx]
-        }
+        return {'year': self.current_year, **self._current_state()}
     
     def reset(self):
         """Reset the model to initial conditions."""
@@ -4,15 +4,18 @@ Policy model for simulating governance and policy interventions in coastal Bangl
 
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+from .base import BaseModel
+
 @dataclass
 class PolicyParameters:
     """Parameters for policy model simulation."""
     start_year: int = 2024
     end_year: int = 2039
-    time_step: int = 1  # years
+    time_step: Union[int, float, str] = 1  # years, or 'monthly' / 'daily'
+    output_step: Optional[Union[int, float, str]] = None  # years between stored samples
     
     # Policy implementation parameters
     policy_effectiveness: float = 0.7  # % of intended impact
@@ -34,53 +37,69 @@ class PolicyParameters:
     data_quality: float = 0.85  # % of maximum quality
     evaluation_frequency: float = 0.9  # % of required evaluations
 
-class PolicyModel:
+class PolicyModel(BaseModel):
     """Policy model for simulating governance and policy interventions."""
     
-    def __init__(self, parameters: Optional[PolicyParameters] = None):
-        """Initialize the policy model with parameters."""
-        self.parameters = parameters or PolicyParameters()
+    parameter_class = PolicyParameters
+    state_variables = (
+        'policy_impact',
+        'budget_utilization',
+        'institutional_performance',
+        'monitoring_effectiveness',
+        'overall_effectiveness'
+    )
+
+    def __init__(
+        self,
+        parameters: Optional[Union[PolicyParameters, Sequence[PolicyParameters]]] = None,
+        dtype: np.dtype = np.float64
+    ):
+        """Initialize the policy model with parameters.
+
+        A sequence of parameter sets runs an ensemble: every state array then
+        has shape (members, years) and all members advance together.
+        ``dtype`` sets the storage precision of the state arrays.
+        """
+        self.dtype = np.dtype(dtype)
+        self._set_parameters(parameters)
         self._initialize_state()
     
     def _initialize_state(self):
         """Initialize the model state variables."""
-        self.years = np.arange(
-            self.parameters.start_year,
-            self.parameters.end_year + 1,
-            self.parameters.time_step
-        )
-        self.current_year = self.parameters.start_year
+        self._initialize_time_axis()
         
         # Initialize state variables
-        self.policy_impact = np.zeros(len(self.years))
-        self.budget_utilization = np.zeros(len(self.years))
-        self.institutional_performance = np.zeros(len(self.years))
-        self.monitoring_effectiveness = np.zeros(len(self.years))
-        self.overall_effectiveness = np.zeros(len(self.years))
+        self.policy_impact = self._zeros()
+        self.budget_utilization = self._zeros()
+        self.institutional_performance = self._zeros()
+        self.monitoring_effectiveness = self._zeros()
+        self.overall_effectiveness = self._zeros()
         
         # Set initial conditions
-        self.policy_impact[0] = self.parameters.policy_effectiveness
-        self.budget_utilization[0] = self.parameters.resource_utilization
-        self.institutional_performance[0] = self.parameters.institutional_capacity
-        self.monitoring_effectiveness[0] = (
+        self.policy_impact[..., 0] = self.parameters.policy_effectiveness
+        self.budget_utilization[..., 0] = self.parameters.resource_utilization
+        self.institutional_performance[..., 0] = self.parameters.institutional_capacity
+        self.monitoring_effectiveness[..., 0] = (
             self.parameters.monitoring_coverage *
             self.parameters.data_quality *
             self.parameters.evaluation_frequency
         )
-        self.overall_effectiveness[0] = (
-            self.policy_impact[0] *
-            self.budget_utilization[0] *
-            self.institutional_performance[0] *
-            self.monitoring_effectiveness[0]
+        self.overall_effectiveness[..., 0] = (
+            self.policy_impact[..., 0] *
+            self.budget_utilization[..., 0] *
+            self.institutional_performance[..., 0] *
+            self.monitoring_effectiveness[..., 0]
         )
     
     def simulate_step(self) -> Dict[str, float]:
         """Simulate one time step of policy change."""
         if self.current_year >= self.parameters.end_year:
             raise ValueError("Simulation has reached end year")
+        if not self._annual_steps:
+            return self._advance()
         
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        next_idx = current_idx + 1
+        self._materialize()
+        current_idx, next_idx = self._step_positions()
         
         # Update policy impact
         self.policy_impact[next_idx] = (
@@ -117,7 +136,7 @@ class PolicyModel:
         )
         
         # Update current year
-        self.current_year += self.parameters.time_step
+        self.current_year += self._dt
         
         return {
             'year': self.current_year,
@@ -128,8 +147,48 @@ class PolicyModel:
             'overall_effectiveness': self.overall_effectiveness[next_idx]
         }
     
-    def simulate_all(self) -> Dict[str, np.ndarray]:
-        """Simulate the entire time period."""
+    def _project(self, state: Dict[str, np.ndarray], elapsed: np.ndarray) -> Dict[str, np.ndarray]:
+        """Closed-form policy state ``elapsed`` years after ``state``."""
+        p = self.parameters
+        policy_impact = state['policy_impact'][..., None] * self._growth(
+            1 + p.coordination_efficiency, elapsed
+        )
+        budget_utilization = state['budget_utilization'][..., None] * self._growth(
+            (1 + p.budget_growth_rate) * p.resource_utilization, elapsed
+        )
+        institutional_performance = (
+            state['institutional_performance'][..., None] *
+            self._growth(
+                (1 + p.capacity_growth_rate) * p.stakeholder_engagement, elapsed
+            )
+        )
+        monitoring_effectiveness = (
+            state['monitoring_effectiveness'][..., None] *
+            self._growth(1 + p.evaluation_frequency, elapsed)
+        )
+        return {
+            'policy_impact': policy_impact,
+            'budget_utilization': budget_utilization,
+            'institutional_performance': institutional_performance,
+            'monitoring_effectiveness': monitoring_effectiveness,
+            'overall_effectiveness': (
+                policy_impact *
+                budget_utilization *
+                institutional_performance *
+                monitoring_effectiveness
+            )
+        }
+    
+    def simulate_all(self, stepwise: bool = False) -> Dict[str, np.ndarray]:
+        """Simulate the entire time period.
+
+        The remaining years are filled from the closed-form solution of the
+        update rules; ``stepwise=True`` advances year by year instead and is
+        kept as the reference implementation.
+        """
+        if not stepwise and self._closed_form_available():
+            self._fill_closed_form()
+        
         while self.current_year < self.parameters.end_year:
             self.simulate_step()
         
@@ -144,15 +203,7 @@ class PolicyModel:
     
     def get_current_state(self) -> Dict[str, float]:
         """Get the current state of the policy model."""
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        return {
-            'year': self.current_year,
-            'policy_impact': self.policy_impact[current_idx],
-            'budget_utilization': self.budget_utilization[current_idx],
-            'institutional_performance': self.institutional_performance[current_idx],
-            'monitoring_effectiveness': self.monitoring_effectiveness[current_idx],
-            'overall_effectiveness': self.overall_effectiveness[current_idx]
-        }
+        return {'year': self.current_year, **self._current_state()}
     
     def reset(self):
         """Reset the model to initial conditions."""
@@ -4,15 +4,18 @@ Socioeconomic model for simulating population and economic dynamics in coastal B
 
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+from .base import BaseModel
+
 @dataclass
 class SocioeconomicParameters:
     """Parameters for socioeconomic model simulation."""
     start_year: int = 2024
     end_year: int = 2039
-    time_step: int = 1  # years
+    time_step: Union[int, float, str] = 1  # years, or 'monthly' / 'daily'
+    output_step: Optional[Union[int, float, str]] = None  # years between stored samples
     
     # Population parameters
     initial_population: float = 35.0  # million
@@ -32,46 +35,63 @@ class SocioeconomicParameters:
     employment_growth_rate: float = 0.04  # %/year
     poverty_reduction_rate: float = 0.03  # %/year
 
-class SocioeconomicModel:
+class SocioeconomicModel(BaseModel):
     """Socioeconomic model for simulating population and economic dynamics."""
     
-    def __init__(self, parameters: Optional[SocioeconomicParameters] = None):
-        """Initialize the socioeconomic model with parameters."""
-        self.parameters = parameters or SocioeconomicParameters()
+    parameter_class = SocioeconomicParameters
+    state_variables = (
+        'population',
+        'gdp',
+        'blue_economy',
+        'infrastructure_quality',
+        'employment_rate',
+        'poverty_rate'
+    )
+
+    def __init__(
+        self,
+        parameters: Optional[Union[SocioeconomicParameters, Sequence[SocioeconomicParameters]]] = None,
+        dtype: np.dtype = np.float64
+    ):
+        """Initialize the socioeconomic model with parameters.
+
+        A sequence of parameter sets runs an ensemble: every state array then
+        has shape (members, years) and all members advance together.
+        ``dtype`` sets the storage precision of the state arrays.
+        """
+        self.dtype = np.dtype(dtype)
+        self._set_parameters(parameters)
         self._initialize_state()
     
     def _initialize_state(self):
         """Initialize the model state variables."""
-        self.years = np.arange(
-            self.parameters.start_year,
-            self.parameters.end_year + 1,
-            self.parameters.time_step
-        )
-        self.current_year = self.parameters.start_year
+        self._initialize_time_axis()
         
         # Initialize state variables
-        self.population = np.zeros(len(self.years))
-        self.gdp = np.zeros(len(self.years))
-        self.blue_economy = np.zeros(len(self.years))
-        self.infrastructure_quality = np.zeros(len(self.years))
-        self.employment_rate = np.zeros(len(self.years))
-        self.poverty_rate = np.zeros(len(self.years))
+        self.population = self._zeros()
+        self.gdp = self._zeros()
+        self.blue_economy = self._zeros()
+        self.infrastructure_quality = self._zeros()
+        self.employment_rate = self._zeros()
+        self.poverty_rate = self._zeros()
         
         # Set initial conditions
-        self.population[0] = self.parameters.initial_population
-        self.gdp[0] = self.parameters.initial_gdp
-        self.blue_economy[0] = self.gdp[0] * self.parameters.blue_economy_share
-        self.infrastructure_quality[0] = 100.0  # % relative to 2024
-        self.employment_rate[0] = 100.0  # % relative to 2024
-        self.poverty_rate[0] = 100.0  # % relative to 2024
+        self.population[..., 0] = self.parameters.initial_population
+        self.gdp[..., 0] = self.parameters.initial_gdp
+        self.blue_economy[..., 0] = self.gdp[..., 0] * self.parameters.blue_economy_share
+        self.infrastructure_quality[..., 0] = 100.0  # % relative to 2024
+        self.employment_rate[..., 0] = 100.0  # % relative to 2024
+        self.poverty_rate[..., 0] = 100.0  # % relative to 2024
     
     def simulate_step(self) -> Dict[str, float]:
         """Simulate one time step of socioeconomic change."""
         if self.current_year >= self.parameters.end_year:
             raise ValueError("Simulation has reached end year")
+        if not self._annual_steps:
+            return self._advance()
         
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        next_idx = current_idx + 1
+        self._materialize()
+        current_idx, next_idx = self._step_positions()
         
         # Update population
         self.population[next_idx] = (
@@ -112,7 +132,7 @@ class SocioeconomicModel:
         )
         
         # Update current year
-        self.current_year += self.parameters.time_step
+        self.current_year += self._dt
         
         return {
             'year': self.current_year,
@@ -124,8 +144,48 @@ class SocioeconomicModel:
             'poverty_rate': self.poverty_rate[next_idx]
         }
     
-    def simulate_all(self) -> Dict[str, np.ndarray]:
-        """Simulate the entire time period."""
+    def _project(self, state: Dict[str, np.ndarray], elapsed: np.ndarray) -> Dict[str, np.ndarray]:
+        """Closed-form socioeconomic state ``elapsed`` years after ``state``."""
+        p = self.parameters
+        gdp = state['gdp'][..., None] * self._growth(1 + p.gdp_growth_rate, elapsed)
+        return {
+            'population': (
+                state['population'][..., None] *
+                self._growth(
+                    1 + p.population_growth_rate - p.climate_migration_rate,
+                    elapsed
+                )
+            ),
+            'gdp': gdp,
+            'blue_economy': gdp * np.asarray(p.blue_economy_share)[..., None],
+            'infrastructure_quality': (
+                state['infrastructure_quality'][..., None] *
+                self._growth(
+                    1 - p.infrastructure_damage_rate +
+                    p.infrastructure_investment_rate,
+                    elapsed
+                )
+            ),
+            'employment_rate': (
+                state['employment_rate'][..., None] *
+                self._growth(1 + p.employment_growth_rate, elapsed)
+            ),
+            'poverty_rate': (
+                state['poverty_rate'][..., None] *
+                self._growth(1 - p.poverty_reduction_rate, elapsed)
+            )
+        }
+    
+    def simulate_all(self, stepwise: bool = False) -> Dict[str, np.ndarray]:
+        """Simulate the entire time period.
+
+        The remaining years are filled from the closed-form solution of the
+        update rules; ``stepwise=True`` advances year by year instead and is
+        kept as the reference implementation.
+        """
+        if not stepwise and self._closed_form_available():
+            self._fill_closed_form()
+        
         while self.current_year < self.parameters.end_year:
             self.simulate_step()
         
@@ -141,16 +201,7 @@ class SocioeconomicModel:
     
     def get_current_state(self) -> Dict[str, float]:
         """Get the current state of the socioeconomic model."""
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        return {
-            'year': self.current_year,
-            'population': self.population[current_idx],
-            'gdp': self.gdp[current_idx],
-            'blue_economy': self.blue_economy[current_idx],
-            'infrastructure_quality': self.infrastructure_quality[current_idx],
-            'employment_rate': self.employment_rate[current_idx],
-            'poverty_rate': self.poverty_rate[current_idx]
-        }
+        return {'year': self.current_year, **self._current_state()}
     
     def reset(self):
         """Reset the model to initial conditions."""
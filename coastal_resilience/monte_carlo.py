@@ -0,0 +1,220 @@
+"""
+Parallel Monte Carlo runner for the integrated simulation.
+"""
+
+import os
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Union
+
+from .simulation import (
+    SUBMODELS,
+    IntegratedSimulation,
+    flatten_results,
+    unflatten_results
+)
+from .streaming import EnsembleAccumulator, TrajectoryDensity
+
+def _simulate_chunk(parameters: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """Run one chunk of members as a single batched simulation."""
+    simulation = IntegratedSimulation(**{
+        SUBMODELS[submodel][0]: submodel_parameters
+        for submodel, submodel_parameters in parameters.items()
+    })
+    return flatten_results(simulation.simulate_all())
+
+def _run_chunk(
+    shm_name: str,
+    shape: Tuple[int, int, int],
+    variables: List[str],
+    start: int,
+    stop: int,
+    parameters: Dict[str, object]
+) -> int:
+    """Simulate a chunk in a worker and write it into the shared buffer."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        flat = _simulate_chunk(parameters)
+        for v, name in enumerate(variables):
+            buffer[v, start:stop] = flat[name]
+        del buffer
+    finally:
+        shm.close()
+    return start
+
+def _map_bounded(executor, function, calls, window: int):
+    """Results of ``function(*arguments)`` for each of ``calls``, in order.
+
+    At most ``window`` calls are in flight, and each future is dropped once
+    its result is handed on, so neither pending chunk parameters nor
+    finished results pile up however many chunks there are.
+    """
+    pending = deque()
+    for arguments in calls:
+        pending.append(executor.submit(function, *arguments))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _accumulate_chunk(
+    parameters: Dict[str, object],
+    accumulator: Union[EnsembleAccumulator, TrajectoryDensity]
+) -> Union[EnsembleAccumulator, TrajectoryDensity]:
+    """Simulate a chunk and reduce it into an empty mergeable accumulator."""
+    accumulator.update(unflatten_results(_simulate_chunk(parameters)))
+    return accumulator
+
+class MonteCarloRunner:
+    """Monte Carlo ensembles of the integrated simulation across processes.
+
+    Parameter distributions are given per submodel as
+    ``{'climate': {'sea_level_rise_rate': ('normal', 0.5, 0.1)}}``, where the
+    first element names a ``numpy.random.Generator`` method (``'uniform'``,
+    ``'normal'``, ``'lognormal'``, ``'triangular'``, ...) and the rest are its
+    arguments. Fields without a distribution keep their base value.
+
+    Members are split into chunks that run as batched simulations in a
+    process pool. Workers write their trajectories straight into a shared
+    memory block laid out as (variables, members, years), so only parameter
+    sets travel between processes.
+    """
+
+    def __init__(
+        self,
+        distributions: Dict[str, Dict[str, Tuple]],
+        base_parameters: Optional[Dict[str, object]] = None,
+        n_workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        seed: Optional[int] = None
+    ):
+        """Initialize the runner with parameter distributions."""
+        base_parameters = base_parameters or {}
+        for submodel in list(distributions) + list(base_parameters):
+            if submodel not in SUBMODELS:
+                raise ValueError(f"Unknown submodel: {submodel}")
+        for submodel, field_distributions in distributions.items():
+            valid = {field.name for field in fields(SUBMODELS[submodel][1])}
+            for name in field_distributions:
+                if name not in valid:
+                    raise ValueError(f"Unknown {submodel} parameter: {name}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        self.distributions = distributions
+        self.base_parameters = {
+            submodel: base_parameters.get(submodel) or parameter_class()
+            for submodel, (_, parameter_class, _) in SUBMODELS.items()
+        }
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+        self.samples: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def sample(self, n_members: int) -> Dict[str, Dict[str, np.ndarray]]:
+        """Draw ``n_members`` values for every distributed parameter."""
+        self.samples = {
+            submodel: {
+                name: getattr(self.rng, method)(*args, size=n_members)
+                for name, (method, *args) in field_distributions.items()
+            }
+            for submodel, field_distributions in self.distributions.items()
+        }
+        return self.samples
+
+    def _window(self) -> int:
+        """Chunks in flight at once: enough to keep every worker busy."""
+        return 2 * (self.n_workers or os.cpu_count() or 1)
+
+    def _chunks(self, n_members: int):
+        """Yield (start, stop, parameters) covering the members in order.
+
+        Each chunk carries one batched dataclass per submodel whose sampled
+        fields are array slices; unsampled submodels use their base values.
+        """
+        for start in range(0, n_members, self.chunk_size):
+            stop = min(start + self.chunk_size, n_members)
+            parameters = dict(self.base_parameters)
+            for submodel, drawn in self.samples.items():
+                parameters[submodel] = replace(
+                    self.base_parameters[submodel],
+                    **{name: values[start:stop] for name, values in drawn.items()}
+                )
+            yield start, stop, parameters
+
+    def run(self, n_members: int) -> Dict[str, np.ndarray]:
+        """Run ``n_members`` sampled simulations.
+
+        Returns the ``simulate_all`` layout with a leading member axis on
+        every trajectory. The drawn parameter values are kept in
+        ``self.samples``.
+        """
+        self.sample(n_members)
+
+        # A single run of the base parameters fixes the variable names and time axis
+        probe = _simulate_chunk(self.base_parameters)
+        years = probe.pop('years')
+        variables = list(probe)
+        shape = (len(variables), n_members, len(years))
+
+        if self.n_workers == 1:
+            data = np.empty(shape)
+            for start, stop, parameters in self._chunks(n_members):
+                flat = _simulate_chunk(parameters)
+                for v, name in enumerate(variables):
+                    data[v, start:stop] = flat[name]
+        else:
+            nbytes = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            try:
+                with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                    calls = (
+                        (shm.name, shape, variables, start, stop, parameters)
+                        for start, stop, parameters in self._chunks(n_members)
+                    )
+                    for _ in _map_bounded(executor, _run_chunk, calls, self._window()):
+                        pass
+                data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+            finally:
+                shm.close()
+                shm.unlink()
+
+        flat = {'years': years}
+        flat.update({name: data[v] for v, name in enumerate(variables)})
+        return unflatten_results(flat)
+
+    def accumulate(
+        self,
+        n_members: int,
+        accumulator: Optional[Union[EnsembleAccumulator, TrajectoryDensity]] = None
+    ) -> Union[EnsembleAccumulator, TrajectoryDensity]:
+        """Run ``n_members`` sampled simulations into streaming statistics.
+
+        Each chunk is reduced to an ``EnsembleAccumulator`` (or to the kind
+        of ``accumulator`` passed, e.g. a ``TrajectoryDensity``) where it was
+        simulated and only the accumulators are merged, so memory stays
+        bounded by variables x years however many members are run.
+        """
+        self.sample(n_members)
+        accumulator = accumulator or EnsembleAccumulator()
+        seeds = self.rng.integers(2 ** 32, size=-(-n_members // self.chunk_size))
+
+        if self.n_workers == 1:
+            for seed, (_, _, parameters) in zip(seeds, self._chunks(n_members)):
+                accumulator.merge(
+                    _accumulate_chunk(parameters, accumulator.spawn(seed))
+                )
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                calls = (
+                    (parameters, accumulator.spawn(seed))
+                    for seed, (_, _, parameters) in zip(seeds, self._chunks(n_members))
+                )
+                # Merged in submission order, so a seeded run is reproducible
+                for chunk in _map_bounded(executor, _accumulate_chunk, calls, self._window()):
+                    accumulator.merge(chunk)
+        return accumulator
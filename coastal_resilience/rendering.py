@@ -0,0 +1,159 @@
+"""
+Headless, parallel rendering of visualizer plots to image files.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+# (file name, plot method name, positional arguments)
+PlotJob = Tuple[str, str, tuple]
+
+# Per-directory record of the input hash each plot file was drawn from
+PLOT_CACHE = '.plot_cache.json'
+
+@lru_cache(maxsize=None)
+def _source_version(path: str) -> str:
+    """Hash of a source file, so edited plotting code invalidates its plots."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _digest(digest, value):
+    """Feed a value (arrays, dataclasses, containers, scalars) into a hash."""
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f'array{value.dtype.str}{value.shape}'.encode())
+        digest.update(value.tobytes())
+    elif is_dataclass(value):
+        digest.update(type(value).__name__.encode())
+        for field in fields(value):
+            _digest(digest, field.name)
+            _digest(digest, getattr(value, field.name))
+    elif isinstance(value, Mapping):
+        digest.update(b'dict')
+        for key in sorted(value, key=str):
+            _digest(digest, key)
+            _digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'seq{len(value)}'.encode())
+        for item in value:
+            _digest(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+def plot_key(visualizer, method: str, args: tuple) -> str:
+    """Hash of everything a plot is drawn from.
+
+    Combines the plot method, its arguments, the source of the visualizer
+    and renderer, and the data returned by the visualizer's
+    ``plot_inputs(method, args)``: exactly the arrays the plot consumes.
+    """
+    digest = hashlib.sha256()
+    _digest(digest, (
+        type(visualizer).__name__,
+        method,
+        args,
+        _source_version(inspect.getsourcefile(type(visualizer))),
+        _source_version(__file__)
+    ))
+    _digest(digest, visualizer.plot_inputs(method, args))
+    return digest.hexdigest()
+
+def _read_plot_cache(output_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(output_dir, PLOT_CACHE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _write_plot_cache(output_dir: str, keys: Dict[str, str]):
+    handle, temp_path = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+    with os.fdopen(handle, 'w') as f:
+        json.dump(keys, f, indent=2, sort_keys=True)
+    os.replace(temp_path, os.path.join(output_dir, PLOT_CACHE))
+
+def _use_agg():
+    """Select the non-interactive Agg backend, unless it is already active."""
+    import matplotlib
+
+    if matplotlib.get_backend().lower() != 'agg':
+        matplotlib.use('Agg')
+
+def _render(visualizer, method: str, args: tuple, path: str) -> float:
+    """Draw one plot, save it and close its figure; returns the seconds taken.
+
+    The visualizer's style is applied within a temporary rc context, so a
+    worker that received a pickled visualizer (whose ``__init__`` never
+    ran there) draws the same image as the parent process.
+    """
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    with plt.rc_context():
+        set_style = getattr(visualizer, 'set_style', None)
+        if set_style is not None:
+            set_style()
+        figure = getattr(visualizer, method)(*args)
+        try:
+            figure.savefig(path)
+        finally:
+            plt.close(figure)
+    return time.perf_counter() - start
+
+def render_plots(
+    visualizer,
+    jobs: Sequence[PlotJob],
+    output_dir: str,
+    n_workers: Optional[int] = 1,
+    skip_unchanged: bool = True
+) -> Dict[str, float]:
+    """Render plot jobs of a visualizer into ``output_dir``.
+
+    Every figure is closed as soon as it is saved, so repeated reports do
+    not accumulate memory. Plots are drawn with the Agg backend; with
+    ``n_workers`` other than 1 the jobs are spread over a process pool
+    (None uses every core).
+
+    With ``skip_unchanged``, a plot whose ``plot_key`` matches the one
+    recorded in the directory's ``.plot_cache.json`` and whose file still
+    exists is not redrawn. Returns the rendering time in seconds of each
+    file that was drawn; skipped files are omitted.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    recorded = _read_plot_cache(output_dir)
+    keys = {name: plot_key(visualizer, method, args) for name, method, args in jobs}
+    if skip_unchanged:
+        jobs = [
+            (name, method, args) for name, method, args in jobs
+            if recorded.get(name) != keys[name] or
+            not os.path.exists(os.path.join(output_dir, name))
+        ]
+
+    names = [name for name, _, _ in jobs]
+    methods = [method for _, method, _ in jobs]
+    arguments = [args for _, _, args in jobs]
+    paths = [os.path.join(output_dir, name) for name in names]
+
+    if n_workers == 1 or len(jobs) <= 1:
+        if jobs:
+            _use_agg()
+        timings = list(map(_render, [visualizer] * len(jobs), methods, arguments, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_use_agg) as executor:
+            timings = list(executor.map(
+                _render, [visualizer] * len(jobs), methods, arguments, paths
+            ))
+
+    if names:
+        recorded.update({name: keys[name] for name in names})
+        _write_plot_cache(output_dir, recorded)
+    return dict(zip(names, timings))
@@ -0,0 +1,152 @@
+"""
+Columnar on-disk format for simulation results with lazy, memory-mapped loading.
+"""
+
+import json
+import numpy as np
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .simulation import flatten_results
+
+FORMAT_NAME = 'coastal-resilience-results'
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+
+def save_results(
+    results: Dict,
+    directory: str,
+    metadata: Optional[Dict] = None,
+    precision=None
+) -> Path:
+    """Write results (nested or flattened) as one ``.npy`` file per variable.
+
+    Each variable is stored as a contiguous typed array named after its
+    ``'section.variable'`` key, next to a ``manifest.json`` listing the
+    files, dtypes and shapes plus any ``metadata``. The manifest is written
+    last, so a directory without one is an incomplete write. With a
+    ``PrecisionPolicy`` the arrays are cast to its archive dtypes.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    flat = precision.archive_results(results) if precision is not None else flatten_results(results)
+    arrays = {}
+    for key, value in flat.items():
+        arrays[key] = np.ascontiguousarray(value)
+        np.save(directory / f'{key}.npy', arrays[key], allow_pickle=False)
+    write_manifest(directory, arrays, metadata)
+    return directory
+
+def write_manifest(directory: str, arrays: Dict[str, np.ndarray], metadata: Optional[Dict] = None):
+    """Describe ``'<key>.npy'`` files already written to ``directory``.
+
+    Lets writers that fill their arrays in place (e.g. memory-mapped grid
+    output) produce a directory ``load_results`` can open.
+    """
+    manifest = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'variables': {
+            key: {
+                'file': f'{key}.npy',
+                'dtype': array.dtype.str,
+                'shape': list(array.shape)
+            }
+            for key, array in arrays.items()
+        },
+        'metadata': metadata or {}
+    }
+    with open(Path(directory) / MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+class _Section(Mapping):
+    """Lazy view of one ``*_data`` section of stored results."""
+
+    def __init__(self, store: 'StoredResults', section: str):
+        self._store = store
+        self._section = section
+        self._names = [
+            key.split('.', 1)[1] for key in store.variables
+            if key.startswith(f'{section}.')
+        ]
+        if 'years' in store.variables:
+            self._names.insert(0, 'years')
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name == 'years' and 'years' in self._store.variables:
+            return self._store.array('years')
+        if name not in self._names:
+            raise KeyError(name)
+        return self._store.array(f'{self._section}.{name}')
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+class StoredResults(Mapping):
+    """Results read back by ``load_results``, in the ``simulate_all`` layout.
+
+    Behaves like the nested result dict, but a variable's file is only
+    opened (memory-mapped, read-only by default) the first time it is
+    accessed, so an analysis touching a few columns never reads the rest.
+    """
+
+    def __init__(self, directory: str, mmap_mode: Optional[str] = 'r'):
+        """Open the results stored in ``directory``."""
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != FORMAT_NAME:
+            raise ValueError(f"{self.directory} does not contain simulation results")
+        if manifest.get('version', 0) > FORMAT_VERSION:
+            raise ValueError(f"Unsupported results format version {manifest['version']}")
+
+        self.variables: Dict[str, Dict] = manifest['variables']
+        self.metadata: Dict = manifest.get('metadata', {})
+        self.mmap_mode = mmap_mode
+        self._arrays: Dict[str, np.ndarray] = {}
+
+        self._keys = []
+        for key in self.variables:
+            top = key.split('.', 1)[0]
+            if top not in self._keys:
+                self._keys.append(top)
+
+    def array(self, key: str) -> np.ndarray:
+        """The array of one flattened ``'section.variable'`` key."""
+        if key not in self._arrays:
+            entry = self.variables[key]
+            self._arrays[key] = np.load(
+                self.directory / entry['file'],
+                mmap_mode=self.mmap_mode,
+                allow_pickle=False
+            )
+        return self._arrays[key]
+
+    def __getitem__(self, key: str):
+        if key in self.variables:
+            return self.array(key)
+        if key not in self._keys:
+            raise KeyError(key)
+        return _Section(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def to_dict(self) -> Dict:
+        """Load every variable into an in-memory nested dict."""
+        return {
+            key: ({name: np.array(array) for name, array in value.items()}
+                  if isinstance(value, Mapping) else np.array(value))
+            for key, value in self.items()
+        }
+
+def load_results(directory: str, mmap_mode: Optional[str] = 'r') -> StoredResults:
+    """Open results written by ``save_results`` without reading any data yet."""
+    return StoredResults(directory, mmap_mode)
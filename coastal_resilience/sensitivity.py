@@ -0,0 +1,237 @@
+"""
+Global sensitivity analysis (Sobol and Morris) of the integrated simulation.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .models.base import TIME_FIELDS
+from .simulation import SUBMODELS, IntegratedSimulation
+
+INDICES = ('resilience_index', 'sustainability_index', 'development_index')
+
+@dataclass
+class SobolResult:
+    """First-order and total Sobol indices with bootstrap confidence intervals."""
+    factors: List[str]
+    first_order: Dict[str, np.ndarray]
+    total_order: Dict[str, np.ndarray]
+    first_order_conf: Dict[str, np.ndarray]  # (2, factors) lower/upper bounds
+    total_order_conf: Dict[str, np.ndarray]
+    n_evaluations: int
+
+@dataclass
+class MorrisResult:
+    """Morris elementary-effect statistics per factor."""
+    factors: List[str]
+    mu: Dict[str, np.ndarray]
+    mu_star: Dict[str, np.ndarray]
+    sigma: Dict[str, np.ndarray]
+    n_evaluations: int
+
+def default_factors(relative_range: float = 0.2) -> Dict[str, Tuple[float, float]]:
+    """Bounds for every model parameter, +/- ``relative_range`` around its default.
+
+    Factors are named ``'<submodel>.<field>'``; the time-axis fields are
+    not varied.
+    """
+    factors = {}
+    for submodel, (_, parameter_class, _) in SUBMODELS.items():
+        defaults = parameter_class()
+        for field in fields(parameter_class):
+            if field.name in TIME_FIELDS:
+                continue
+            value = float(getattr(defaults, field.name))
+            low, high = sorted((value * (1 - relative_range), value * (1 + relative_range)))
+            if low == high:
+                low, high = value - relative_range, value + relative_range
+            factors[f'{submodel}.{field.name}'] = (low, high)
+    return factors
+
+def _evaluate_chunk(
+    names: List[str],
+    values: np.ndarray,
+    outputs: Sequence[str],
+    year: Optional[int]
+) -> np.ndarray:
+    """Run one batched simulation for a block of parameter vectors."""
+    overrides: Dict[str, Dict[str, np.ndarray]] = {}
+    for name, column in zip(names, values.T):
+        submodel, field_name = name.split('.', 1)
+        overrides.setdefault(submodel, {})[field_name] = column
+
+    simulation = IntegratedSimulation(**{
+        argument: replace(parameter_class(), **overrides.get(submodel, {}))
+        for submodel, (argument, parameter_class, _) in SUBMODELS.items()
+    })
+    results = simulation.simulate_all()
+    idx = -1 if year is None else simulation.climate_model._index_of(year)
+    return np.stack([
+        np.broadcast_to(results[output][..., idx], (len(values),))
+        for output in outputs
+    ], axis=1)
+
+def evaluate(
+    factors: Dict[str, Tuple[float, float]],
+    unit_samples: np.ndarray,
+    outputs: Sequence[str] = INDICES,
+    year: Optional[int] = None,
+    chunk_size: int = 10000,
+    n_workers: Optional[int] = 1
+) -> np.ndarray:
+    """Evaluate the model for parameter vectors given in the unit hypercube.
+
+    Each row of ``unit_samples`` is scaled to the factor bounds and the rows
+    are simulated in batched chunks, optionally across a process pool.
+    Returns the chosen outputs in ``year`` (default: the final year), shaped
+    (samples, outputs).
+    """
+    names = list(factors)
+    bounds = np.array([factors[name] for name in names], dtype=float)
+    values = bounds[:, 0] + unit_samples * (bounds[:, 1] - bounds[:, 0])
+    chunks = [
+        values[start:start + chunk_size]
+        for start in range(0, len(values), chunk_size)
+    ]
+
+    if n_workers == 1:
+        evaluated = [_evaluate_chunk(names, chunk, outputs, year) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            evaluated = list(executor.map(
+                _evaluate_chunk,
+                [names] * len(chunks),
+                chunks,
+                [outputs] * len(chunks),
+                [year] * len(chunks)
+            ))
+    return np.concatenate(evaluated, axis=0)
+
+def _sobol_estimates(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray):
+    """Saltelli (2010) first-order and Jansen total-effect estimators.
+
+    ``f_a`` and ``f_b`` have a trailing sample axis; ``f_ab`` has a leading
+    factor axis on top of it.
+    """
+    variance = np.var(np.concatenate([f_a, f_b], axis=-1), axis=-1)[..., None]
+    f_a, f_b = f_a[..., None, :], f_b[..., None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first = np.mean(f_b * (f_ab - f_a), axis=-1) / variance
+        total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=-1) / variance
+    return first, total
+
+def sobol_analysis(
+    factors: Optional[Dict[str, Tuple[float, float]]] = None,
+    n_samples: int = 1024,
+    outputs: Sequence[str] = INDICES,
+    year: Optional[int] = None,
+    n_bootstrap: int = 200,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    chunk_size: int = 10000,
+    n_workers: Optional[int] = 1
+) -> SobolResult:
+    """Estimate Sobol indices with a Saltelli design.
+
+    Uses ``n_samples * (factors + 2)`` model evaluations, all run through
+    the batched simulation. ``n_samples`` should be a power of two for the
+    scrambled Sobol base sequence.
+    """
+    from scipy.stats import qmc
+
+    factors = factors or default_factors()
+    names = list(factors)
+    d = len(names)
+
+    base = qmc.Sobol(d=2 * d, scramble=True, seed=seed).random(n_samples)
+    a, b = base[:, :d], base[:, d:]
+    # A with column i taken from B, for every factor i
+    ab = np.repeat(a[None], d, axis=0)
+    ab[np.arange(d), :, np.arange(d)] = b.T
+
+    design = np.concatenate([a, b, ab.reshape(-1, d)], axis=0)
+    y = evaluate(factors, design, outputs, year, chunk_size, n_workers)
+    f_a = y[:n_samples].T
+    f_b = y[n_samples:2 * n_samples].T
+    f_ab = y[2 * n_samples:].reshape(d, n_samples, -1).transpose(2, 0, 1)
+
+    first, total = _sobol_estimates(f_a, f_b, f_ab)
+
+    # Bootstrap over base rows, one resample at a time to bound memory
+    rng = np.random.default_rng(seed)
+    boot_first = np.empty((n_bootstrap,) + first.shape)
+    boot_total = np.empty((n_bootstrap,) + total.shape)
+    for r in range(n_bootstrap):
+        rows = rng.integers(n_samples, size=n_samples)
+        boot_first[r], boot_total[r] = _sobol_estimates(
+            f_a[:, rows], f_b[:, rows], f_ab[:, :, rows]
+        )
+    alpha = (1 - confidence) / 2
+    first_conf = np.nanquantile(boot_first, [alpha, 1 - alpha], axis=0)
+    total_conf = np.nanquantile(boot_total, [alpha, 1 - alpha], axis=0)
+
+    return SobolResult(
+        factors=names,
+        first_order={output: first[o] for o, output in enumerate(outputs)},
+        total_order={output: total[o] for o, output in enumerate(outputs)},
+        first_order_conf={output: first_conf[:, o] for o, output in enumerate(outputs)},
+        total_order_conf={output: total_conf[:, o] for o, output in enumerate(outputs)},
+        n_evaluations=len(design)
+    )
+
+def morris_analysis(
+    factors: Optional[Dict[str, Tuple[float, float]]] = None,
+    n_trajectories: int = 100,
+    n_levels: int = 4,
+    outputs: Sequence[str] = INDICES,
+    year: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = 10000,
+    n_workers: Optional[int] = 1
+) -> MorrisResult:
+    """Screen factors with Morris elementary effects.
+
+    Uses ``n_trajectories * (factors + 1)`` model evaluations. Each
+    trajectory starts on the ``n_levels`` grid and moves one factor at a
+    time, in random order and direction, by ``n_levels / (2 (n_levels - 1))``.
+    """
+    factors = factors or default_factors()
+    names = list(factors)
+    d = len(names)
+    delta = n_levels / (2 * (n_levels - 1))
+    rng = np.random.default_rng(seed)
+
+    # Start points on the grid such that +/- delta stays inside [0, 1]
+    start_levels = np.arange(n_levels // 2) / (n_levels - 1)
+    starts = rng.choice(start_levels, size=(n_trajectories, d))
+    directions = rng.choice([-1.0, 1.0], size=(n_trajectories, d))
+    starts = np.where(directions < 0, starts + delta, starts)
+    orders = np.argsort(rng.random((n_trajectories, d)), axis=1)
+
+    # Step k of each trajectory changes factor orders[:, k - 1]
+    steps = np.zeros((n_trajectories, d + 1, d))
+    rows = np.arange(n_trajectories)
+    for k in range(1, d + 1):
+        steps[:, k] = steps[:, k - 1]
+        steps[rows, k, orders[:, k - 1]] = directions[rows, orders[:, k - 1]] * delta
+    design = starts[:, None, :] + steps
+
+    y = evaluate(factors, design.reshape(-1, d), outputs, year, chunk_size, n_workers)
+    y = y.reshape(n_trajectories, d + 1, -1)
+
+    # Elementary effect of the factor moved at each step
+    effects = np.empty((n_trajectories, d, y.shape[-1]))
+    moved_direction = directions[rows[:, None], orders]
+    effects[rows[:, None], orders] = (
+        (y[:, 1:] - y[:, :-1]) / (moved_direction[..., None] * delta)
+    )
+
+    return MorrisResult(
+        factors=names,
+        mu={output: effects[..., o].mean(axis=0) for o, output in enumerate(outputs)},
+        mu_star={output: np.abs(effects[..., o]).mean(axis=0) for o, output in enumerate(outputs)},
+        sigma={output: effects[..., o].std(axis=0, ddof=1) for o, output in enumerate(outputs)},
+        n_evaluations=n_trajectories * (d + 1)
+    )
@@ -2,8 +2,12 @@
 Main simulation class for integrated coastal resilience and blue economy development.
 """
 
+import copy
+import time
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
 from .models.climate import ClimateModel, ClimateParameters
@@ -11,25 +15,118 @@ from .models.environment import EnvironmentalModel, EnvironmentalParameters
 from .models.socioeconomic import SocioeconomicModel, SocioeconomicParameters
 from .models.blue_economy import BlueEconomyModel, BlueEconomyParameters
 from .models.policy import PolicyModel, PolicyParameters
+from .models.base import time_axis
+
+# Constructor argument, parameter dataclass and results key of each submodel
+SUBMODELS = {
+    'climate': ('climate_params', ClimateParameters, 'climate_data'),
+    'environment': ('env_params', EnvironmentalParameters, 'environment_data'),
+    'socioeconomic': ('socio_params', SocioeconomicParameters, 'socioeconomic_data'),
+    'blue_economy': ('blue_econ_params', BlueEconomyParameters, 'blue_economy_data'),
+    'policy': ('policy_params', PolicyParameters, 'policy_data')
+}
+
+# Observer phase names of the submodels' steps and closed-form fills
+STEP_PHASES = tuple(f'{submodel}.simulate_step' for submodel in SUBMODELS)
+ALL_PHASES = tuple(f'{submodel}.simulate_all' for submodel in SUBMODELS)
+
+def flatten_results(results: Dict) -> Dict[str, np.ndarray]:
+    """Flatten a ``simulate_all`` result into ``'section.variable'`` arrays.
+
+    Top-level arrays keep their names; the per-submodel ``years`` entries
+    duplicate the shared time axis and are dropped. Sections may be any
+    mapping, such as the lazy sections of ``load_results``.
+    """
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, Mapping):
+            for name, array in value.items():
+                if name != 'years':
+                    flat[f'{key}.{name}'] = array
+        else:
+            flat[key] = value
+    return flat
+
+def unflatten_results(flat: Dict[str, np.ndarray]) -> Dict:
+    """Rebuild the nested ``simulate_all`` layout from flattened arrays."""
+    results = {}
+    for key, array in flat.items():
+        if '.' in key:
+            section, name = key.split('.', 1)
+            section_data = results.setdefault(section, {})
+            if 'years' in flat:
+                section_data.setdefault('years', flat['years'])
+            section_data[name] = array
+        else:
+            results[key] = array
+    return results
+
+def add_aggregate_indicators(results: Dict) -> Dict:
+    """Add the aggregate keys used by advanced visualization to the results.
+
+    In ensembles, variables without a member axis are broadcast over the
+    members before averaging.
+    """
+    # Climate overall_impact
+    climate_data = results['climate_data']
+    climate_arrays = np.broadcast_arrays(*(
+        np.asarray(climate_data[k]) for k in climate_data if k != 'year'
+    ))
+    climate_data['overall_impact'] = np.mean(climate_arrays, axis=0)
+
+    # Environment overall_health
+    environment_data = results['environment_data']
+    env_arrays = np.broadcast_arrays(*(
+        np.asarray(environment_data[k]) for k in environment_data if k != 'year'
+    ))
+    environment_data['overall_health'] = np.mean(env_arrays, axis=0)
+
+    # Socioeconomic overall_development
+    socioeconomic_data = results['socioeconomic_data']
+    socio_arrays = np.broadcast_arrays(*(
+        np.asarray(socioeconomic_data[k]) for k in socioeconomic_data if k != 'year'
+    ))
+    socioeconomic_data['overall_development'] = np.mean(socio_arrays, axis=0)
+    return results
 
 class IntegratedSimulation:
     """Integrated simulation of coastal resilience and blue economy development."""
     
     def __init__(
         self,
-        climate_params: Optional[ClimateParameters] = None,
-        env_params: Optional[EnvironmentalParameters] = None,
-        socio_params: Optional[SocioeconomicParameters] = None,
-        blue_econ_params: Optional[BlueEconomyParameters] = None,
-        policy_params: Optional[PolicyParameters] = None
+        climate_params: Optional[Union[ClimateParameters, Sequence[ClimateParameters]]] = None,
+        env_params: Optional[Union[EnvironmentalParameters, Sequence[EnvironmentalParameters]]] = None,
+        socio_params: Optional[Union[SocioeconomicParameters, Sequence[SocioeconomicParameters]]] = None,
+        blue_econ_params: Optional[Union[BlueEconomyParameters, Sequence[BlueEconomyParameters]]] = None,
+        policy_params: Optional[Union[PolicyParameters, Sequence[PolicyParameters]]] = None,
+        precision=None
     ):
-        """Initialize the integrated simulation with parameters."""
+        """Initialize the integrated simulation with parameters.
+
+        Any argument may be a sequence of parameter sets to run an ensemble.
+        Submodels given a single parameter set are shared by every member, so
+        all batched arguments must have the same number of members.
+
+        A ``PrecisionPolicy`` sets the dtype of every state and index array
+        (float64 by default).
+        """
+        self.precision = precision
+        self.dtype = np.dtype(precision.compute if precision is not None else np.float64)
+        
         # Initialize individual models
-        self.climate_model = ClimateModel(climate_params)
-        self.env_model = EnvironmentalModel(env_params)
-        self.socio_model = SocioeconomicModel(socio_params)
-        self.blue_econ_model = BlueEconomyModel(blue_econ_params)
-        self.policy_model = PolicyModel(policy_params)
+        self.climate_model = ClimateModel(climate_params, self.dtype)
+        self.env_model = EnvironmentalModel(env_params, self.dtype)
+        self.socio_model = SocioeconomicModel(socio_params, self.dtype)
+        self.blue_econ_model = BlueEconomyModel(blue_econ_params, self.dtype)
+        self.policy_model = PolicyModel(policy_params, self.dtype)
+        
+        # Scenario tree links, set by fork()
+        self.parent: Optional['IntegratedSimulation'] = None
+        self.children: List['IntegratedSimulation'] = []
+        self.fork_year: Optional[int] = None
+        
+        # Timing callbacks, see add_observer()
+        self.observers: List[Callable[[str, float, float], None]] = []
         
         # Initialize integrated state
         self._initialize_state()
@@ -38,26 +135,229 @@ class IntegratedSimulation:
         """Initialize the integrated simulation state."""
         self.current_year = self.climate_model.parameters.start_year
         self.years = self.climate_model.years
+        self.batch_shape = np.broadcast_shapes(
+            *(model.batch_shape for model in self._models())
+        )
         
         # Initialize integrated metrics
-        self.resilience_index = np.zeros(len(self.years))
-        self.sustainability_index = np.zeros(len(self.years))
-        self.development_index = np.zeros(len(self.years))
+        self._indices_shared = False
+        self.resilience_index = self._index_zeros()
+        self.sustainability_index = self._index_zeros()
+        self.development_index = self._index_zeros()
         
         # Calculate initial indices
         self._update_indices(0)
+        
+        # Parameters the current trajectories were computed with
+        self._fingerprints = self._parameter_fingerprints()
     
-    def _update_indices(self, idx: int):
-        """Update integrated indices based on current model states."""
-        # Get current states
-        climate_state = self.climate_model.get_current_state()
-        env_state = self.env_model.get_current_state()
-        socio_state = self.socio_model.get_current_state()
-        blue_econ_state = self.blue_econ_model.get_current_state()
-        policy_state = self.policy_model.get_current_state()
+    def fork(
+        self,
+        climate_params: Optional[Union[ClimateParameters, Sequence[ClimateParameters]]] = None,
+        env_params: Optional[Union[EnvironmentalParameters, Sequence[EnvironmentalParameters]]] = None,
+        socio_params: Optional[Union[SocioeconomicParameters, Sequence[SocioeconomicParameters]]] = None,
+        blue_econ_params: Optional[Union[BlueEconomyParameters, Sequence[BlueEconomyParameters]]] = None,
+        policy_params: Optional[Union[PolicyParameters, Sequence[PolicyParameters]]] = None
+    ) -> 'IntegratedSimulation':
+        """Branch the simulation at ``current_year`` with modified parameters.
+
+        The branch shares the simulated history with this simulation
+        copy-on-write and continues from the fork year with the given
+        parameters (unchanged submodels keep theirs). Passing a batch runs
+        every variant from the shared prefix as one ensemble. Branches are
+        recorded in ``children``, link back through ``parent`` and start
+        with this simulation's observers.
+        """
+        branch = copy.copy(self)
+        arguments = (climate_params, env_params, socio_params, blue_econ_params, policy_params)
+        (
+            branch.climate_model,
+            branch.env_model,
+            branch.socio_model,
+            branch.blue_econ_model,
+            branch.policy_model
+        ) = (model.fork(parameters) for model, parameters in zip(self._models(), arguments))
+        
+        branch.batch_shape = np.broadcast_shapes(
+            *(model.batch_shape for model in branch._models())
+        )
+        branch._indices_shared = True
+        # Both sides copy before writing index columns, so neither rewrites
+        # the history they share
+        self._indices_shared = True
+        branch._fingerprints = branch._parameter_fingerprints()
+        branch.observers = list(self.observers)
+        branch.parent = self
+        branch.children = []
+        branch.fork_year = self.current_year
+        self.children.append(branch)
+        return branch
+    
+    def add_observer(self, observer: Callable[[str, float, float], None]):
+        """Report the wall time of every simulation phase to ``observer``.
+
+        The observer is called as ``observer(phase, start, duration)`` with
+        ``time.perf_counter()`` seconds once each phase finishes, e.g. with a
+        ``coastal_resilience.instrumentation.Profiler``. Phases are
+        ``'simulate_step'`` and ``'simulate_all'`` and, within them,
+        ``'<submodel>.simulate_step'`` / ``'<submodel>.simulate_all'``,
+        ``'compute_indices'`` and ``'index_lookup'``. Without observers the
+        only cost is an empty-list check per phase.
+        """
+        self.observers.append(observer)
+    
+    def remove_observer(self, observer: Callable[[str, float, float], None]):
+        """Stop reporting phases to ``observer``."""
+        self.observers.remove(observer)
+    
+    @contextmanager
+    def observe(self, observer: Callable[[str, float, float], None]):
+        """Attach ``observer`` for the duration of a ``with`` block."""
+        self.add_observer(observer)
+        try:
+            yield observer
+        finally:
+            self.remove_observer(observer)
+    
+    def _record(self, phase: str, start: float):
+        """Report a phase that started at ``start`` and has just finished."""
+        duration = time.perf_counter() - start
+        for observer in self.observers:
+            observer(phase, start, duration)
+    
+    def _phase(self, phase: str, function: Callable, *args):
+        """Call ``function``, timing it as ``phase`` if anyone observes."""
+        if not self.observers:
+            return function(*args)
+        start = time.perf_counter()
+        result = function(*args)
+        self._record(phase, start)
+        return result
+    
+    def _index_zeros(self) -> np.ndarray:
+        """Allocate an index array covering the batch and the time axis."""
+        return np.zeros(self.batch_shape + (len(self.years),), dtype=self.dtype)
+    
+    def _materialize_indices(self):
+        """Give a fork its own index arrays before it writes to them."""
+        if not self._indices_shared:
+            return
+        idx = self.climate_model._last_index()
+        for name in ('resilience_index', 'sustainability_index', 'development_index'):
+            own = self._index_zeros()
+            own[..., :idx + 1] = getattr(self, name)[..., :idx + 1]
+            setattr(self, name, own)
+        self._indices_shared = False
+    
+    def _parameter_fingerprints(self) -> List[Tuple]:
+        """Snapshot the parameters of every submodel."""
+        return [model.parameter_fingerprint() for model in self._models()]
+    
+    def update_parameters(
+        self,
+        climate_params: Optional[ClimateParameters] = None,
+        env_params: Optional[EnvironmentalParameters] = None,
+        socio_params: Optional[SocioeconomicParameters] = None,
+        blue_econ_params: Optional[BlueEconomyParameters] = None,
+        policy_params: Optional[PolicyParameters] = None
+    ):
+        """Replace the parameters of some submodels.
+
+        Nothing is recomputed here; the next ``simulate_all`` re-runs only the
+        submodels whose parameters changed and re-derives the indices.
+        """
+        arguments = (climate_params, env_params, socio_params, blue_econ_params, policy_params)
+        for model, parameters in zip(self._models(), arguments):
+            if parameters is not None:
+                model._set_parameters(parameters)
+    
+    def _refresh_changed_models(self) -> bool:
+        """Recompute the state of submodels whose parameters changed.
+
+        Parameters may have been replaced through ``update_parameters`` or
+        edited in place. Changed submodels are rewound (to the fork year in a
+        branch, whose earlier history stays the parent's; otherwise to the
+        start) and brought back to the current year; unchanged ones keep
+        their trajectories. Returns whether anything changed, in which case
+        the indices must be re-derived from the start.
+        """
+        fingerprints = self._parameter_fingerprints()
+        changed = [
+            model for model, old, new in zip(self._models(), self._fingerprints, fingerprints)
+            if old != new
+        ]
+        if not changed:
+            return False
         
+        if any(not np.array_equal(time_axis(model.parameters)[0], self.years) for model in changed):
+            # A new time axis invalidates every trajectory
+            self.reset()
+            return True
+        
+        for model in changed:
+            model.rewind()
+        for model in changed:
+            while model.current_year < self.current_year:
+                model.simulate_step()
+        
+        batch_shape = np.broadcast_shapes(*(model.batch_shape for model in self._models()))
+        if batch_shape != self.batch_shape:
+            self._indices_shared = False
+            self.batch_shape = batch_shape
+            self.resilience_index = self._index_zeros()
+            self.sustainability_index = self._index_zeros()
+            self.development_index = self._index_zeros()
+        self._fingerprints = fingerprints
+        return True
+    
+    def _models(self) -> Tuple:
+        """Return the submodels in a fixed order."""
+        return (
+            self.climate_model,
+            self.env_model,
+            self.socio_model,
+            self.blue_econ_model,
+            self.policy_model
+        )
+    
+    def _current_index(self) -> int:
+        """Return the position of ``current_year`` on the shared time axis."""
+        return self.climate_model._index_of(self.current_year)
+    
+    def _update_indices(self, idx: int):
+        """Update integrated indices based on current model states.
+
+        In ensemble mode the submodel states are arrays over members and the
+        indices of every member are computed in one vectorized pass.
+        """
+        self._materialize_indices()
+        (
+            self.resilience_index[..., idx],
+            self.sustainability_index[..., idx],
+            self.development_index[..., idx]
+        ) = self._compute_indices(
+            self.climate_model.get_current_state(),
+            self.env_model.get_current_state(),
+            self.socio_model.get_current_state(),
+            self.blue_econ_model.get_current_state(),
+            self.policy_model.get_current_state()
+        )
+    
+    @staticmethod
+    def _compute_indices(
+        climate_state: Dict,
+        env_state: Dict,
+        socio_state: Dict,
+        blue_econ_state: Dict,
+        policy_state: Dict
+    ) -> Tuple:
+        """Compute the resilience, sustainability and development indices.
+
+        The states may hold scalars, per-member arrays or whole trajectories;
+        the weighted averages are evaluated elementwise.
+        """
         # Calculate resilience index (weighted average of key resilience indicators)
-        self.resilience_index[idx] = (
+        resilience_index = (
             0.3 * (100 - climate_state['storm_surge_intensity']) +
             0.3 * env_state['mangrove_coverage'] +
             0.2 * socio_state['infrastructure_quality'] +
@@ -65,7 +365,7 @@ class IntegratedSimulation:
         )
         
         # Calculate sustainability index (weighted average of sustainability indicators)
-        self.sustainability_index[idx] = (
+        sustainability_index = (
             0.25 * env_state['biodiversity_index'] +
             0.25 * env_state['water_quality_index'] +
             0.25 * blue_econ_state['total_value'] / blue_econ_state['total_value'] +
@@ -73,37 +373,57 @@ class IntegratedSimulation:
         )
         
         # Calculate development index (weighted average of development indicators)
-        self.development_index[idx] = (
+        development_index = (
             0.3 * socio_state['gdp'] +
             0.3 * blue_econ_state['total_value'] / blue_econ_state['total_value'] +
             0.2 * socio_state['employment_rate'] +
             0.2 * (100 - socio_state['poverty_rate'])
         )
+        
+        return resilience_index, sustainability_index, development_index
     
     def simulate_step(self) -> Dict[str, float]:
         """Simulate one time step of the integrated system."""
         if self.current_year >= self.climate_model.parameters.end_year:
             raise ValueError("Simulation has reached end year")
+        observed = bool(self.observers)
+        if observed:
+            start = time.perf_counter()
         
         # Simulate individual model steps
-        climate_state = self.climate_model.simulate_step()
-        env_state = self.env_model.simulate_step()
-        socio_state = self.socio_model.simulate_step()
-        blue_econ_state = self.blue_econ_model.simulate_step()
-        policy_state = self.policy_model.simulate_step()
+        if observed:
+            states = [
+                self._phase(phase, model.simulate_step)
+                for phase, model in zip(STEP_PHASES, self._models())
+            ]
+        else:
+            states = [model.simulate_step() for model in self._models()]
+        climate_state, env_state, socio_state, blue_econ_state, policy_state = states
         
         # Update current year
         self.current_year = climate_state['year']
         
-        # Update integrated indices
-        current_idx = np.where(self.years == self.current_year)[0][0]
-        self._update_indices(current_idx)
+        # Update integrated indices, storing them if this step is a stored sample
+        indices = self._phase(
+            'compute_indices', self._compute_indices,
+            climate_state, env_state, socio_state, blue_econ_state, policy_state
+        )
+        if self.climate_model._at_sample():
+            self._materialize_indices()
+            current_idx = self._phase('index_lookup', self._current_index)
+            (
+                self.resilience_index[..., current_idx],
+                self.sustainability_index[..., current_idx],
+                self.development_index[..., current_idx]
+            ) = indices
         
+        if observed:
+            self._record('simulate_step', start)
         return {
             'year': self.current_year,
-            'resilience_index': self.resilience_index[current_idx],
-            'sustainability_index': self.sustainability_index[current_idx],
-            'development_index': self.development_index[current_idx],
+            'resilience_index': indices[0],
+            'sustainability_index': indices[1],
+            'development_index': indices[2],
             'climate_state': climate_state,
             'environment_state': env_state,
             'socioeconomic_state': socio_state,
@@ -111,36 +431,148 @@ class IntegratedSimulation:
             'policy_state': policy_state
         }
     
-    def simulate_all(self) -> Dict[str, np.ndarray]:
-        """Simulate the entire time period."""
-        while self.current_year < self.climate_model.parameters.end_year:
-            self.simulate_step()
+    def simulate_all(self, stepwise: bool = False, cache=None) -> Dict[str, np.ndarray]:
+        """Simulate the entire time period.
+
+        By default each submodel fills its remaining years from its closed-form
+        solution and the indices are derived for all of them at once.
+        ``stepwise=True`` advances the coupled system year by year instead and
+        is kept as the reference implementation.
+
+        With a ``ResultCache``, a run starting from the initial year is served
+        from the cache when the same parameters were simulated before, and
+        stored in it otherwise.
+
+        Submodels whose parameters changed since their trajectories were
+        computed are re-simulated from the start; the others are reused.
+        """
+        observed = bool(self.observers)
+        if observed:
+            start = time.perf_counter()
+        indices_stale = self._refresh_changed_models()
+        
+        if cache is not None and self.current_year == self.climate_model.parameters.start_year:
+            key = cache.key(self)
+            cached = cache.get(key)
+            if cached is not None:
+                # Restored indices are complete; only the results dict is assembled
+                self._restore_results(cached)
+                indices_stale = False
+            results = self._simulate_all(stepwise, indices_stale)
+            if cached is None:
+                cache.put(key, results)
+        else:
+            results = self._simulate_all(stepwise, indices_stale)
+        
+        if observed:
+            self._record('simulate_all', start)
+        return results
+    
+    def _simulate_all(self, stepwise: bool, indices_stale: bool) -> Dict[str, np.ndarray]:
+        """Fill the remaining years and return the results of ``simulate_all``."""
+        if stepwise:
+            while self.current_year < self.climate_model.parameters.end_year:
+                self.simulate_step()
+        
+        current_idx = 0 if indices_stale else self.climate_model._last_index()
+        model_data = [
+            self._phase(phase, model.simulate_all, stepwise)
+            for phase, model in zip(ALL_PHASES, self._models())
+        ]
+        self._materialize_indices()
+        
+        # Derive the indices for every year the submodels just filled
+        (
+            self.resilience_index[..., current_idx:],
+            self.sustainability_index[..., current_idx:],
+            self.development_index[..., current_idx:]
+        ) = self._phase('compute_indices', self._compute_indices, *(
+            {name: values[..., current_idx:] for name, values in data.items()
+             if name != 'years'}
+            for data in model_data
+        ))
+        self.current_year = self.climate_model.current_year
         
+        climate_data, env_data, socio_data, blue_econ_data, policy_data = model_data
         return {
             'years': self.years,
             'resilience_index': self.resilience_index,
             'sustainability_index': self.sustainability_index,
             'development_index': self.development_index,
-            'climate_data': self.climate_model.simulate_all(),
-            'environment_data': self.env_model.simulate_all(),
-            'socioeconomic_data': self.socio_model.simulate_all(),
-            'blue_economy_data': self.blue_econ_model.simulate_all(),
-            'policy_data': self.policy_model.simulate_all()
+            'climate_data': climate_data,
+            'environment_data': env_data,
+            'socioeconomic_data': socio_data,
+            'blue_economy_data': blue_econ_data,
+            'policy_data': policy_data
         }
     
+    def _restore_results(self, flat: Dict[str, np.ndarray]):
+        """Load complete, flattened results into the submodels and indices."""
+        for (_, _, results_key), model in zip(SUBMODELS.values(), self._models()):
+            for name in model.state_variables:
+                setattr(model, name, np.array(flat[f'{results_key}.{name}']))
+            model.current_year = model._time_of(model._sample_steps[-1])
+            model._anchor = None
+            model._state = None
+        
+        self.resilience_index = np.array(flat['resilience_index'])
+        self.sustainability_index = np.array(flat['sustainability_index'])
+        self.development_index = np.array(flat['development_index'])
+        self._indices_shared = False
+        self.batch_shape = self.resilience_index.shape[:-1]
+        self.current_year = self.climate_model.current_year
+        self._fingerprints = self._parameter_fingerprints()
+    
     def get_current_state(self) -> Dict[str, float]:
         """Get the current state of the integrated simulation."""
-        current_idx = np.where(self.years == self.current_year)[0][0]
+        climate_state = self.climate_model.get_current_state()
+        env_state = self.env_model.get_current_state()
+        socio_state = self.socio_model.get_current_state()
+        blue_econ_state = self.blue_econ_model.get_current_state()
+        policy_state = self.policy_model.get_current_state()
+        resilience_index, sustainability_index, development_index = self._compute_indices(
+            climate_state, env_state, socio_state, blue_econ_state, policy_state
+        )
         return {
             'year': self.current_year,
-            'resilience_index': self.resilience_index[current_idx],
-            'sustainability_index': self.sustainability_index[current_idx],
-            'development_index': self.development_index[current_idx],
-            'climate_state': self.climate_model.get_current_state(),
-            'environment_state': self.env_model.get_current_state(),
-            'socioeconomic_state': self.socio_model.get_current_state(),
-            'blue_economy_state': self.blue_econ_model.get_current_state(),
-            'policy_state': self.policy_model.get_current_state()
+            'resilience_index': resilience_index,
+            'sustainability_index': sustainability_index,
+            'development_index': development_index,
+            'climate_state': climate_state,
+            'environment_state': env_state,
+            'socioeconomic_state': socio_state,
+            'blue_economy_state': blue_econ_state,
+            'policy_state': policy_state
+        }
+    
+    def state_at(self, year) -> Dict[str, float]:
+        """Get the integrated state in ``year`` without advancing the simulation.
+
+        Each submodel answers from its filled history or its closed-form
+        solution, and the indices are derived from those states, so arbitrary
+        years can be queried in constant time.
+        """
+        climate_state = self.climate_model.state_at(year)
+        env_state = self.env_model.state_at(year)
+        socio_state = self.socio_model.state_at(year)
+        blue_econ_state = self.blue_econ_model.state_at(year)
+        policy_state = self.policy_model.state_at(year)
+        
+        resilience_index, sustainability_index, development_index = (
+            self._compute_indices(
+                climate_state, env_state, socio_state, blue_econ_state, policy_state
+            )
+        )
+        return {
+            'year': year,
+            'resilience_index': resilience_index,
+            'sustainability_index': sustainability_index,
+            'development_index': development_index,
+            'climate_state': climate_state,
+            'environment_state': env_state,
+            'socioeconomic_state': socio_state,
+            'blue_economy_state': blue_econ_state,
+            'policy_state': policy_state
         }
     
     def reset(self):
@@ -0,0 +1,570 @@
+"""
+Streaming, mergeable statistics for large simulation ensembles.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .simulation import flatten_results, unflatten_results
+
+# Quantile levels of the median and the 25-75% and 5-95% bands of fan charts
+FAN_LEVELS = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+def ensemble_quantiles(
+    results: Dict,
+    levels: Sequence[float] = FAN_LEVELS
+) -> Dict[float, Dict]:
+    """Exact per-year quantiles over the member axis of ensemble results.
+
+    Returns one ``simulate_all``-shaped result per level. For ensembles too
+    large to hold, use ``EnsembleAccumulator.quantile_results`` instead.
+    """
+    flat = flatten_results(results)
+    years = flat.pop('years')
+    quantiles = {
+        name: np.quantile(
+            np.asarray(values).reshape(-1, np.shape(values)[-1]), levels, axis=0
+        )
+        for name, values in flat.items()
+    }
+    return {
+        level: unflatten_results({
+            'years': years,
+            **{name: values[i] for name, values in quantiles.items()}
+        })
+        for i, level in enumerate(levels)
+    }
+
+class QuantileSketch:
+    """Mergeable approximate quantiles for many cells observed together.
+
+    A compactor sketch in the KLL family: each level holds at most
+    ``2 * size`` items per cell, and a full level is sorted and halved, with
+    the surviving items promoted to the next level at twice the weight.
+    Every cell receives the same number of observations, so all cells share
+    one level layout and each operation is a single vectorized call.
+    Memory is O(cells * size * log(n / size)) and the rank error is roughly
+    O(log(n / size) / size).
+    """
+
+    def __init__(self, n_cells: int, size: int = 256, seed: Optional[int] = None):
+        """Initialize an empty sketch for ``n_cells`` cells."""
+        self.n_cells = n_cells
+        self.size = size
+        self.levels: List[np.ndarray] = []
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        """Add a batch of observations shaped (observations, cells)."""
+        values = np.asarray(values, dtype=float).reshape(-1, self.n_cells)
+        self._push(0, values.T)
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch over the same cells into this one."""
+        if other.n_cells != self.n_cells:
+            raise ValueError("Cannot merge sketches over different cells")
+        for level, items in enumerate(other.levels):
+            self._push(level, items)
+
+    def _push(self, level: int, items: np.ndarray):
+        """Append items to a level and compact upwards while levels overflow."""
+        while items.shape[1]:
+            while len(self.levels) <= level:
+                self.levels.append(np.empty((self.n_cells, 0)))
+            buffer = np.concatenate([self.levels[level], items], axis=1)
+            if buffer.shape[1] < 2 * self.size:
+                self.levels[level] = buffer
+                return
+
+            # Sort each cell, keep every other item of the even-sized prefix
+            n_even = buffer.shape[1] - buffer.shape[1] % 2
+            buffer.sort(axis=1)
+            offset = int(self.rng.integers(2))
+            items = buffer[:, offset:n_even:2]
+            self.levels[level] = buffer[:, n_even:]
+            level += 1
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> np.ndarray:
+        """Estimate quantiles; returns shape (cells,) or (len(q), cells)."""
+        if not self.levels or not sum(items.shape[1] for items in self.levels):
+            raise ValueError("Sketch is empty")
+        items = np.concatenate(self.levels, axis=1)
+        weights = np.concatenate([
+            np.full(level_items.shape[1], 2.0 ** level)
+            for level, level_items in enumerate(self.levels)
+        ])
+
+        order = np.argsort(items, axis=1)
+        sorted_items = np.take_along_axis(items, order, axis=1)
+        cumulative = np.cumsum(weights[order], axis=1)
+        total = cumulative[:, -1:]
+
+        q_values = np.atleast_1d(np.asarray(q, dtype=float))
+        rows = np.arange(self.n_cells)
+        estimates = np.empty((len(q_values), self.n_cells))
+        for i, q_value in enumerate(q_values):
+            position = (cumulative < q_value * total).sum(axis=1)
+            estimates[i] = sorted_items[rows, np.minimum(position, items.shape[1] - 1)]
+        return estimates if np.ndim(q) else estimates[0]
+
+class EnsembleAccumulator:
+    """Online per-variable, per-year statistics over ensemble members.
+
+    Consumes ``simulate_all``-shaped results whose trajectories have a
+    leading member axis (or single runs) and keeps the running mean and
+    variance (Welford, combined batch-wise with Chan's formula) plus a
+    ``QuantileSketch``. Memory is independent of the number of members, and
+    accumulators built in different processes can be merged.
+    """
+
+    def __init__(self, sketch_size: int = 256, seed: Optional[int] = None):
+        """Initialize an empty accumulator."""
+        self.sketch_size = sketch_size
+        self.seed = seed
+        self.count = 0
+        self.years: Optional[np.ndarray] = None
+        self.variables: List[str] = []
+        self._mean: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+        self.sketch: Optional[QuantileSketch] = None
+
+    def _start(self, years: np.ndarray, variables: List[str]):
+        """Fix the variables and time axis on the first batch."""
+        self.years = np.asarray(years)
+        self.variables = variables
+        shape = (len(variables), len(self.years))
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self.sketch = QuantileSketch(
+            len(variables) * len(self.years), self.sketch_size, self.seed
+        )
+
+    def update(self, results: Dict):
+        """Add a batch of members in the ``simulate_all`` layout."""
+        flat = flatten_results(results)
+        years = flat.pop('years')
+        if self.sketch is None:
+            self._start(years, list(flat))
+        elif list(flat) != self.variables or len(years) != len(self.years):
+            raise ValueError("Batch does not match the accumulated variables")
+
+        n_years = len(self.years)
+        batch_shape = np.broadcast_shapes(*(np.shape(flat[name]) for name in self.variables))
+        n_batch = int(np.prod(batch_shape[:-1], dtype=int))
+        values = np.stack([
+            np.broadcast_to(flat[name], batch_shape).reshape(n_batch, n_years)
+            for name in self.variables
+        ], axis=1)
+
+        self._combine(
+            n_batch,
+            values.mean(axis=0),
+            ((values - values.mean(axis=0)) ** 2).sum(axis=0)
+        )
+        self.sketch.update(values.reshape(n_batch, -1))
+
+    def _combine(self, count: int, mean: np.ndarray, m2: np.ndarray):
+        """Combine running moments with those of another group (Chan et al.)."""
+        total = self.count + count
+        delta = mean - self._mean
+        self._mean = self._mean + delta * (count / total)
+        self._m2 = self._m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def spawn(self, seed: Optional[int] = None) -> 'EnsembleAccumulator':
+        """Empty accumulator with the same settings, for one chunk of members."""
+        return EnsembleAccumulator(self.sketch_size, seed)
+
+    def merge(self, other: 'EnsembleAccumulator'):
+        """Fold an accumulator built elsewhere (e.g. another worker) into this one."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self._start(other.years, other.variables)
+        elif other.variables != self.variables:
+            raise ValueError("Cannot merge accumulators over different variables")
+        self._combine(other.count, other._mean, other._m2)
+        self.sketch.merge(other.sketch)
+
+    def mean(self) -> np.ndarray:
+        """Running mean, shaped (variables, years)."""
+        return self._mean
+
+    def variance(self, ddof: int = 1) -> np.ndarray:
+        """Running variance, shaped (variables, years)."""
+        if self.count <= ddof:
+            return np.full_like(self._mean, np.nan)
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Running standard deviation, shaped (variables, years)."""
+        return np.sqrt(self.variance(ddof))
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> np.ndarray:
+        """Approximate quantiles, shaped (variables, years) or (len(q), variables, years)."""
+        estimates = self.sketch.quantile(q)
+        return estimates.reshape(estimates.shape[:-1] + self._mean.shape)
+
+    def quantile_results(self, levels: Sequence[float] = FAN_LEVELS) -> Dict[float, Dict]:
+        """Approximate quantiles in the ``simulate_all`` layout, one result per level."""
+        estimates = self.quantile(list(levels))
+        return {
+            level: unflatten_results({
+                'years': self.years,
+                **{name: estimates[i, v] for v, name in enumerate(self.variables)}
+            })
+            for i, level in enumerate(levels)
+        }
+    
+    def to_results(self, statistic: Union[str, float] = 'mean') -> Dict:
+        """Express one statistic in the ``simulate_all`` layout.
+
+        ``statistic`` is ``'mean'``, ``'std'``, ``'variance'`` or a quantile
+        level such as ``0.5``. The result can be passed to
+        ``SimulationVisualizer`` in place of a single run.
+        """
+        if statistic == 'mean':
+            values = self.mean()
+        elif statistic == 'std':
+            values = self.std()
+        elif statistic == 'variance':
+            values = self.variance()
+        elif isinstance(statistic, (int, float)) and 0 <= statistic <= 1:
+            values = self.quantile(float(statistic))
+        else:
+            raise ValueError(f"Unknown statistic: {statistic}")
+
+        flat = {'years': self.years}
+        flat.update({name: values[v] for v, name in enumerate(self.variables)})
+        return unflatten_results(flat)
+
+class TrajectoryDensity:
+    """Mergeable year x value histograms of every member trajectory.
+
+    Each variable has a fixed ``(low, high)`` value range split into
+    ``bins`` rows, and one column per sample year (``oversample`` columns
+    per interval, drawn along the straight segment between years). Every
+    batch is binned in a single vectorized ``bincount`` per block of
+    members, so the state is ``variables x bins x columns`` counts however
+    many members are added, and densities built in different processes can
+    be merged as long as their ranges agree. Values outside the range (or
+    NaN) are counted per column in ``outside``.
+    """
+
+    def __init__(
+        self,
+        ranges: Dict[str, Tuple[float, float]],
+        bins: int = 200,
+        oversample: int = 4,
+        block_members: int = 1 << 14
+    ):
+        """Initialize empty histograms for the ``'section.variable'`` keys of ``ranges``."""
+        if any(high <= low for low, high in ranges.values()):
+            raise ValueError("Density ranges must have high > low")
+        self.ranges = {key: (float(low), float(high)) for key, (low, high) in ranges.items()}
+        self.variables = list(self.ranges)
+        self.bins = bins
+        self.oversample = max(int(oversample), 1)
+        self.block_members = block_members
+        self.count = 0
+        self.years: Optional[np.ndarray] = None
+        self.columns: Optional[np.ndarray] = None
+        self.counts: Optional[np.ndarray] = None
+        self.outside: Optional[np.ndarray] = None
+
+    def _start(self, years: np.ndarray):
+        """Fix the time axis on the first batch."""
+        self.years = np.asarray(years)
+        positions = np.arange((len(self.years) - 1) * self.oversample + 1) / self.oversample
+        self.columns = np.interp(positions, np.arange(len(self.years)), self.years)
+        n_columns = len(self.columns)
+        self.counts = np.zeros((len(self.variables), self.bins, n_columns), dtype=np.int64)
+        self.outside = np.zeros((len(self.variables), n_columns), dtype=np.int64)
+
+    def _resample(self, values: np.ndarray) -> np.ndarray:
+        """Values at the column positions, linear between sample years."""
+        if self.oversample == 1:
+            return values
+        fraction = np.arange(self.oversample) / self.oversample
+        start, end = values[:, :-1, None], values[:, 1:, None]
+        segments = (start + (end - start) * fraction).reshape(len(values), -1)
+        return np.concatenate([segments, values[:, -1:]], axis=1)
+
+    def update(self, results: Dict):
+        """Add a batch of members in the ``simulate_all`` layout."""
+        flat = flatten_results(results)
+        years = flat.pop('years')
+        if self.counts is None:
+            self._start(years)
+        elif len(years) != len(self.years):
+            raise ValueError("Batch does not match the accumulated years")
+
+        n_years = len(self.years)
+        n_columns = len(self.columns)
+        batch_shape = np.broadcast_shapes(*(np.shape(flat[key]) for key in self.variables))
+        n_batch = int(np.prod(batch_shape[:-1], dtype=int))
+        for v, key in enumerate(self.variables):
+            low, high = self.ranges[key]
+            values = np.broadcast_to(flat[key], batch_shape).reshape(n_batch, n_years)
+            for start in range(0, n_batch, self.block_members):
+                block = self._resample(
+                    np.asarray(values[start:start + self.block_members], dtype=float)
+                )
+                with np.errstate(invalid='ignore'):
+                    rows = np.floor((block - low) * (self.bins / (high - low)))
+                    inside = (rows >= 0) & (rows < self.bins)
+                cells = np.where(inside, rows, 0).astype(np.intp) * n_columns + np.arange(n_columns)
+                self.counts[v] += np.bincount(
+                    cells[inside], minlength=self.bins * n_columns
+                ).reshape(self.bins, n_columns)
+                self.outside[v] += (~inside).sum(axis=0)
+        self.count += n_batch
+
+    def spawn(self, seed: Optional[int] = None) -> 'TrajectoryDensity':
+        """Empty density with the same ranges and resolution, for one chunk of members."""
+        return TrajectoryDensity(self.ranges, self.bins, self.oversample, self.block_members)
+
+    def merge(self, other: 'TrajectoryDensity'):
+        """Fold a density built elsewhere (e.g. another worker) into this one."""
+        if (other.ranges != self.ranges or other.bins != self.bins
+                or other.oversample != self.oversample):
+            raise ValueError("Cannot merge densities over different grids")
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self._start(other.years)
+        elif len(other.years) != len(self.years):
+            raise ValueError("Cannot merge densities over different years")
+        self.counts += other.counts
+        self.outside += other.outside
+        self.count += other.count
+
+    def density(self, key: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Histogram of one variable as ``(columns, value_edges, shares)``.
+
+        ``shares`` is shaped (bins, columns) and holds the fraction of
+        members in each value bin at each column time.
+        """
+        if self.count == 0:
+            raise ValueError("Density is empty")
+        low, high = self.ranges[key]
+        edges = np.linspace(low, high, self.bins + 1)
+        return self.columns, edges, self.counts[self.variables.index(key)] / self.count
+
+def trajectory_density(
+    results: Dict,
+    keys: Sequence[str],
+    bins: int = 200,
+    oversample: int = 4,
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None
+) -> TrajectoryDensity:
+    """``TrajectoryDensity`` of ensemble results held in memory.
+
+    Ranges not given in ``ranges`` span the finite values of the variable.
+    """
+    flat = flatten_results(results)
+    ranges = dict(ranges or {})
+    for key in keys:
+        if key not in ranges:
+            values = np.asarray(flat[key], dtype=float)
+            finite = values[np.isfinite(values)]
+            low, high = (finite.min(), finite.max()) if finite.size else (0.0, 1.0)
+            if high <= low:
+                low, high = low - 0.5, high + 0.5
+            ranges[key] = (low, high + (high - low) * 1e-9)
+    density = TrajectoryDensity({key: ranges[key] for key in keys}, bins, oversample)
+    density.update(results)
+    return density
+
+def _combine_moments(
+    count: int, mean: np.ndarray, comoment: np.ndarray,
+    other_count: int, other_mean: np.ndarray, other_comoment: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and co-moment matrix of two groups of rows together (Chan et al.)."""
+    total = count + other_count
+    delta = other_mean - mean
+    return (
+        mean + delta * (other_count / total),
+        comoment + other_comoment + np.outer(delta, delta) * (count * other_count / total)
+    )
+
+def _batch_moments(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and co-moment matrix of a block of rows (observations, variables)."""
+    mean = rows.mean(axis=0)
+    centered = rows - mean
+    return mean, centered.T @ centered
+
+def _correlation(comoment: np.ndarray) -> np.ndarray:
+    """Correlation matrix of a co-moment matrix (NaN for constant variables)."""
+    scale = np.sqrt(np.diag(comoment))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return comoment / np.outer(scale, scale)
+
+class StreamingCovariance:
+    """Mergeable covariance and correlation of result variables over ensembles.
+
+    Every (member, year) pair of the results is one observation of the
+    ``keys`` variables (``'years'`` may be one of them). Only the count,
+    mean and co-moment matrix are kept, combined batch-wise with Chan's
+    formula, so the matrices are exact over any number of rows in
+    O(variables^2) memory and accumulators from different processes merge.
+
+    With ``ranks`` the same moments are also kept for the rows' ranks
+    within their batch, scaled to (0, 1). Each batch's ranks estimate the
+    ensemble-wide distribution function, so for batches drawn from the same
+    ensemble the rank correlation approximates Spearman's, with an error
+    that shrinks with the batch size (one chunk of members); a single
+    batch gives it exactly.
+    """
+
+    def __init__(self, keys: Sequence[str], ranks: bool = False):
+        """Initialize empty moments over the ``'section.variable'`` keys."""
+        self.keys = list(keys)
+        self.ranks = ranks
+        n_keys = len(self.keys)
+        self.count = 0
+        self._mean = np.zeros(n_keys)
+        self._comoment = np.zeros((n_keys, n_keys))
+        self._rank_mean = np.zeros(n_keys)
+        self._rank_comoment = np.zeros((n_keys, n_keys))
+
+    def _rows(self, results: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Observations of a batch as (rows, variables), with the year of each row."""
+        flat = flatten_results(results)
+        batch_shape = np.broadcast_shapes(*(np.shape(flat[key]) for key in self.keys))
+        rows = np.stack([
+            np.broadcast_to(flat[key], batch_shape).reshape(-1) for key in self.keys
+        ], axis=1).astype(float, copy=False)
+        return rows, np.broadcast_to(flat['years'], batch_shape).reshape(-1)
+
+    def update(self, results: Dict):
+        """Add a batch of members (or a single run) in the ``simulate_all`` layout."""
+        rows, _ = self._rows(results)
+        self._add(rows)
+
+    def _add(self, rows: np.ndarray):
+        """Fold a block of observation rows into the moments."""
+        moments = [_batch_moments(rows)]
+        if self.ranks:
+            from scipy.stats import rankdata
+
+            moments.append(_batch_moments(rankdata(rows, axis=0) / (len(rows) + 1)))
+        self._merge_moments(len(rows), moments)
+
+    def _merge_moments(self, count: int, moments: List[Tuple[np.ndarray, np.ndarray]]):
+        """Combine the running moments with another group's, in ``_add`` order."""
+        self._mean, self._comoment = _combine_moments(
+            self.count, self._mean, self._comoment, count, *moments[0]
+        )
+        if self.ranks:
+            self._rank_mean, self._rank_comoment = _combine_moments(
+                self.count, self._rank_mean, self._rank_comoment, count, *moments[1]
+            )
+        self.count += count
+
+    def spawn(self, seed: Optional[int] = None) -> 'StreamingCovariance':
+        """Empty accumulator over the same variables, for one chunk of members."""
+        return StreamingCovariance(self.keys, self.ranks)
+
+    def merge(self, other: 'StreamingCovariance'):
+        """Fold an accumulator built elsewhere (e.g. another worker) into this one."""
+        if other.keys != self.keys or other.ranks != self.ranks:
+            raise ValueError("Cannot merge moments over different variables")
+        if other.count == 0:
+            return
+        self._merge_moments(other.count, [
+            (other._mean, other._comoment), (other._rank_mean, other._rank_comoment)
+        ])
+
+    def mean(self) -> np.ndarray:
+        """Mean of each variable."""
+        return self._mean
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        """Covariance matrix of the variables."""
+        if self.count <= ddof:
+            return np.full_like(self._comoment, np.nan)
+        return self._comoment / (self.count - ddof)
+
+    def correlation(self, method: str = 'pearson') -> np.ndarray:
+        """Pearson or (approximate) Spearman correlation matrix of the variables."""
+        if self.count < 2:
+            raise ValueError("Correlation needs at least two observations")
+        if method == 'pearson':
+            return _correlation(self._comoment)
+        if method == 'spearman':
+            if not self.ranks:
+                raise ValueError("Rank correlation needs an accumulator built with ranks=True")
+            return _correlation(self._rank_comoment)
+        raise ValueError(f"Unknown correlation method: {method}")
+
+class StreamingPCA(StreamingCovariance):
+    """Principal components of indicator states streamed over ensembles.
+
+    The fit is the exact PCA of the standardized ``keys`` indicators over
+    every (member, year) state, from the moments of ``StreamingCovariance``.
+    A uniform ``sample_size``-row sample (bottom-k of random keys, which
+    also merges exactly) is kept for drawing the projected states.
+    """
+
+    def __init__(self, keys: Sequence[str], sample_size: int = 20000, seed: Optional[int] = None):
+        """Initialize an empty fit over the ``'section.variable'`` indicators ``keys``."""
+        super().__init__(keys)
+        self.sample_size = sample_size
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.sample = np.empty((0, len(self.keys)))
+        self.sample_years = np.empty(0)
+        self._sample_priority = np.empty(0)
+
+    def update(self, results: Dict):
+        """Add a batch of members (or a single run) in the ``simulate_all`` layout."""
+        rows, years = self._rows(results)
+        self._add(rows)
+        self._keep(rows, years, self.rng.random(len(rows)))
+
+    def _keep(self, rows: np.ndarray, years: np.ndarray, priority: np.ndarray):
+        """Retain the rows with the smallest random priorities."""
+        priority = np.concatenate([self._sample_priority, priority])
+        rows = np.concatenate([self.sample, rows])
+        years = np.concatenate([self.sample_years, years])
+        if len(priority) > self.sample_size:
+            keep = np.argpartition(priority, self.sample_size)[:self.sample_size]
+            priority, rows, years = priority[keep], rows[keep], years[keep]
+        self._sample_priority, self.sample, self.sample_years = priority, rows, years
+
+    def spawn(self, seed: Optional[int] = None) -> 'StreamingPCA':
+        """Empty fit with the same indicators, for one chunk of members."""
+        return StreamingPCA(self.keys, self.sample_size, seed)
+
+    def merge(self, other: 'StreamingPCA'):
+        """Fold a fit built elsewhere (e.g. another worker) into this one."""
+        super().merge(other)
+        if other.count:
+            self._keep(other.sample, other.sample_years, other._sample_priority)
+
+    def scale(self) -> np.ndarray:
+        """Population standard deviation of each indicator (zero spread counts as 1)."""
+        std = np.sqrt(np.diag(self._comoment) / max(self.count, 1))
+        return np.where(std > 0, std, 1.0)
+
+    def fit(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Explained variance ratios and components (rows) of the standardized indicators.
+
+        Component signs follow scikit-learn: the largest loading is positive.
+        """
+        if self.count < 2:
+            raise ValueError("PCA needs at least two observations")
+        scale = self.scale()
+        correlation = self._comoment / np.outer(scale, scale) / (self.count - 1)
+        variances, vectors = np.linalg.eigh(correlation)
+        order = np.argsort(variances)[::-1]
+        variances = np.clip(variances[order], 0, None)
+        components = vectors[:, order].T
+        signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+        return variances / variances.sum(), components * signs[:, None]
+
+    def transform(self, rows: np.ndarray, n_components: int = 2) -> np.ndarray:
+        """Project indicator rows (observations, indicators) onto the leading components."""
+        _, components = self.fit()
+        return ((rows - self._mean) / self.scale()) @ components[:n_components].T
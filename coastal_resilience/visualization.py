@@ -8,183 +8,306 @@ import seaborn as sns
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
+from .rendering import render_plots
+from .streaming import StreamingCovariance
+
 class SimulationVisualizer:
     """Visualization tools for simulation results."""
     
-    def __init__(self, simulation_results: Dict[str, np.ndarray]):
-        """Initialize visualizer with simulation results."""
+    # Result variables each plot is drawn from ('section.variable' keys)
+    PLOT_INPUTS = {
+        'plot_indices': ('resilience_index', 'sustainability_index', 'development_index'),
+        'plot_climate_indicators': (
+            'climate_data.sea_level', 'climate_data.temperature', 'climate_data.rainfall'
+        ),
+        'plot_environmental_indicators': (
+            'environment_data.mangrove_coverage',
+            'environment_data.biodiversity_index',
+            'environment_data.water_quality_index'
+        ),
+        'plot_blue_economy_indicators': (
+            'blue_economy_data.fisheries_value',
+            'blue_economy_data.aquaculture_value',
+            'blue_economy_data.tourism_value',
+            'blue_economy_data.biotech_value'
+        ),
+        'plot_socioeconomic_indicators': (
+            'socioeconomic_data.population',
+            'socioeconomic_data.gdp',
+            'socioeconomic_data.employment_rate',
+            'socioeconomic_data.poverty_rate'
+        ),
+        'plot_policy_indicators': (
+            'policy_data.policy_impact',
+            'policy_data.budget_utilization',
+            'policy_data.institutional_performance',
+            'policy_data.monitoring_effectiveness'
+        ),
+        'plot_correlation_matrix': (
+            'resilience_index',
+            'sustainability_index',
+            'development_index',
+            'climate_data.sea_level',
+            'environment_data.mangrove_coverage',
+            'socioeconomic_data.gdp',
+            'blue_economy_data.total_value',
+            'policy_data.overall_effectiveness'
+        )
+    }
+    
+    # Summary table columns and the result variables they show
+    SUMMARY_COLUMNS = {
+        'Year': 'years',
+        'Resilience Index': 'resilience_index',
+        'Sustainability Index': 'sustainability_index',
+        'Development Index': 'development_index',
+        'Sea Level Rise': 'climate_data.sea_level',
+        'Mangrove Coverage': 'environment_data.mangrove_coverage',
+        'GDP': 'socioeconomic_data.gdp',
+        'Blue Economy Value': 'blue_economy_data.total_value',
+        'Policy Effectiveness': 'policy_data.overall_effectiveness'
+    }
+    
+    def __init__(self, simulation_results: Dict[str, np.ndarray],
+                 quantiles: Optional[Dict[float, Dict]] = None,
+                 covariance: Optional[StreamingCovariance] = None):
+        """Initialize visualizer with simulation results.
+
+        ``quantiles`` optionally maps the levels 0.05, 0.25, 0.5, 0.75 and
+        0.95 to ensemble quantiles in the results layout; the line plots
+        then draw fan charts (median with 25-75% and 5-95% bands). See
+        ``from_ensemble``. ``covariance`` optionally supplies the moments of
+        an ensemble for ``plot_correlation_matrix``.
+        """
         self.results = simulation_results
         self.years = simulation_results['years']
+        self.quantiles = quantiles
+        self.covariance = covariance
         
         # Set style
+        self.set_style()
+    
+    @staticmethod
+    def set_style():
+        """Apply the plot style; rendering workers call it before drawing."""
         plt.style.use('seaborn-v0_8')  # Using a specific seaborn style version
         sns.set_theme()  # Set seaborn theme
     
+    @classmethod
+    def from_ensemble(cls, ensemble,
+                      covariance: Optional[StreamingCovariance] = None) -> 'SimulationVisualizer':
+        """Visualize an ensemble through its quantiles.
+
+        ``ensemble`` is an ``EnsembleAccumulator`` (approximate quantiles
+        from its sketch) or ensemble results with a leading member axis
+        (exact quantiles). Either way only five trajectories per variable
+        are drawn, however many members the ensemble has; the median
+        stands in for the results in tables and correlations.
+        """
+        from .streaming import FAN_LEVELS, ensemble_quantiles
+        
+        if hasattr(ensemble, 'quantile_results'):
+            quantiles = ensemble.quantile_results(FAN_LEVELS)
+        else:
+            quantiles = ensemble_quantiles(ensemble, FAN_LEVELS)
+        return cls(quantiles[0.5], quantiles, covariance)
+    
+    def _variable(self, key: str, results: Optional[Dict] = None) -> np.ndarray:
+        """Result array of a ``'section.variable'`` key."""
+        results = self.results if results is None else results
+        if '.' in key:
+            section, name = key.split('.', 1)
+            return results[section][name]
+        return results[key]
+    
+    def _plot_series(self, ax, key: str, label: str):
+        """Draw one variable: a line, or a fan chart for ensemble quantiles."""
+        if self.quantiles is None:
+            ax.plot(self.years, self._variable(key), label=label, linewidth=2)
+            return
+        
+        line, = ax.plot(self.years, self._variable(key, self.quantiles[0.5]),
+                        label=label, linewidth=2)
+        for low, high, alpha in ((0.05, 0.95, 0.15), (0.25, 0.75, 0.3)):
+            ax.fill_between(
+                self.years,
+                self._variable(key, self.quantiles[low]),
+                self._variable(key, self.quantiles[high]),
+                color=line.get_color(), alpha=alpha, linewidth=0
+            )
+    
+    def plot_inputs(self, method: str, args: tuple) -> Dict:
+        """The data a plot is drawn from, for ``save_all_plots`` change detection."""
+        if method == 'plot_correlation_matrix' and self.covariance is not None:
+            return {
+                'keys': self.covariance.keys,
+                'count': self.covariance.count,
+                'moments': (self.covariance._comoment, self.covariance._rank_comoment)
+            }
+        inputs = {key: self._variable(key) for key in self.PLOT_INPUTS[method]}
+        if self.quantiles is not None:
+            inputs['quantiles'] = {
+                level: [self._variable(key, results) for key in self.PLOT_INPUTS[method]]
+                for level, results in self.quantiles.items()
+            }
+        inputs['years'] = self.years
+        return inputs
+    
     def plot_indices(self, figsize: Tuple[int, int] = (12, 8)):
         """Plot the main indices over time."""
-        plt.figure(figsize=figsize)
+        fig, ax = plt.subplots(figsize=figsize)
         
-        plt.plot(self.years, self.results['resilience_index'], 
-                label='Resilience Index', linewidth=2)
-        plt.plot(self.years, self.results['sustainability_index'], 
-                label='Sustainability Index', linewidth=2)
-        plt.plot(self.years, self.results['development_index'], 
-                label='Development Index', linewidth=2)
+        self._plot_series(ax, 'resilience_index', 'Resilience Index')
+        self._plot_series(ax, 'sustainability_index', 'Sustainability Index')
+        self._plot_series(ax, 'development_index', 'Development Index')
         
-        plt.title('Integrated Coastal Development Indices Over Time')
-        plt.xlabel('Year')
-        plt.ylabel('Index Value')
-        plt.legend()
-        plt.grid(True)
+        ax.set_title('Integrated Coastal Development Indices Over Time')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Index Value')
+        ax.legend()
+        ax.grid(True)
         
-        return plt.gcf()
+        return fig
     
     def plot_climate_indicators(self, figsize: Tuple[int, int] = (12, 8)):
         """Plot climate change indicators."""
-        plt.figure(figsize=figsize)
+        fig, ax = plt.subplots(figsize=figsize)
         
-        climate_data = self.results['climate_data']
-        plt.plot(self.years, climate_data['sea_level'], 
-                label='Sea Level Rise', linewidth=2)
-        plt.plot(self.years, climate_data['temperature'], 
-                label='Temperature', linewidth=2)
-        plt.plot(self.years, climate_data['rainfall'], 
-                label='Rainfall', linewidth=2)
+        self._plot_series(ax, 'climate_data.sea_level', 'Sea Level Rise')
+        self._plot_series(ax, 'climate_data.temperature', 'Temperature')
+        self._plot_series(ax, 'climate_data.rainfall', 'Rainfall')
         
-        plt.title('Climate Change Indicators')
-        plt.xlabel('Year')
-        plt.ylabel('Change from Baseline (%)')
-        plt.legend()
-        plt.grid(True)
+        ax.set_title('Climate Change Indicators')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Change from Baseline (%)')
+        ax.legend()
+        ax.grid(True)
         
-        return plt.gcf()
+        return fig
     
     def plot_environmental_indicators(self, figsize: Tuple[int, int] = (12, 8)):
         """Plot environmental indicators."""
-        plt.figure(figsize=figsize)
+        fig, ax = plt.subplots(figsize=figsize)
         
-        env_data = self.results['environment_data']
-        plt.plot(self.years, env_data['mangrove_coverage'], 
-                label='Mangrove Coverage', linewidth=2)
-        plt.plot(self.years, env_data['biodiversity_index'], 
-                label='Biodiversity Index', linewidth=2)
-        plt.plot(self.years, env_data['water_quality_index'], 
-                label='Water Quality Index', linewidth=2)
+        self._plot_series(ax, 'environment_data.mangrove_coverage', 'Mangrove Coverage')
+        self._plot_series(ax, 'environment_data.biodiversity_index', 'Biodiversity Index')
+        self._plot_series(ax, 'environment_data.water_quality_index', 'Water Quality Index')
         
-        plt.title('Environmental Indicators')
-        plt.xlabel('Year')
-        plt.ylabel('Index Value')
-        plt.legend()
-        plt.grid(True)
+        ax.set_title('Environmental Indicators')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Index Value')
+        ax.legend()
+        ax.grid(True)
         
-        return plt.gcf()
+        return fig
     
     def plot_blue_economy_indicators(self, figsize: Tuple[int, int] = (12, 8)):
         """Plot blue economy indicators."""
-        plt.figure(figsize=figsize)
-        
-        blue_econ_data = self.results['blue_economy_data']
-        plt.plot(self.years, blue_econ_data['fisheries_value'], 
-                label='Fisheries Value', linewidth=2)
-        plt.plot(self.years, blue_econ_data['aquaculture_value'], 
-                label='Aquaculture Value', linewidth=2)
-        plt.plot(self.years, blue_econ_data['tourism_value'], 
-                label='Tourism Value', linewidth=2)
-        plt.plot(self.years, blue_econ_data['biotech_value'], 
-                label='Biotech Value', linewidth=2)
-        
-        plt.title('Blue Economy Indicators')
-        plt.xlabel('Year')
-        plt.ylabel('Value (Billion USD)')
-        plt.legend()
-        plt.grid(True)
-        
-        return plt.gcf()
+        fig, ax = plt.subplots(figsize=figsize)
+        
+        self._plot_series(ax, 'blue_economy_data.fisheries_value', 'Fisheries Value')
+        self._plot_series(ax, 'blue_economy_data.aquaculture_value', 'Aquaculture Value')
+        self._plot_series(ax, 'blue_economy_data.tourism_value', 'Tourism Value')
+        self._plot_series(ax, 'blue_economy_data.biotech_value', 'Biotech Value')
+        
+        ax.set_title('Blue Economy Indicators')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Value (Billion USD)')
+        ax.legend()
+        ax.grid(True)
+        
+        return fig
     
     def plot_socioeconomic_indicators(self, figsize: Tuple[int, int] = (12, 8)):
         """Plot socioeconomic indicators."""
-        plt.figure(figsize=figsize)
-        
-        socio_data = self.results['socioeconomic_data']
-        plt.plot(self.years, socio_data['population'], 
-                label='Population', linewidth=2)
-        plt.plot(self.years, socio_data['gdp'], 
-                label='GDP', linewidth=2)
-        plt.plot(self.years, socio_data['employment_rate'], 
-                label='Employment Rate', linewidth=2)
-        plt.plot(self.years, socio_data['poverty_rate'], 
-                label='Poverty Rate', linewidth=2)
-        
-        plt.title('Socioeconomic Indicators')
-        plt.xlabel('Year')
-        plt.ylabel('Value')
-        plt.legend()
-        plt.grid(True)
-        
-        return plt.gcf()
+        fig, ax = plt.subplots(figsize=figsize)
+        
+        self._plot_series(ax, 'socioeconomic_data.population', 'Population')
+        self._plot_series(ax, 'socioeconomic_data.gdp', 'GDP')
+        self._plot_series(ax, 'socioeconomic_data.employment_rate', 'Employment Rate')
+        self._plot_series(ax, 'socioeconomic_data.poverty_rate', 'Poverty Rate')
+        
+        ax.set_title('Socioeconomic Indicators')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Value')
+        ax.legend()
+        ax.grid(True)
+        
+        return fig
     
     def plot_policy_indicators(self, figsize: Tuple[int, int] = (12, 8)):
         """Plot policy implementation indicators."""
-        plt.figure(figsize=figsize)
-        
-        policy_data = self.results['policy_data']
-        plt.plot(self.years, policy_data['policy_impact'], 
-                label='Policy Impact', linewidth=2)
-        plt.plot(self.years, policy_data['budget_utilization'], 
-                label='Budget Utilization', linewidth=2)
-        plt.plot(self.years, policy_data['institutional_performance'], 
-                label='Institutional Performance', linewidth=2)
-        plt.plot(self.years, policy_data['monitoring_effectiveness'], 
-                label='Monitoring Effectiveness', linewidth=2)
-        
-        plt.title('Policy Implementation Indicators')
-        plt.xlabel('Year')
-        plt.ylabel('Effectiveness (%)')
-        plt.legend()
-        plt.grid(True)
-        
-        return plt.gcf()
+        fig, ax = plt.subplots(figsize=figsize)
+        
+        self._plot_series(ax, 'policy_data.policy_impact', 'Policy Impact')
+        self._plot_series(ax, 'policy_data.budget_utilization', 'Budget Utilization')
+        self._plot_series(ax, 'policy_data.institutional_performance', 'Institutional Performance')
+        self._plot_series(ax, 'policy_data.monitoring_effectiveness', 'Monitoring Effectiveness')
+        
+        ax.set_title('Policy Implementation Indicators')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Effectiveness (%)')
+        ax.legend()
+        ax.grid(True)
+        
+        return fig
     
     def create_summary_table(self) -> pd.DataFrame:
         """Create a summary table of key indicators."""
         summary_data = {
-            'Year': self.years,
-            'Resilience Index': self.results['resilience_index'],
-            'Sustainability Index': self.results['sustainability_index'],
-            'Development Index': self.results['development_index'],
-            'Sea Level Rise': self.results['climate_data']['sea_level'],
-            'Mangrove Coverage': self.results['environment_data']['mangrove_coverage'],
-            'GDP': self.results['socioeconomic_data']['gdp'],
-            'Blue Economy Value': self.results['blue_economy_data']['total_value'],
-            'Policy Effectiveness': self.results['policy_data']['overall_effectiveness']
+            label: self._variable(key) for label, key in self.SUMMARY_COLUMNS.items()
         }
         
         return pd.DataFrame(summary_data)
     
-    def plot_correlation_matrix(self, figsize: Tuple[int, int] = (12, 8)):
-        """Plot correlation matrix of key indicators."""
-        summary_df = self.create_summary_table()
-        correlation_matrix = summary_df.corr()
+    def plot_correlation_matrix(self, figsize: Tuple[int, int] = (12, 8),
+                                method: str = 'pearson'):
+        """Plot correlation matrix of key indicators.
+
+        ``method`` is ``'pearson'`` or ``'spearman'``. With a
+        ``StreamingCovariance`` the matrix covers every member and year of
+        the ensemble (Spearman from its approximate ranks); otherwise it is
+        that of the summary table.
+        """
+        if self.covariance is not None:
+            labels = {key: label for label, key in self.SUMMARY_COLUMNS.items()}
+            names = [labels.get(key, key) for key in self.covariance.keys]
+            correlation_matrix = pd.DataFrame(
+                self.covariance.correlation(method), index=names, columns=names
+            )
+        else:
+            summary_df = self.create_summary_table()
+            correlation_matrix = summary_df.corr(method=method)
         
-        plt.figure(figsize=figsize)
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0)
-        plt.title('Correlation Matrix of Key Indicators')
+        fig, ax = plt.subplots(figsize=figsize)
+        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0, ax=ax)
+        title = 'Correlation Matrix of Key Indicators'
+        ax.set_title(title if method == 'pearson' else f'{title} ({method.title()})')
         
-        return plt.gcf()
+        return fig
     
-    def save_all_plots(self, output_dir: str):
-        """Save all plots to the specified directory."""
-        import os
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate and save all plots
-        self.plot_indices().savefig(f'{output_dir}/indices.png')
-        self.plot_climate_indicators().savefig(f'{output_dir}/climate.png')
-        self.plot_environmental_indicators().savefig(f'{output_dir}/environment.png')
-        self.plot_blue_economy_indicators().savefig(f'{output_dir}/blue_economy.png')
-        self.plot_socioeconomic_indicators().savefig(f'{output_dir}/socioeconomic.png')
-        self.plot_policy_indicators().savefig(f'{output_dir}/policy.png')
-        self.plot_correlation_matrix().savefig(f'{output_dir}/correlation.png')
+    def save_all_plots(self, output_dir: str, n_workers: Optional[int] = 1,
+                       skip_unchanged: bool = True) -> Dict[str, float]:
+        """Save all plots to the specified directory.
+
+        Figures are closed after saving; ``n_workers`` renders them across a
+        process pool. Plots whose input data are unchanged since they were
+        last saved there are skipped unless ``skip_unchanged`` is False.
+        Returns the rendering time of each plot drawn, in seconds.
+        """
+        jobs = [
+            ('indices.png', 'plot_indices', ()),
+            ('climate.png', 'plot_climate_indicators', ()),
+            ('environment.png', 'plot_environmental_indicators', ()),
+            ('blue_economy.png', 'plot_blue_economy_indicators', ()),
+            ('socioeconomic.png', 'plot_socioeconomic_indicators', ()),
+            ('policy.png', 'plot_policy_indicators', ()),
+            ('correlation.png', 'plot_correlation_matrix', ())
+        ]
+        if self.covariance is not None and self.covariance.ranks:
+            jobs.append(('rank_correlation.png', 'plot_correlation_matrix', ((12, 8), 'spearman')))
+        timings = render_plots(self, jobs, output_dir, n_workers, skip_unchanged)
         
         # Save summary table
-        self.create_summary_table().to_csv(f'{output_dir}/summary.csv', index=False) 
\ No newline at end of file
+        self.create_summary_table().to_csv(f'{output_dir}/summary.csv', index=False)
+        return timings
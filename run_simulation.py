@@ -3,15 +3,20 @@ Main script to run the integrated coastal resilience simulation.
 """
 
 import numpy as np
-from coastal_resilience.simulation import IntegratedSimulation
-from coastal_resilience.visualization import SimulationVisualizer
-from coastal_resilience.advanced_visualization import AdvancedVisualizer
+from coastal_resilience.simulation import IntegratedSimulation, add_aggregate_indicators
+from coastal_resilience.results_io import save_results
+from coastal_resilience.cache import parameter_dict, parameter_hash
+from coastal_resilience.catalog import RunCatalog
+import argparse
 import os
-import json
 from datetime import datetime
 
-def run_simulation():
-    """Run the integrated simulation and save results."""
+def run_simulation(sensitivity: bool = False):
+    """Run the integrated simulation and save results.
+
+    With ``sensitivity``, a Sobol analysis around the default parameters the
+    run uses is added to the advanced plots; it costs thousands of runs.
+    """
     print("Starting simulation...")
     
     # Initialize simulation
@@ -21,66 +26,53 @@ def run_simulation():
     results = simulation.simulate_all()
     
     # Add aggregate keys for advanced visualization
-    # Climate overall_impact
-    climate_data = results['climate_data']
-    climate_arrays = [np.array(climate_data[k]) for k in climate_data if k != 'year']
-    climate_data['overall_impact'] = np.mean(climate_arrays, axis=0)
-
-    # Environment overall_health
-    environment_data = results['environment_data']
-    env_arrays = [np.array(environment_data[k]) for k in environment_data if k != 'year']
-    environment_data['overall_health'] = np.mean(env_arrays, axis=0)
-
-    # Socioeconomic overall_development
-    socioeconomic_data = results['socioeconomic_data']
-    socio_arrays = [np.array(socioeconomic_data[k]) for k in socioeconomic_data if k != 'year']
-    socioeconomic_data['overall_development'] = np.mean(socio_arrays, axis=0)
+    add_aggregate_indicators(results)
     
     # Create output directories
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = f"output/simulation_{timestamp}"
+    now = datetime.now()
+    output_dir = f"output/simulation_{now.strftime('%Y%m%d_%H%M%S')}"
     os.makedirs(output_dir, exist_ok=True)
     
     # Save raw results
     print("Saving simulation results...")
-    np.save(f"{output_dir}/simulation_results.npy", results)
-    
-    # Convert results to JSON for better readability
-    json_results = {
-        'years': results['years'].tolist(),
-        'resilience_index': results['resilience_index'].tolist(),
-        'sustainability_index': results['sustainability_index'].tolist(),
-        'development_index': results['development_index'].tolist(),
-        'climate_data': {
-            k: v.tolist() for k, v in results['climate_data'].items()
-        },
-        'environment_data': {
-            k: v.tolist() for k, v in results['environment_data'].items()
-        },
-        'blue_economy_data': {
-            k: v.tolist() for k, v in results['blue_economy_data'].items()
-        },
-        'socioeconomic_data': {
-            k: v.tolist() for k, v in results['socioeconomic_data'].items()
-        },
-        'policy_data': {
-            k: v.tolist() for k, v in results['policy_data'].items()
+    results_dir = save_results(
+        results,
+        f"{output_dir}/results",
+        metadata={
+            'created': now.isoformat(timespec='seconds'),
+            'parameter_hash': parameter_hash(simulation),
+            'parameters': parameter_dict(simulation)
         }
-    }
-    
-    with open(f"{output_dir}/simulation_results.json", 'w') as f:
-        json.dump(json_results, f, indent=2)
+    )
+    with RunCatalog("output/catalog.sqlite") as catalog:
+        catalog.record_simulation(
+            simulation, results, results_dir, now.isoformat(timespec='seconds')
+        )
     
-    # Generate visualizations
+    # Generate visualizations; plotting libraries are only loaded here
     print("Generating visualizations...")
+    import matplotlib
+    matplotlib.use('Agg')  # Render reports headless
+    from coastal_resilience.visualization import SimulationVisualizer
+    from coastal_resilience.advanced_visualization import AdvancedVisualizer
+    
     basic_visualizer = SimulationVisualizer(results)
-    advanced_visualizer = AdvancedVisualizer(results)
+    sobol = None
+    if sensitivity:
+        from coastal_resilience.sensitivity import sobol_analysis
+        # The run uses the default parameters, around which the Sobol factors vary
+        print("Running sensitivity analysis...")
+        sobol = sobol_analysis(n_samples=256, seed=0)
+    advanced_visualizer = AdvancedVisualizer(results, sensitivity=sobol)
     
     # Save basic plots
-    basic_visualizer.save_all_plots(f"{output_dir}/visualization/basic")
+    timings = basic_visualizer.save_all_plots(f"{output_dir}/visualization/basic")
     
     # Save advanced plots
-    advanced_visualizer.save_all_plots(f"{output_dir}/visualization/advanced")
+    timings.update(advanced_visualizer.save_all_plots(f"{output_dir}/visualization/advanced"))
+    if timings:
+        slowest = max(timings, key=timings.get)
+        print(f"Rendered {len(timings)} plots; slowest: {slowest} ({timings[slowest]:.2f}s)")
     
     # Save summary table
     summary_table = basic_visualizer.create_summary_table()
@@ -90,4 +82,7 @@ def run_simulation():
     return output_dir
 
 if __name__ == "__main__":
-    output_dir = run_simulation() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--sensitivity', action='store_true',
+                        help='add a Sobol sensitivity analysis to the plots')
+    output_dir = run_simulation(parser.parse_args().sensitivity)
@@ -0,0 +1,53 @@
+"""
+Tests of the simulation result cache.
+"""
+
+import numpy as np
+
+from coastal_resilience.cache import ResultCache, parameter_hash
+from coastal_resilience.precision import COMPACT
+from coastal_resilience.simulation import IntegratedSimulation
+
+def test_same_parameters_hit(tmp_path):
+    cache = ResultCache(tmp_path)
+    expected = IntegratedSimulation().simulate_all(cache=cache)['socioeconomic_data']['gdp'].copy()
+    served = IntegratedSimulation().simulate_all(cache=cache)['socioeconomic_data']['gdp']
+    assert cache.stats()['hits'] == 1
+    np.testing.assert_array_equal(served, expected)
+
+def test_precisions_do_not_share_entries(tmp_path):
+    cache = ResultCache(tmp_path)
+    compact = IntegratedSimulation(precision=COMPACT)
+    full = IntegratedSimulation()
+    assert parameter_hash(compact) != parameter_hash(full)
+
+    compact.simulate_all(cache=cache)
+    results = full.simulate_all(cache=cache)
+    assert cache.stats()['hits'] == 0
+    assert results['socioeconomic_data']['gdp'].dtype == np.float64
+    np.testing.assert_array_equal(
+        results['socioeconomic_data']['gdp'],
+        IntegratedSimulation().simulate_all()['socioeconomic_data']['gdp']
+    )
+
+def test_cached_run_is_timed_once(tmp_path):
+    from coastal_resilience.instrumentation import Profiler
+
+    cache = ResultCache(tmp_path)
+    for expected_hits in (0, 1):
+        profiler = Profiler()
+        simulation = IntegratedSimulation()
+        with simulation.observe(profiler):
+            simulation.simulate_all(cache=cache)
+        assert cache.stats()['hits'] == expected_hits
+        assert profiler.summary()['simulate_all']['calls'] == 1
+
+def test_hit_survives_failed_touch(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    IntegratedSimulation().simulate_all(cache=cache)
+
+    def read_only(path, *args, **kwargs):
+        raise PermissionError(path)
+    monkeypatch.setattr('coastal_resilience.cache.os.utime', read_only)
+    IntegratedSimulation().simulate_all(cache=cache)
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,58 @@
+"""
+Tests of calibrating parameters against observed series.
+"""
+
+import numpy as np
+import pytest
+
+from coastal_resilience.calibration import Calibration, calibrate
+from coastal_resilience.models.climate import ClimateParameters
+from coastal_resilience.models.socioeconomic import SocioeconomicParameters
+from coastal_resilience.simulation import IntegratedSimulation
+
+FACTORS = ['climate.sea_level_rise_rate', 'socioeconomic.gdp_growth_rate']
+
+def _observations(years=(2024, 2028, 2032, 2036)):
+    """Synthetic series simulated with known factor values."""
+    results = IntegratedSimulation(
+        climate_params=ClimateParameters(sea_level_rise_rate=0.6),
+        socio_params=SocioeconomicParameters(gdp_growth_rate=0.04)
+    ).simulate_all()
+    idx = np.asarray(years) - 2024
+    return {
+        'sea_level': (np.asarray(years, dtype=float), results['climate_data']['sea_level'][idx]),
+        'gdp': (np.asarray(years, dtype=float), results['socioeconomic_data']['gdp'][idx])
+    }
+
+def test_recovers_known_parameters():
+    result = calibrate(_observations(), FACTORS, population_size=20, max_generations=60, seed=0)
+    np.testing.assert_allclose(
+        [result.values[name] for name in FACTORS], [0.6, 0.04], rtol=1e-6
+    )
+    assert result.objective < 1e-12
+
+def test_complex_step_jacobian_matches_finite_differences():
+    problem = Calibration(_observations(), FACTORS)
+    values = np.array([[0.45, 0.07], [0.3, 0.05]])
+    jacobian = problem.jacobian(values)
+    assert jacobian.shape == (2, 8, 2)
+
+    step = 1e-6 * values
+    for factor in range(len(FACTORS)):
+        shift = np.zeros_like(values)
+        shift[:, factor] = step[:, factor]
+        central = (problem.residuals(values + shift) - problem.residuals(values - shift)) / (
+            2 * step[:, factor, None]
+        )
+        np.testing.assert_allclose(jacobian[..., factor], central, rtol=1e-6, atol=1e-9)
+
+def test_observations_before_start_year_are_rejected():
+    observations = _observations()
+    observations['sea_level'] = (np.array([2010.0, 2030.0]), np.array([0.0, 1.0]))
+    with pytest.raises(ValueError, match='start_year'):
+        Calibration(observations, FACTORS)
+
+def test_horizon_extends_to_last_observation():
+    observations = {'sea_level': (np.array([2024.0, 2060.0]), np.array([0.0, 1.0]))}
+    problem = Calibration(observations, FACTORS)
+    assert all(parameters.end_year == 2060 for parameters in problem.base.values())
@@ -0,0 +1,63 @@
+"""
+Tests of the SQLite run catalog.
+"""
+
+import pytest
+
+from coastal_resilience.cache import parameter_dict, parameter_hash
+from coastal_resilience.catalog import RunCatalog, headline_metrics
+from coastal_resilience.models.climate import ClimateParameters
+from coastal_resilience.results_io import save_results
+from coastal_resilience.simulation import IntegratedSimulation
+
+def _save(directory, rate, created):
+    simulation = IntegratedSimulation(climate_params=ClimateParameters(sea_level_rise_rate=rate))
+    results = simulation.simulate_all()
+    save_results(results, directory / 'results', metadata={
+        'created': created,
+        'parameter_hash': parameter_hash(simulation),
+        'parameters': parameter_dict(simulation)
+    })
+    return simulation, results
+
+def test_scan_finds_nested_runs_and_orders_by_time(tmp_path):
+    output = tmp_path / 'output'
+    _save(output / 'simulation_20250301_120000', 0.3, '20250301_120000')
+    _save(output / 'batch' / 'high', 0.9, '2025-06-01T08:00:00')
+    _save(output / 'batch' / 'low', 0.5, '2024-12-31T23:59:59')
+
+    with RunCatalog(tmp_path / 'catalog.sqlite') as catalog:
+        assert catalog.scan(output) == 3
+        assert catalog.scan(output) == 0
+        runs = catalog.query()
+        assert [run['created'] for run in runs] == [
+            '2025-06-01T08:00:00', '2025-03-01T12:00:00', '2024-12-31T23:59:59'
+        ]
+        assert runs[0]['path'].endswith('high/results')
+
+def test_query_by_parameter_and_metric(tmp_path):
+    with RunCatalog(tmp_path / 'catalog.sqlite') as catalog:
+        for rate in (0.3, 0.6, 0.9):
+            simulation, results = _save(tmp_path / str(rate), rate, None)
+            catalog.record_simulation(simulation, results, tmp_path / str(rate) / 'results')
+
+        fast = catalog.query({'climate.sea_level_rise_rate': ('>', 0.5)})
+        assert sorted(run['values']['climate.sea_level_rise_rate'] for run in fast) == [0.6, 0.9]
+
+        final = headline_metrics(results)['final_resilience_index']
+        matches = catalog.query({
+            'climate.sea_level_rise_rate': ('<', 0.7),
+            'final_resilience_index': ('=', final)
+        })
+        # Newest first
+        assert [run['values']['climate.sea_level_rise_rate'] for run in matches] == [0.6, 0.3]
+        assert catalog.parameters(matches[0]['run_id'])['climate']['sea_level_rise_rate'] == 0.6
+        assert catalog.query({'final_resilience_index': ('>', final)}) == []
+
+        with pytest.raises(ValueError):
+            catalog.query({'final_resilience_index': ('LIKE', 0)})
+
+def test_record_rejects_non_timestamp(tmp_path):
+    with RunCatalog(tmp_path / 'catalog.sqlite') as catalog:
+        with pytest.raises(ValueError):
+            catalog.record(tmp_path, {}, {}, '', created='yesterday')
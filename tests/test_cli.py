@@ -0,0 +1,52 @@
+"""
+Tests of the batch scenario command line.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from coastal_resilience.cli import build_simulation, main, read_scenario
+
+EXAMPLE = '''
+name = "high_slr"
+end_year = 2050
+
+[climate]
+sea_level_rise_rate = 0.9
+
+[socioeconomic]
+gdp_growth_rate = [0.04, 0.05, 0.06]
+'''
+
+def test_docstring_example(tmp_path):
+    path = tmp_path / 'high_slr.toml'
+    path.write_text(EXAMPLE)
+    assert main([str(path), '-o', str(tmp_path / 'out'), '--format', 'npz',
+                 '--no-plots', '--catalog', '']) == 0
+    with np.load(tmp_path / 'out' / 'high_slr' / 'results.npz') as data:
+        assert data['years'][-1] == 2050
+        assert data['resilience_index'].shape == (3, 27)
+    with open(tmp_path / 'out' / 'high_slr' / 'scenario.json') as f:
+        assert json.load(f)['name'] == 'high_slr'
+
+def test_time_fields_apply_to_every_submodel(tmp_path):
+    path = tmp_path / 'late.json'
+    path.write_text(json.dumps({'climate': {'end_year': 2050}}))
+    simulation = build_simulation(read_scenario(path))
+    assert all(model.parameters.end_year == 2050 for model in simulation._models())
+    assert simulation.simulate_all()['resilience_index'].shape == (27,)
+
+def test_conflicting_time_fields(tmp_path):
+    path = tmp_path / 'conflict.json'
+    path.write_text(json.dumps({'end_year': 2040, 'policy': {'end_year': 2050}}))
+    with pytest.raises(ValueError, match='end_year'):
+        build_simulation(read_scenario(path))
+
+@pytest.mark.parametrize('name', ['../escaped', '/tmp/escaped', 'a/b', '..', '', 'a\\b', 7])
+def test_scenario_name_stays_in_output_dir(tmp_path, name):
+    path = tmp_path / 'scenario.json'
+    path.write_text(json.dumps({'name': name}))
+    with pytest.raises(ValueError, match='plain file name'):
+        read_scenario(path)
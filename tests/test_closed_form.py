@@ -0,0 +1,120 @@
+"""
+Equivalence of the closed-form ``simulate_all`` and the stepwise reference.
+"""
+
+import numpy as np
+import pytest
+
+from coastal_resilience.models.blue_economy import BlueEconomyModel, BlueEconomyParameters
+from coastal_resilience.models.climate import ClimateModel, ClimateParameters
+from coastal_resilience.models.environment import EnvironmentalModel, EnvironmentalParameters
+from coastal_resilience.models.policy import PolicyModel, PolicyParameters
+from coastal_resilience.models.socioeconomic import SocioeconomicModel, SocioeconomicParameters
+from coastal_resilience.simulation import IntegratedSimulation
+
+LONG_END_YEAR = 2100
+
+MODELS = [
+    (ClimateModel, ClimateParameters),
+    (EnvironmentalModel, EnvironmentalParameters),
+    (SocioeconomicModel, SocioeconomicParameters),
+    (BlueEconomyModel, BlueEconomyParameters),
+    (PolicyModel, PolicyParameters)
+]
+
+def assert_paths_agree(model_class, parameters):
+    closed_form = model_class(parameters).simulate_all()
+    stepwise = model_class(parameters).simulate_all(stepwise=True)
+    assert closed_form.keys() == stepwise.keys()
+    for name, expected in stepwise.items():
+        np.testing.assert_allclose(closed_form[name], expected, rtol=1e-9, atol=1e-9,
+                                   err_msg=name)
+
+@pytest.mark.parametrize('model_class, parameter_class', MODELS)
+def test_default_parameters(model_class, parameter_class):
+    assert_paths_agree(model_class, parameter_class())
+
+@pytest.mark.parametrize('model_class, parameter_class', MODELS)
+def test_long_horizon(model_class, parameter_class):
+    assert_paths_agree(model_class, parameter_class(end_year=LONG_END_YEAR))
+
+@pytest.mark.parametrize('model_class, parameter_class', MODELS)
+def test_batched_parameters(model_class, parameter_class):
+    defaults = parameter_class()
+    members = [
+        parameter_class(**{
+            name: value * scale
+            for name, value in vars(defaults).items()
+            if name not in ('start_year', 'end_year', 'time_step', 'output_step')
+            and isinstance(value, float)
+        })
+        for scale in (0.5, 1.0, 1.5)
+    ]
+    assert_paths_agree(model_class, members)
+
+@pytest.mark.parametrize('rate', [0.0, -0.05, 0.5])
+def test_zero_and_negative_growth(rate):
+    assert_paths_agree(ClimateModel, ClimateParameters(
+        rainfall_change_rate=rate, cyclone_frequency_change=rate, sea_level_rise_rate=rate,
+        end_year=LONG_END_YEAR
+    ))
+    assert_paths_agree(SocioeconomicModel, SocioeconomicParameters(
+        gdp_growth_rate=rate, population_growth_rate=rate, poverty_reduction_rate=-rate,
+        end_year=LONG_END_YEAR
+    ))
+    assert_paths_agree(BlueEconomyModel, BlueEconomyParameters(
+        fisheries_growth_rate=rate, renewable_energy_growth_rate=rate, end_year=LONG_END_YEAR
+    ))
+
+@pytest.mark.parametrize('initial, growth', [(0.1, 0.15), (4.9, 0.15), (5.0, 0.0), (8.0, 0.1), (8.0, -0.1)])
+def test_renewable_cap(initial, growth):
+    parameters = BlueEconomyParameters(
+        initial_renewable_energy=initial, renewable_energy_growth_rate=growth,
+        maximum_potential=5.0, end_year=LONG_END_YEAR
+    )
+    assert_paths_agree(BlueEconomyModel, parameters)
+    renewable = BlueEconomyModel(parameters).simulate_all()['renewable_energy']
+    assert np.all(renewable[1:] <= 5.0 + 1e-12)
+
+def test_renewable_cap_batched():
+    assert_paths_agree(BlueEconomyModel, [
+        BlueEconomyParameters(initial_renewable_energy=initial,
+                              renewable_energy_growth_rate=growth, end_year=LONG_END_YEAR)
+        for initial, growth in [(0.1, 0.15), (4.9, 0.3), (8.0, -0.1)]
+    ])
+
+@pytest.mark.parametrize('degradation', [0.0, 0.013, 1.0])
+def test_mangrove_recurrence(degradation):
+    # degradation 0 is the a == 1 case of m[t+1] = a * m[t] + b
+    assert_paths_agree(EnvironmentalModel, EnvironmentalParameters(
+        mangrove_degradation_rate=degradation, end_year=LONG_END_YEAR
+    ))
+
+def test_mangrove_recurrence_batched():
+    assert_paths_agree(EnvironmentalModel, [
+        EnvironmentalParameters(mangrove_degradation_rate=degradation,
+                                mangrove_restoration_rate=restoration, end_year=LONG_END_YEAR)
+        for degradation, restoration in [(0.0, 0.02), (0.013, 0.0), (0.2, 0.05)]
+    ])
+
+def test_integrated_simulation():
+    simulation = dict(
+        climate_params=[ClimateParameters(sea_level_rise_rate=rate, end_year=LONG_END_YEAR)
+                        for rate in (0.3, 0.5, 0.9)],
+        env_params=EnvironmentalParameters(mangrove_degradation_rate=0.0, end_year=LONG_END_YEAR),
+        socio_params=SocioeconomicParameters(end_year=LONG_END_YEAR),
+        blue_econ_params=BlueEconomyParameters(end_year=LONG_END_YEAR),
+        policy_params=PolicyParameters(end_year=LONG_END_YEAR)
+    )
+    closed_form = IntegratedSimulation(**simulation).simulate_all()
+    stepwise = IntegratedSimulation(**simulation).simulate_all(stepwise=True)
+    assert closed_form.keys() == stepwise.keys()
+    for key, expected in stepwise.items():
+        if isinstance(expected, dict):
+            assert closed_form[key].keys() == expected.keys()
+            for name, values in expected.items():
+                np.testing.assert_allclose(closed_form[key][name], values, rtol=1e-9, atol=1e-9,
+                                           err_msg=f'{key}.{name}')
+        else:
+            np.testing.assert_allclose(closed_form[key], expected, rtol=1e-9, atol=1e-9,
+                                       err_msg=key)
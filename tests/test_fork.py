@@ -0,0 +1,55 @@
+"""
+Tests of copy-on-write forks of the integrated simulation.
+"""
+
+import numpy as np
+
+from coastal_resilience.models.policy import PolicyParameters
+from coastal_resilience.simulation import IntegratedSimulation
+
+def stepped(years=3):
+    simulation = IntegratedSimulation()
+    for _ in range(years):
+        simulation.simulate_step()
+    return simulation
+
+def test_parent_edit_leaves_branch_history():
+    parent = stepped()
+    assert parent.current_year == 2027
+    branch = parent.fork()
+    parent.update_parameters(policy_params=PolicyParameters(coordination_efficiency=0.1))
+    parent.simulate_all()
+    results = branch.simulate_all()
+    np.testing.assert_allclose(results['resilience_index'][1:3], [49.44, 48.95], atol=5e-3)
+    expected = IntegratedSimulation().simulate_all()
+    np.testing.assert_allclose(results['resilience_index'], expected['resilience_index'],
+                               rtol=1e-12)
+
+def test_branch_edit_keeps_parent_prefix():
+    parent = stepped()
+    branch = parent.fork(policy_params=PolicyParameters(coordination_efficiency=0.5))
+    branch.simulate_all()
+    branch.update_parameters(policy_params=PolicyParameters(coordination_efficiency=0.2))
+    results = branch.simulate_all()
+    prefix = parent.simulate_all()
+    for key in ('resilience_index', 'policy_data'):
+        actual, expected = results[key], prefix[key]
+        if key == 'policy_data':
+            actual, expected = actual['policy_impact'], expected['policy_impact']
+        np.testing.assert_array_equal(actual[:4], expected[:4])
+    fresh = stepped().fork(policy_params=PolicyParameters(coordination_efficiency=0.2))
+    np.testing.assert_allclose(results['resilience_index'],
+                               fresh.simulate_all()['resilience_index'], rtol=1e-12)
+
+def test_branch_edit_changes_batch():
+    parent = stepped()
+    members = [PolicyParameters(coordination_efficiency=e) for e in (0.2, 0.3, 0.4)]
+    branch = parent.fork(policy_params=members[::2])
+    branch.simulate_all()
+    branch.update_parameters(policy_params=members)
+    results = branch.simulate_all()['resilience_index']
+    assert results.shape[0] == 3
+    np.testing.assert_array_equal(results[:, :4],
+                                  np.broadcast_to(parent.resilience_index[:4], (3, 4)))
+    fresh = stepped().fork(policy_params=members).simulate_all()['resilience_index']
+    np.testing.assert_allclose(results, fresh, rtol=1e-12)
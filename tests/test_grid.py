@@ -0,0 +1,41 @@
+"""
+Tests of gridded runs of the climate and environmental models.
+"""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from coastal_resilience.grid import simulate_grid
+from coastal_resilience.models.climate import ClimateModel, ClimateParameters
+from coastal_resilience.models.environment import EnvironmentalModel, EnvironmentalParameters
+from coastal_resilience.results_io import load_results
+
+def test_chunks_match_one_batched_run():
+    rates = np.linspace(0.2, 1.0, 35).reshape(5, 7)
+    parameters = replace(ClimateParameters(), sea_level_rise_rate=rates)
+    grid = simulate_grid(ClimateModel, parameters, chunk_cells=8, dtype=np.float64)
+    expected = ClimateModel(replace(ClimateParameters(), sea_level_rise_rate=rates.ravel())).simulate_all()
+    assert grid['sea_level'].shape == (5, 7, 16)
+    for name in ClimateModel.state_variables:
+        np.testing.assert_allclose(
+            grid[name].reshape(35, -1), np.broadcast_to(expected[name], (35, 16)), err_msg=name
+        )
+
+def test_memory_mapped_grid_round_trip(tmp_path):
+    degradation = np.linspace(0.0, 0.05, 12).reshape(3, 4)
+    parameters = replace(EnvironmentalParameters(), mangrove_degradation_rate=degradation)
+    grid = simulate_grid(EnvironmentalModel, parameters, chunk_cells=5, directory=tmp_path)
+    loaded = load_results(tmp_path)
+    assert loaded.metadata['grid_shape'] == [3, 4]
+    np.testing.assert_array_equal(loaded['years'], grid['years'])
+    for name in EnvironmentalModel.state_variables:
+        stored = loaded['environment_data'][name]
+        assert stored.dtype == np.float32
+        assert stored.shape == (3, 4, 16)
+        np.testing.assert_array_equal(stored, grid[name])
+
+def test_grid_needs_a_per_cell_parameter():
+    with pytest.raises(ValueError):
+        simulate_grid(ClimateModel, ClimateParameters())
@@ -0,0 +1,25 @@
+"""
+The simulation core loads with NumPy alone.
+
+The wall-clock import budget depends on the machine, so it is checked by
+``benchmarks/imports.py`` rather than here.
+"""
+
+import os
+import subprocess
+import sys
+
+from benchmarks.imports import HEAVY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_package_import_loads_no_plotting_or_analysis_library():
+    # A fresh interpreter, since this test session may have loaded them already
+    loaded = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, coastal_resilience; '
+         f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert loaded == ''
+    assert {'pandas', 'matplotlib', 'seaborn', 'scipy'} <= set(HEAVY_MODULES)
@@ -0,0 +1,65 @@
+"""
+Tests of re-simulating only the submodels whose parameters changed.
+"""
+
+import numpy as np
+
+from coastal_resilience.models.climate import ClimateParameters
+from coastal_resilience.models.policy import PolicyParameters
+from coastal_resilience.models.socioeconomic import SocioeconomicParameters
+from coastal_resilience.simulation import SUBMODELS, IntegratedSimulation, flatten_results
+
+def assert_results_equal(actual, expected):
+    actual, expected = flatten_results(actual), flatten_results(expected)
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        np.testing.assert_allclose(actual[key], values, rtol=1e-12, err_msg=key)
+
+def test_update_reruns_only_changed_submodel():
+    simulation = IntegratedSimulation()
+    simulation.simulate_all()
+    sea_level = simulation.climate_model.sea_level
+    gdp = simulation.socio_model.gdp.copy()
+
+    parameters = SocioeconomicParameters(gdp_growth_rate=0.08)
+    simulation.update_parameters(socio_params=parameters)
+    results = simulation.simulate_all()
+    # The climate trajectory is reused as is; the socioeconomic one is recomputed
+    assert simulation.climate_model.sea_level is sea_level
+    assert not np.allclose(simulation.socio_model.gdp, gdp)
+    assert_results_equal(results, IntegratedSimulation(socio_params=parameters).simulate_all())
+
+def test_in_place_edit_is_detected():
+    simulation = IntegratedSimulation()
+    simulation.simulate_all()
+    simulation.policy_model.parameters.coordination_efficiency = 0.2
+    assert_results_equal(
+        simulation.simulate_all(),
+        IntegratedSimulation(policy_params=PolicyParameters(coordination_efficiency=0.2)).simulate_all()
+    )
+
+def test_update_mid_run_catches_up_to_current_year():
+    simulation = IntegratedSimulation()
+    for _ in range(5):
+        simulation.simulate_step()
+    parameters = SocioeconomicParameters(gdp_growth_rate=0.08)
+    simulation.update_parameters(socio_params=parameters)
+    assert_results_equal(
+        simulation.simulate_all(),
+        IntegratedSimulation(socio_params=parameters).simulate_all()
+    )
+
+def test_update_to_ensemble_and_new_time_axis():
+    simulation = IntegratedSimulation()
+    simulation.simulate_all()
+    members = [ClimateParameters(sea_level_rise_rate=rate) for rate in (0.3, 0.9)]
+    simulation.update_parameters(climate_params=members)
+    results = simulation.simulate_all()
+    assert results['climate_data']['sea_level'].shape == (2, 16)
+    assert_results_equal(results, IntegratedSimulation(climate_params=members).simulate_all())
+
+    simulation.update_parameters(**{
+        argument: parameter_class(end_year=2030)
+        for argument, parameter_class, _ in SUBMODELS.values()
+    })
+    assert simulation.simulate_all()['years'][-1] == 2030
@@ -0,0 +1,47 @@
+"""
+Tests of the process-pool Monte Carlo runner.
+"""
+
+import numpy as np
+import pytest
+
+from coastal_resilience.models.climate import ClimateParameters
+from coastal_resilience.monte_carlo import MonteCarloRunner
+from coastal_resilience.simulation import IntegratedSimulation
+from coastal_resilience.streaming import TrajectoryDensity
+
+DISTRIBUTIONS = {
+    'climate': {'sea_level_rise_rate': ('normal', 0.5, 0.1)},
+    'policy': {'coordination_efficiency': ('uniform', 0.2, 0.8)}
+}
+
+def test_members_equal_their_sampled_runs():
+    runner = MonteCarloRunner(DISTRIBUTIONS, n_workers=1, chunk_size=4, seed=0)
+    results = runner.run(10)
+    assert results['resilience_index'].shape == (10, 16)
+    rates = runner.samples['climate']['sea_level_rise_rate']
+    expected = IntegratedSimulation(
+        climate_params=ClimateParameters(sea_level_rise_rate=rates[7])
+    ).simulate_all()['climate_data']['sea_level']
+    np.testing.assert_allclose(results['climate_data']['sea_level'][7], expected, rtol=1e-12)
+
+def test_process_pool_matches_serial():
+    serial = MonteCarloRunner(DISTRIBUTIONS, n_workers=1, chunk_size=7, seed=1).run(30)
+    parallel = MonteCarloRunner(DISTRIBUTIONS, n_workers=2, chunk_size=7, seed=1).run(30)
+    np.testing.assert_array_equal(parallel['resilience_index'], serial['resilience_index'])
+
+def test_accumulate_matches_run():
+    full = MonteCarloRunner(DISTRIBUTIONS, n_workers=1, chunk_size=16, seed=2).run(100)
+    streamed = MonteCarloRunner(DISTRIBUTIONS, n_workers=2, chunk_size=16, seed=2).accumulate(100)
+    assert streamed.count == 100
+    v = streamed.variables.index('resilience_index')
+    np.testing.assert_allclose(streamed.mean()[v], full['resilience_index'].mean(axis=0), rtol=1e-10)
+
+    density = MonteCarloRunner(DISTRIBUTIONS, n_workers=1, chunk_size=16, seed=2).accumulate(
+        100, TrajectoryDensity({'resilience_index': (0, 1e5)}, oversample=1)
+    )
+    assert density.counts.sum() + density.outside.sum() == 100 * 16
+
+def test_unknown_parameter_is_rejected():
+    with pytest.raises(ValueError):
+        MonteCarloRunner({'climate': {'no_such_rate': ('normal', 0, 1)}})
@@ -0,0 +1,45 @@
+"""
+Tests of precision policies for simulation state and archived results.
+"""
+
+import numpy as np
+
+from coastal_resilience.precision import ARCHIVE, COMPACT, PrecisionPolicy, validate_precision
+from coastal_resilience.results_io import load_results, save_results
+from coastal_resilience.simulation import IntegratedSimulation, flatten_results
+
+def test_compact_state_is_float32_and_close():
+    results = IntegratedSimulation(precision=COMPACT).simulate_all()
+    assert results['resilience_index'].dtype == np.float32
+    assert results['climate_data']['sea_level'].dtype == np.float32
+    for key, row in validate_precision(COMPACT).items():
+        assert row['max_rel_error'] < 1e-6, key
+
+def test_archive_round_trip(tmp_path):
+    simulation = IntegratedSimulation(precision=ARCHIVE)
+    results = simulation.simulate_all()
+    save_results(results, tmp_path / 'results', precision=ARCHIVE)
+    loaded = flatten_results(load_results(tmp_path / 'results'))
+    expected = flatten_results(results)
+    assert loaded.keys() == expected.keys()
+    np.testing.assert_array_equal(loaded['years'], expected['years'])
+    assert loaded['years'].dtype == expected['years'].dtype
+    for key, values in expected.items():
+        stored = loaded[key]
+        if key == 'years':
+            continue
+        # float16 where it fits, the float32 fallback where it would overflow
+        if np.abs(values).max() > np.finfo(np.float16).max:
+            assert stored.dtype == np.float32, key
+            np.testing.assert_array_equal(stored, values, err_msg=key)
+        else:
+            assert stored.dtype == np.float16, key
+            np.testing.assert_allclose(stored, values, rtol=1e-3, atol=1e-4, err_msg=key)
+
+def test_full_precision_archive_is_lossless(tmp_path):
+    results = IntegratedSimulation().simulate_all()
+    save_results(results, tmp_path / 'results', precision=PrecisionPolicy())
+    loaded = flatten_results(load_results(tmp_path / 'results'))
+    for key, values in flatten_results(results).items():
+        assert loaded[key].dtype == np.asarray(values).dtype, key
+        np.testing.assert_array_equal(loaded[key], values, err_msg=key)
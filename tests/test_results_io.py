@@ -0,0 +1,35 @@
+"""
+Tests of the columnar results format and of reusing loaded runs.
+"""
+
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+from coastal_resilience.advanced_visualization import AdvancedVisualizer
+from coastal_resilience.results_io import load_results, save_results
+from coastal_resilience.simulation import (
+    IntegratedSimulation, add_aggregate_indicators, flatten_results
+)
+
+def _saved_run(tmp_path):
+    results = add_aggregate_indicators(IntegratedSimulation().simulate_all())
+    save_results(results, tmp_path / 'results')
+    return results, load_results(tmp_path / 'results')
+
+def test_flatten_loaded_results(tmp_path):
+    results, loaded = _saved_run(tmp_path)
+    expected = flatten_results(results)
+    flat = flatten_results(loaded)
+    assert set(flat) == set(expected)
+    for key, array in expected.items():
+        assert isinstance(flat[key], np.ndarray)
+        np.testing.assert_array_equal(flat[key], array)
+
+def test_plot_loaded_results(tmp_path):
+    _, loaded = _saved_run(tmp_path)
+    AdvancedVisualizer(loaded).save_all_plots(str(tmp_path / 'plots'))
+    assert os.path.exists(tmp_path / 'plots' / 'pca_analysis.png')
@@ -0,0 +1,53 @@
+"""
+Tests of the integrated simulation's stepping interface.
+"""
+
+import numpy as np
+
+from coastal_resilience.models.climate import ClimateParameters
+from coastal_resilience.simulation import IntegratedSimulation
+
+def test_plain_step_returns_scalars():
+    # 0-d arrays would make every arithmetic operation of a step several times slower
+    state = IntegratedSimulation().simulate_step()
+    assert not isinstance(state['resilience_index'], np.ndarray)
+    for section in ('climate_state', 'environment_state', 'socioeconomic_state',
+                    'blue_economy_state', 'policy_state'):
+        for name, value in state[section].items():
+            assert not isinstance(value, np.ndarray), (section, name)
+
+def test_batched_step_returns_member_arrays():
+    simulation = IntegratedSimulation(
+        climate_params=ClimateParameters(sea_level_rise_rate=np.array([0.3, 0.5]))
+    )
+    state = simulation.simulate_step()
+    assert state['climate_state']['sea_level'].shape == (2,)
+    assert state['resilience_index'].shape == (2,)
+
+def test_steps_match_simulate_all():
+    simulation = IntegratedSimulation()
+    while simulation.current_year < simulation.climate_model.parameters.end_year:
+        simulation.simulate_step()
+    expected = IntegratedSimulation().simulate_all()
+    np.testing.assert_allclose(simulation.resilience_index, expected['resilience_index'],
+                               rtol=1e-12)
+
+def test_unobserved_step_skips_phase_timing(monkeypatch):
+    def timed(*args):
+        raise AssertionError('phase timing without observers')
+    monkeypatch.setattr(IntegratedSimulation, '_record', timed)
+    simulation = IntegratedSimulation()
+    simulation.simulate_step()
+    simulation.simulate_all()
+
+def test_observed_phases():
+    from coastal_resilience.instrumentation import Profiler
+    from coastal_resilience.simulation import ALL_PHASES, STEP_PHASES
+
+    profiler = Profiler()
+    simulation = IntegratedSimulation()
+    with simulation.observe(profiler):
+        simulation.simulate_step()
+        simulation.simulate_all()
+    assert set(STEP_PHASES + ALL_PHASES) <= set(profiler.summary())
+    assert profiler.summary()['climate.simulate_step']['calls'] == 1
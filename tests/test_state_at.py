@@ -0,0 +1,43 @@
+"""
+Tests of random-access state queries without stepping.
+"""
+
+import numpy as np
+import pytest
+
+from coastal_resilience.models.climate import ClimateParameters
+from coastal_resilience.simulation import IntegratedSimulation
+
+STATE_SECTIONS = ('climate_state', 'environment_state', 'socioeconomic_state',
+                  'blue_economy_state', 'policy_state')
+
+@pytest.mark.parametrize('steps', [0, 4, 15])
+def test_state_at_matches_full_run(steps):
+    reference = IntegratedSimulation().simulate_all()
+    simulation = IntegratedSimulation()
+    for _ in range(steps):
+        simulation.simulate_step()
+    for year in (2024, 2027, 2031, 2039):
+        state = simulation.state_at(year)
+        idx = year - 2024
+        np.testing.assert_allclose(state['resilience_index'],
+                                   reference['resilience_index'][idx], rtol=1e-12)
+        np.testing.assert_allclose(state['climate_state']['sea_level'],
+                                   reference['climate_data']['sea_level'][idx], rtol=1e-12)
+    # Queries never advance the simulation
+    assert simulation.current_year == 2024 + steps
+
+def test_state_at_batched():
+    rates = np.array([0.3, 0.6, 0.9])
+    simulation = IntegratedSimulation(climate_params=ClimateParameters(sea_level_rise_rate=rates))
+    reference = IntegratedSimulation(
+        climate_params=ClimateParameters(sea_level_rise_rate=rates)
+    ).simulate_all()
+    state = simulation.state_at(2035)
+    assert set(STATE_SECTIONS) <= set(state)
+    np.testing.assert_allclose(state['climate_state']['sea_level'],
+                               reference['climate_data']['sea_level'][:, 11], rtol=1e-12)
+
+def test_state_at_off_axis_year():
+    with pytest.raises(ValueError):
+        IntegratedSimulation().state_at(2050)
@@ -0,0 +1,171 @@
+"""
+Tests of the streaming, mergeable ensemble statistics against exact NumPy.
+"""
+
+import numpy as np
+import pytest
+
+from coastal_resilience.streaming import EnsembleAccumulator, QuantileSketch
+
+YEARS = np.arange(2024, 2034)
+
+def _batch(rng, n_members):
+    """Ensemble results with a leading member axis."""
+    return {
+        'years': YEARS,
+        'resilience_index': rng.normal(50, 5, (n_members, len(YEARS))),
+        'climate_data': {'sea_level': rng.lognormal(0, 1, (n_members, len(YEARS)))}
+    }
+
+def _exact(batches, key):
+    if '.' in key:
+        section, name = key.split('.')
+        return np.concatenate([batch[section][name] for batch in batches])
+    return np.concatenate([batch[key] for batch in batches])
+
+def _rank_error(values, estimates, levels):
+    """Largest distance between target and achieved ranks, per level and cell."""
+    ranks = (np.sort(values, axis=0)[None] <= estimates[:, None]).mean(axis=1)
+    return np.abs(ranks - np.asarray(levels)[:, None]).max()
+
+def test_sketch_quantiles_within_rank_error():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(20000, 3))
+    sketch = QuantileSketch(3, size=128, seed=0)
+    for block in np.array_split(values, 17):
+        sketch.update(block)
+    levels = [0.01, 0.25, 0.5, 0.75, 0.99]
+    assert _rank_error(values, sketch.quantile(levels), levels) < 0.02
+    assert sketch.quantile(0.5).shape == (3,)
+    # Memory is bounded by the levels, not the observations
+    assert sum(level.shape[1] for level in sketch.levels) < len(values) / 10
+
+def test_small_sketch_is_exact():
+    values = np.arange(100.0)[:, None]
+    sketch = QuantileSketch(1, size=256)
+    sketch.update(values)
+    np.testing.assert_array_equal(sketch.quantile([0.0, 1.0])[:, 0], [0.0, 99.0])
+
+def test_empty_sketch_raises():
+    with pytest.raises(ValueError):
+        QuantileSketch(2).quantile(0.5)
+
+def test_accumulator_moments_match_numpy():
+    rng = np.random.default_rng(1)
+    batches = [_batch(rng, n) for n in (1, 7, 300, 42)]
+    accumulator = EnsembleAccumulator(seed=0)
+    for batch in batches:
+        accumulator.update(batch)
+    assert accumulator.count == 350
+    assert accumulator.variables == ['resilience_index', 'climate_data.sea_level']
+    for v, key in enumerate(accumulator.variables):
+        exact = _exact(batches, key)
+        np.testing.assert_allclose(accumulator.mean()[v], exact.mean(axis=0), rtol=1e-12)
+        np.testing.assert_allclose(accumulator.std()[v], exact.std(axis=0, ddof=1), rtol=1e-10)
+
+def test_merged_accumulators_match_single_pass():
+    rng = np.random.default_rng(2)
+    batches = [_batch(rng, 500) for _ in range(6)]
+    whole = EnsembleAccumulator(seed=0)
+    merged = EnsembleAccumulator(seed=0)
+    for i, batch in enumerate(batches):
+        whole.update(batch)
+        part = merged.spawn(seed=i)
+        part.update(batch)
+        merged.merge(part)
+    np.testing.assert_allclose(merged.mean(), whole.mean(), rtol=1e-12)
+    np.testing.assert_allclose(merged.variance(), whole.variance(), rtol=1e-10)
+
+    levels = [0.05, 0.5, 0.95]
+    exact = _exact(batches, 'climate_data.sea_level')
+    quantiles = merged.quantile_results(levels)
+    estimates = np.stack([quantiles[level]['climate_data']['sea_level'] for level in levels])
+    assert _rank_error(exact, estimates, levels) < 0.02
+    np.testing.assert_array_equal(quantiles[0.5]['years'], YEARS)
+
+def test_accumulator_rejects_other_variables():
+    rng = np.random.default_rng(3)
+    accumulator = EnsembleAccumulator()
+    accumulator.update(_batch(rng, 4))
+    with pytest.raises(ValueError):
+        accumulator.update({'years': YEARS, 'resilience_index': np.zeros((2, len(YEARS)))})
+
+def _correlated_batch(rng, n_members):
+    """Ensemble results whose variables are correlated across members and years."""
+    base = rng.normal(size=(n_members, len(YEARS))) + 0.1 * (YEARS - YEARS[0])
+    return {
+        'years': YEARS,
+        'resilience_index': 50 + 5 * base,
+        'sustainability_index': 3 * base + rng.normal(size=base.shape),
+        'climate_data': {'sea_level': np.exp(0.5 * base) + rng.normal(0, 0.1, base.shape)}
+    }
+
+COVARIANCE_KEYS = ['years', 'resilience_index', 'sustainability_index', 'climate_data.sea_level']
+
+def _rows(batches):
+    """All (member, year) observations of ``COVARIANCE_KEYS``, as NumPy sees them."""
+    return np.column_stack([
+        np.broadcast_to(YEARS, _exact(batches, 'resilience_index').shape).ravel()
+        if key == 'years' else _exact(batches, key).ravel()
+        for key in COVARIANCE_KEYS
+    ])
+
+def test_merged_covariance_matches_numpy():
+    from coastal_resilience.streaming import StreamingCovariance
+
+    rng = np.random.default_rng(4)
+    batches = [_correlated_batch(rng, n) for n in (3, 250, 64)]
+    merged = StreamingCovariance(COVARIANCE_KEYS)
+    for batch in batches:
+        part = merged.spawn()
+        part.update(batch)
+        merged.merge(part)
+    rows = _rows(batches)
+    assert merged.count == len(rows)
+    np.testing.assert_allclose(merged.mean(), rows.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(merged.covariance(), np.cov(rows, rowvar=False), rtol=1e-10)
+    np.testing.assert_allclose(merged.correlation(), np.corrcoef(rows, rowvar=False), rtol=1e-10)
+
+def test_single_batch_rank_correlation_is_spearman():
+    from scipy.stats import spearmanr
+
+    from coastal_resilience.streaming import StreamingCovariance
+
+    batch = _correlated_batch(np.random.default_rng(5), 200)
+    covariance = StreamingCovariance(COVARIANCE_KEYS, ranks=True)
+    covariance.update(batch)
+    np.testing.assert_allclose(
+        covariance.correlation('spearman'), spearmanr(_rows([batch])).statistic, rtol=1e-10
+    )
+    with pytest.raises(ValueError):
+        covariance.correlation('kendall')
+
+def test_streamed_pca_matches_numpy():
+    from coastal_resilience.streaming import StreamingPCA
+
+    keys = COVARIANCE_KEYS[1:]
+    rng = np.random.default_rng(6)
+    batches = [_correlated_batch(rng, n) for n in (100, 37, 180)]
+    pca = StreamingPCA(keys, sample_size=500, seed=0)
+    for i, batch in enumerate(batches):
+        part = pca.spawn(seed=i)
+        part.update(batch)
+        pca.merge(part)
+
+    rows = _rows(batches)[:, 1:]
+    standardized = (rows - rows.mean(axis=0)) / rows.std(axis=0)
+    variances, vectors = np.linalg.eigh(np.cov(standardized, rowvar=False))
+    order = np.argsort(variances)[::-1]
+    ratio, components = pca.fit()
+    np.testing.assert_allclose(ratio, variances[order] / variances.sum(), rtol=1e-9)
+    for component, vector in zip(components, vectors[:, order].T):
+        # Eigenvectors are defined up to sign
+        np.testing.assert_allclose(np.abs(component @ vector), 1, rtol=1e-9)
+        assert component[np.abs(component).argmax()] > 0
+
+    # The drawn sample is a subset of the rows, projected like them
+    assert len(pca.sample) == 500
+    assert np.isin(pca.sample[:, 0], rows[:, 0]).all()
+    np.testing.assert_allclose(
+        pca.transform(rows, 3), standardized @ components.T, rtol=1e-9, atol=1e-9
+    )
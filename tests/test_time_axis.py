@@ -0,0 +1,47 @@
+"""
+Tests of sub-annual time steps and thinned output.
+"""
+
+import numpy as np
+import pytest
+
+from coastal_resilience.models.base import time_axis
+from coastal_resilience.models.climate import ClimateModel, ClimateParameters
+from coastal_resilience.models.socioeconomic import SocioeconomicModel, SocioeconomicParameters
+
+def test_thinned_output_keeps_end_year():
+    years, sample_steps, dt, n_steps = time_axis(ClimateParameters(output_step=4))
+    np.testing.assert_array_equal(years, [2024, 2028, 2032, 2036, 2039])
+    np.testing.assert_array_equal(sample_steps, [0, 4, 8, 12, 15])
+    assert (dt, n_steps) == (1, 15)
+
+def test_thinned_output_matches_annual_samples():
+    annual = ClimateModel(ClimateParameters()).simulate_all()
+    for stepwise in (False, True):
+        thinned = ClimateModel(ClimateParameters(output_step=4)).simulate_all(stepwise)
+        idx = thinned['years'] - 2024
+        for name, values in thinned.items():
+            np.testing.assert_allclose(values, annual[name][..., idx], rtol=1e-12, err_msg=name)
+
+def test_sub_annual_steps_hit_annual_values():
+    annual = SocioeconomicModel(SocioeconomicParameters()).simulate_all()
+    monthly = SocioeconomicModel(SocioeconomicParameters(time_step='monthly')).simulate_all()
+    assert len(monthly['years']) == 15 * 12 + 1
+    np.testing.assert_allclose(monthly['years'][::12], annual['years'])
+    np.testing.assert_allclose(monthly['gdp'][::12], annual['gdp'], rtol=1e-12)
+
+def test_sub_annual_stepping_matches_closed_form():
+    time = dict(time_step='monthly', output_step=0.25, end_year=2030)
+    stepped = ClimateModel(ClimateParameters(**time))
+    while stepped.current_year < 2030:
+        stepped.simulate_step()
+    closed_form = ClimateModel(ClimateParameters(**time)).simulate_all()
+    np.testing.assert_allclose(closed_form['years'], 2024 + 0.25 * np.arange(25))
+    np.testing.assert_allclose(stepped.sea_level, closed_form['sea_level'], rtol=1e-12)
+
+def test_negative_annual_factor_needs_annual_steps():
+    # A growth rate below -100% flips the sign every year
+    parameters = SocioeconomicParameters(gdp_growth_rate=-1.5, time_step=0.5)
+    with pytest.raises(ValueError, match='annual time steps'):
+        SocioeconomicModel(parameters).simulate_all()
+    SocioeconomicModel(SocioeconomicParameters(gdp_growth_rate=-1.5)).simulate_all()
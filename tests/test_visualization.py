@@ -0,0 +1,82 @@
+"""
+Tests of the report plots.
+"""
+
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pytest
+
+from coastal_resilience.advanced_visualization import AdvancedVisualizer
+from coastal_resilience.models.climate import ClimateParameters
+from coastal_resilience.simulation import IntegratedSimulation, add_aggregate_indicators
+
+def _ensemble_results(n_members=8):
+    rates = np.linspace(0.3, 1.0, n_members)
+    simulation = IntegratedSimulation(climate_params=ClimateParameters(sea_level_rise_rate=rates))
+    return add_aggregate_indicators(simulation.simulate_all())
+
+def test_advanced_plots_of_ensemble(tmp_path):
+    results = _ensemble_results()
+    drawn = AdvancedVisualizer(results).save_all_plots(str(tmp_path))
+    for name in ('radar_chart.png', 'resilience_trend.png', 'pca_analysis.png',
+                 'resilience_index_density.png'):
+        assert name in drawn
+        assert os.path.exists(tmp_path / name)
+
+def test_ensemble_series_are_member_medians():
+    results = _ensemble_results()
+    visualizer = AdvancedVisualizer(results)
+    np.testing.assert_allclose(
+        visualizer._series('climate_data.overall_impact'),
+        np.median(results['climate_data']['overall_impact'], axis=0)
+    )
+
+def test_parallel_render_matches_serial(tmp_path, monkeypatch):
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    from multiprocessing import get_context
+
+    import matplotlib.image
+
+    from coastal_resilience import rendering
+    from coastal_resilience.visualization import SimulationVisualizer
+
+    # Spawned workers start from a fresh interpreter, as on macOS and Windows
+    monkeypatch.setattr(rendering, 'ProcessPoolExecutor',
+                        partial(ProcessPoolExecutor, mp_context=get_context('spawn')))
+    visualizer = SimulationVisualizer(IntegratedSimulation().simulate_all())
+    serial = visualizer.save_all_plots(str(tmp_path / 'serial'))
+    parallel = visualizer.save_all_plots(str(tmp_path / 'parallel'), n_workers=2)
+    assert set(serial) == set(parallel)
+    for name in serial:
+        np.testing.assert_array_equal(
+            matplotlib.image.imread(tmp_path / 'serial' / name),
+            matplotlib.image.imread(tmp_path / 'parallel' / name),
+            err_msg=name
+        )
+
+def test_sensitivity_plot_needs_an_analysis(tmp_path):
+    results = add_aggregate_indicators(IntegratedSimulation().simulate_all())
+    visualizer = AdvancedVisualizer(results)
+    drawn = visualizer.save_all_plots(str(tmp_path))
+    assert 'sensitivity_analysis.png' not in drawn
+    with pytest.raises(ValueError):
+        visualizer.plot_sensitivity_analysis()
+
+def test_unchanged_density_is_not_rebinned(tmp_path, monkeypatch):
+    results = _ensemble_results()
+    visualizer = AdvancedVisualizer(results)
+    assert 'resilience_index_density.png' in visualizer.save_all_plots(str(tmp_path))
+
+    def rebin(*args):
+        raise AssertionError('density rebinned for an unchanged plot')
+    monkeypatch.setattr(AdvancedVisualizer, '_density', rebin)
+    assert visualizer.save_all_plots(str(tmp_path)) == {}
+
+    results['resilience_index'][0, -1] += 1
+    monkeypatch.undo()
+    assert 'resilience_index_density.png' in visualizer.save_all_plots(str(tmp_path))